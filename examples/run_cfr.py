@@ -22,6 +22,7 @@ def train(args):
         config={
             'seed': 0,
             'allow_step_back': True,
+            'lazy_state': True,
         }
     )
     eval_env = rlcard.make(
@@ -41,6 +42,7 @@ def train(args):
             args.log_dir,
             'cfr_model',
         ),
+        num_workers=args.num_workers,
     )
     agent.load()  # If we have saved model, we first load the model
 
@@ -68,6 +70,7 @@ def train(args):
 
         # Get the paths
         csv_path, fig_path = logger.csv_path, logger.fig_path
+    agent.close()
     # Plot the learning curve
     plot_curve(csv_path, fig_path, 'cfr')
 
@@ -93,6 +96,11 @@ if __name__ == '__main__':
         type=int,
         default=100,
     )
+    parser.add_argument(
+        '--num_workers',
+        type=int,
+        default=0,
+    )
     parser.add_argument(
         '--log_dir',
         type=str,
@@ -1,18 +1,37 @@
-import subprocess
-import sys
-from distutils.version import LooseVersion
+''' The agents are imported on first access, so that `import rlcard.agents`
+does not import PyTorch or the human interfaces until they are used
+'''
+import importlib
+import importlib.util
 
-reqs = subprocess.check_output([sys.executable, '-m', 'pip', 'freeze'])
-installed_packages = [r.decode().split('==')[0] for r in reqs.split()]
+# Agent name -> module that defines it
+_AGENTS = {
+    'CFRAgent': ('rlcard.agents.cfr_agent', 'CFRAgent'),
+    'MCCFRAgent': ('rlcard.agents.mccfr_agent', 'MCCFRAgent'),
+    'PublicTreeCFRAgent': ('rlcard.agents.public_tree_cfr_agent', 'PublicTreeCFRAgent'),
+    'LimitholdemHumanAgent': ('rlcard.agents.human_agents.limit_holdem_human_agent', 'HumanAgent'),
+    'NolimitholdemHumanAgent': ('rlcard.agents.human_agents.nolimit_holdem_human_agent', 'HumanAgent'),
+    'LeducholdemHumanAgent': ('rlcard.agents.human_agents.leduc_holdem_human_agent', 'HumanAgent'),
+    'BlackjackHumanAgent': ('rlcard.agents.human_agents.blackjack_human_agent', 'HumanAgent'),
+    'UnoHumanAgent': ('rlcard.agents.human_agents.uno_human_agent', 'HumanAgent'),
+    'RandomAgent': ('rlcard.agents.random_agent', 'RandomAgent'),
+}
 
-if 'torch' in installed_packages:
-    from rlcard.agents.dqn_agent import DQNAgent as DQNAgent
-    from rlcard.agents.nfsp_agent import NFSPAgent as NFSPAgent
+# The agents that need PyTorch are only available if it is installed
+if importlib.util.find_spec('torch') is not None:
+    _AGENTS['DQNAgent'] = ('rlcard.agents.dqn_agent', 'DQNAgent')
+    _AGENTS['NFSPAgent'] = ('rlcard.agents.nfsp_agent', 'NFSPAgent')
+    _AGENTS['DeepCFRAgent'] = ('rlcard.agents.deep_cfr_agent', 'DeepCFRAgent')
 
-from rlcard.agents.cfr_agent import CFRAgent
-from rlcard.agents.human_agents.limit_holdem_human_agent import HumanAgent as LimitholdemHumanAgent
-from rlcard.agents.human_agents.nolimit_holdem_human_agent import HumanAgent as NolimitholdemHumanAgent
-from rlcard.agents.human_agents.leduc_holdem_human_agent import HumanAgent as LeducholdemHumanAgent
-from rlcard.agents.human_agents.blackjack_human_agent import HumanAgent as BlackjackHumanAgent
-from rlcard.agents.human_agents.uno_human_agent import HumanAgent as UnoHumanAgent
-from rlcard.agents.random_agent import RandomAgent
+__all__ = list(_AGENTS)
+
+def __getattr__(name):
+    if name not in _AGENTS:
+        raise AttributeError('module {!r} has no attribute {!r}'.format(__name__, name))
+    mod_name, class_name = _AGENTS[name]
+    agent = getattr(importlib.import_module(mod_name), class_name)
+    globals()[name] = agent
+    return agent
+
+def __dir__():
+    return sorted(list(globals()) + __all__)
@@ -1,47 +1,176 @@
 import numpy as np
-import collections
 
 import os
 import pickle
-
+import traceback
+
+from rlcard.agents.infoset_table import (
+    InfosetIndexer,
+    InfosetTable,
+    is_checkpoint,
+    load_table,
+    load_tables,
+    save_tables,
+)
 from rlcard.utils.utils import *
 
+# The update rules of the regrets and the average policy
+VARIANTS = ('vanilla', 'linear', 'cfr+', 'dcfr')
+
 class CFRAgent():
     ''' Implement CFR (chance sampling) algorithm
+
+    The variant selects the update rule:
+
+        'vanilla': The regrets are summed and the average policy is weighted by the iteration
+        'linear': Linear CFR, the regrets are also weighted by the iteration
+        'cfr+': CFR+, the regrets are floored at zero after each update, and
+            the players are updated in turn
+        'dcfr': Discounted CFR, after each iteration t, the positive regrets are
+            multiplied by t^alpha / (t^alpha + 1), the negative regrets by
+            t^beta / (t^beta + 1) and the average policy by (t / (t + 1))^gamma
+
+    With a prune_threshold, the traversals skip the actions of the traverser
+    that have a zero probability and a regret below the threshold, i.e.,
+    regret-based pruning. Their regrets are left unchanged. Every
+    revisit_every iterations, and in the first prune_after iterations, the
+    whole tree is traversed, so that the pruned actions can recover.
+
+    With num_workers, the traversals of an iteration run in worker processes,
+    see CFRWorkerPool. Each worker traverses its own deal, so an iteration
+    samples num_workers deals per player instead of one.
     '''
 
-    def __init__(self, env, model_path='./cfr_model'):
+    def __init__(self, env, model_path='./cfr_model', variant='vanilla', alpha=1.5, beta=0.0, gamma=2.0,
+                 prune_threshold=None, prune_after=0, revisit_every=10, num_workers=0, start_method=None):
         ''' Initilize Agent
 
         Args:
             env (Env): Env class
+            model_path (string): The path of the saved model
+            variant (string): The update rule, one of VARIANTS
+            alpha (float): The discount exponent of the positive regrets in 'dcfr'
+            beta (float): The discount exponent of the negative regrets in 'dcfr'
+            gamma (float): The discount exponent of the average policy in 'dcfr'
+            prune_threshold (float): The regret below which the actions are
+                pruned, a negative number. Default is None, i.e., no pruning
+            prune_after (int): The number of iterations before the pruning starts
+            revisit_every (int): The period in iterations of the traversals without pruning
+            num_workers (int): The number of worker processes of the traversals.
+                Default is 0, i.e., the traversals run in this process
+            start_method (string): The multiprocessing start method of the
+                workers, e.g., 'fork' or 'spawn'. Default is the platform default
         '''
+        if variant not in VARIANTS:
+            raise ValueError("'variant' should be one of {}.".format(', '.join(VARIANTS)))
         self.use_raw = False
         self.env = env
         self.model_path = model_path
+        self.variant = variant
+        self.alpha = alpha
+        self.beta = beta
+        self.gamma = gamma
 
-        # A policy is a dict state_str -> action probabilities
-        self.policy = collections.defaultdict(list)
-        self.average_policy = collections.defaultdict(np.array)
+        # The infoset keys, i.e., the state_str, are mapped to the rows of the tables
+        self.infosets = InfosetIndexer()
 
-        # Regret is a dict state_str -> action regrets
-        self.regrets = collections.defaultdict(np.array)
+        # A policy is a table state_str -> action probabilities
+        self.policy = InfosetTable(self.infosets, self.env.num_actions)
+        self.average_policy = InfosetTable(self.infosets, self.env.num_actions)
+
+        # Regret is a table state_str -> action regrets
+        self.regrets = InfosetTable(self.infosets, self.env.num_actions)
 
         self.iteration = 0
 
+        # The weights of the regrets and the average policy in the current iteration
+        self.regret_weight = 1.0
+        self.average_weight = 1.0
+
+        self.prune_threshold = prune_threshold
+        self.prune_after = prune_after
+        self.revisit_every = revisit_every
+        # The actions pruned in the current traversal, a boolean matrix with
+        # the layout of the regrets, or None without pruning
+        self.pruned_actions = None
+
+        # The worker processes are started by the first iteration
+        self.num_workers = num_workers
+        self.start_method = start_method
+        self.workers = None
+
     def train(self):
         ''' Do one iteration of CFR
         '''
         self.iteration += 1
+        self.regret_weight, self.average_weight = self.iteration_weights()
         # Firstly, traverse tree to compute counterfactual regret for each player
         # The regrets are recorded in traversal
+        if self.num_workers > 0 and self.workers is None:
+            self.workers = CFRWorkerPool(self, self.num_workers, self.start_method)
         for player_id in range(self.env.num_players):
-            self.env.reset()
-            probs = np.ones(self.env.num_players)
-            self.traverse_tree(probs, player_id)
+            self.pruned_actions = self.pruning_mask()
+            if self.workers is not None:
+                self.workers.traverse(player_id)
+            else:
+                self.env.reset()
+                probs = np.ones(self.env.num_players)
+                self.traverse_tree(probs, player_id)
+            if self.variant == 'cfr+':
+                np.maximum(self.regrets.values, 0.0, out=self.regrets.values)
+                self.update_policy()
+
+        self.pruned_actions = None
+        if self.variant == 'dcfr':
+            self.discount()
 
         # Update policy
-        self.update_policy()
+        if self.variant != 'cfr+':
+            self.update_policy()
+
+    def pruning_mask(self):
+        ''' Get the actions to prune in the traversals of the current iteration
+
+        Returns:
+            (numpy.array): True for the actions whose regrets are below
+                prune_threshold, one row per infoset id, or None if the
+                current iteration traverses the whole tree
+        '''
+        if self.prune_threshold is None or self.iteration <= self.prune_after \
+                or self.iteration % self.revisit_every == 0:
+            return None
+        return self.regrets.values < self.prune_threshold
+
+    def close(self):
+        ''' Stop the worker processes, if any. They are started again by the next iteration
+        '''
+        if self.workers is not None:
+            self.workers.close()
+            self.workers = None
+
+    def iteration_weights(self):
+        ''' Get the weights of the updates of the current iteration
+
+        Returns:
+            (tuple) that contains:
+                regret_weight (float): The weight of the regrets
+                average_weight (float): The weight of the average policy
+        '''
+        if self.variant == 'linear':
+            return float(self.iteration), float(self.iteration)
+        if self.variant == 'dcfr':
+            return 1.0, 1.0
+        return 1.0, float(self.iteration)
+
+    def discount(self):
+        ''' Discount the regrets and the average policy at the end of an iteration of DCFR
+        '''
+        t = float(self.iteration)
+        regrets = self.regrets.values
+        positive = regrets > 0
+        regrets[positive] *= t ** self.alpha / (t ** self.alpha + 1)
+        regrets[~positive] *= t ** self.beta / (t ** self.beta + 1)
+        self.average_policy.values *= (t / (t + 1)) ** self.gamma
 
     def traverse_tree(self, probs, player_id):
         ''' Traverse the game tree, update the regrets
@@ -58,10 +187,16 @@ class CFRAgent():
 
         current_player = self.env.get_player_id()
 
-        action_utilities = {}
+        action_utilities = np.zeros((self.env.num_actions, self.env.num_players))
         state_utility = np.zeros(self.env.num_players)
         obs, legal_actions = self.get_state(current_player)
-        action_probs = self.action_probs(obs, legal_actions, self.policy)
+        info_id = self.infosets.index(obs)
+        action_probs = remove_illegal(self.policy.row(info_id, 1.0 / self.env.num_actions), legal_actions)
+
+        # The actions of the traverser that are pruned are not played
+        if current_player == player_id and self.pruned_actions is not None and info_id < len(self.pruned_actions):
+            pruned = self.pruned_actions[info_id]
+            legal_actions = [action for action in legal_actions if action_probs[action] > 0 or not pruned[action]]
 
         for action in legal_actions:
             action_prob = action_probs[action]
@@ -85,23 +220,33 @@ class CFRAgent():
                                 np.prod(probs[current_player + 1:]))
         player_state_utility = state_utility[current_player]
 
-        if obs not in self.regrets:
-            self.regrets[obs] = np.zeros(self.env.num_actions)
-        if obs not in self.average_policy:
-            self.average_policy[obs] = np.zeros(self.env.num_actions)
-        for action in legal_actions:
-            action_prob = action_probs[action]
-            regret = counterfactual_prob * (action_utilities[action][current_player]
-                    - player_state_utility)
-            self.regrets[obs][action] += regret
-            self.average_policy[obs][action] += self.iteration * player_prob * action_prob
+        self.regrets.row(info_id)[legal_actions] += self.regret_weight * counterfactual_prob * \
+            (action_utilities[legal_actions, current_player] - player_state_utility)
+        self.average_policy.row(info_id)[legal_actions] += self.average_weight * player_prob * action_probs[legal_actions]
         return state_utility
 
     def update_policy(self):
-        ''' Update policy based on the current regrets
+        ''' Update policy based on the current regrets, with one regret
+        matching pass over all the infosets
+        '''
+        ids = self.regrets.ids()
+        self.policy.set_rows(ids, self.regret_matching_rows(self.regrets.values[ids]))
+
+    def regret_matching_rows(self, regrets):
+        ''' Apply regret matching to a matrix of regrets
+
+        Args:
+            regrets (numpy.array): The regrets, one row per infoset
+
+        Returns:
+            (numpy.array): The action probabilities, one row per infoset
         '''
-        for obs in self.regrets:
-            self.policy[obs] = self.regret_matching(obs)
+        positive_regrets = np.maximum(regrets, 0.0)
+        positive_regret_sums = positive_regrets.sum(axis=1, keepdims=True)
+        has_positive = positive_regret_sums > 0
+        return np.where(has_positive,
+                        positive_regrets / np.where(has_positive, positive_regret_sums, 1.0),
+                        1.0 / self.env.num_actions)
 
     def regret_matching(self, obs):
         ''' Apply regret matching
@@ -109,24 +254,14 @@ class CFRAgent():
         Args:
             obs (string): The state_str
         '''
-        regret = self.regrets[obs]
-        positive_regret_sum = sum([r for r in regret if r > 0])
-
-        action_probs = np.zeros(self.env.num_actions)
-        if positive_regret_sum > 0:
-            for action in range(self.env.num_actions):
-                action_probs[action] = max(0.0, regret[action] / positive_regret_sum)
-        else:
-            for action in range(self.env.num_actions):
-                action_probs[action] = 1.0 / self.env.num_actions
-        return action_probs
+        return self.regret_matching_rows(self.regrets[obs][np.newaxis])[0]
 
     def action_probs(self, obs, legal_actions, policy):
         ''' Obtain the action probabilities of the current state
 
         Args:
             obs (str): state_str
-            legal_actions (list): List of leagel actions
+            legal_actions (list or numpy.array): List of leagel actions, or the legal action mask
             player_id (int): The current player
             policy (dict): The used policy
 
@@ -135,8 +270,8 @@ class CFRAgent():
                 action_probs(numpy.array): The action probabilities
                 legal_actions (list): Indices of legal actions
         '''
-        if obs not in policy.keys():
-            action_probs = np.array([1.0/self.env.num_actions for _ in range(self.env.num_actions)])
+        if obs not in policy:
+            action_probs = np.full(self.env.num_actions, 1.0 / self.env.num_actions)
             self.policy[obs] = action_probs
         else:
             action_probs = policy[obs]
@@ -153,7 +288,7 @@ class CFRAgent():
             action (int): Predicted action
             info (dict): A dictionary containing information
         '''
-        probs = self.action_probs(state['obs'].tostring(), list(state['legal_actions'].keys()), self.average_policy)
+        probs = self.action_probs(self.state_key(state), get_legal_mask(state, self.env.num_actions), self.average_policy)
         action = np.random.choice(len(probs), p=probs)
 
         info = {}
@@ -162,7 +297,8 @@ class CFRAgent():
         return action, info
 
     def get_state(self, player_id):
-        ''' Get state_str of the player
+        ''' Get state_str of the player. It is read with env.infoset_key,
+        which gives the same key as state_key without building the state
 
         Args:
             player_id (int): The player id
@@ -172,50 +308,265 @@ class CFRAgent():
                 state (str): The state str
                 legal_actions (list): Indices of legal actions
         '''
-        state = self.env.get_state(player_id)
-        return state['obs'].tostring(), list(state['legal_actions'].keys())
+        return self.env.infoset_key(player_id), self.env.legal_action_ids()
 
-    def save(self):
-        ''' Save model
-        '''
-        if not os.path.exists(self.model_path):
-            os.makedirs(self.model_path)
-
-        policy_file = open(os.path.join(self.model_path, 'policy.pkl'),'wb')
-        pickle.dump(self.policy, policy_file)
-        policy_file.close()
+    def state_key(self, state):
+        ''' Get the state_str of a state, i.e., the key of its infoset in the tables
 
-        average_policy_file = open(os.path.join(self.model_path, 'average_policy.pkl'),'wb')
-        pickle.dump(self.average_policy, average_policy_file)
-        average_policy_file.close()
+        Args:
+            state (dict): The state
 
-        regrets_file = open(os.path.join(self.model_path, 'regrets.pkl'),'wb')
-        pickle.dump(self.regrets, regrets_file)
-        regrets_file.close()
+        Returns:
+            (str): The state str
+        '''
+        return state['obs'].tobytes()
 
-        iteration_file = open(os.path.join(self.model_path, 'iteration.pkl'),'wb')
-        pickle.dump(self.iteration, iteration_file)
-        iteration_file.close()
+    def save(self):
+        ''' Save model, as a checkpoint of float32 tables that can be
+        memory-mapped, see rlcard.agents.infoset_table
+        '''
+        save_tables(self.model_path, {
+            'policy': self.policy,
+            'average_policy': self.average_policy,
+            'regrets': self.regrets,
+        })
+        np.save(os.path.join(self.model_path, 'iteration.npy'), self.iteration)
 
     def load(self):
-        ''' Load model
+        ''' Load model. The models saved as pickled dictionaries by the previous
+        versions are loaded as well
         '''
         if not os.path.exists(self.model_path):
             return
 
+        self.infosets = InfosetIndexer()
+
+        if is_checkpoint(self.model_path):
+            self.policy, self.average_policy, self.regrets = load_tables(
+                self.model_path, ['policy', 'average_policy', 'regrets'], self.infosets, self.env.num_actions)
+            self.iteration = int(np.load(os.path.join(self.model_path, 'iteration.npy')))
+            return
+
         policy_file = open(os.path.join(self.model_path, 'policy.pkl'),'rb')
-        self.policy = pickle.load(policy_file)
+        self.policy = self._load_table(pickle.load(policy_file))
         policy_file.close()
 
         average_policy_file = open(os.path.join(self.model_path, 'average_policy.pkl'),'rb')
-        self.average_policy = pickle.load(average_policy_file)
+        self.average_policy = self._load_table(pickle.load(average_policy_file))
         average_policy_file.close()
 
         regrets_file = open(os.path.join(self.model_path, 'regrets.pkl'),'rb')
-        self.regrets = pickle.load(regrets_file)
+        self.regrets = self._load_table(pickle.load(regrets_file))
         regrets_file.close()
 
         iteration_file = open(os.path.join(self.model_path, 'iteration.pkl'),'rb')
         self.iteration = pickle.load(iteration_file)
         iteration_file.close()
 
+    def load_average_policy(self, mmap_mode='r'):
+        ''' Load only the average policy of the model, which is all that
+        eval_step needs. The table is memory-mapped read-only, so the agent
+        can be evaluated but not trained afterwards
+
+        Args:
+            mmap_mode (string): The mode of numpy.load, None to read the table into memory
+        '''
+        if is_checkpoint(self.model_path):
+            self.average_policy = load_table(self.model_path, 'average_policy', mmap_mode)
+            return
+        self.infosets = InfosetIndexer()
+        average_policy_file = open(os.path.join(self.model_path, 'average_policy.pkl'),'rb')
+        self.average_policy = self._load_table(pickle.load(average_policy_file))
+        average_policy_file.close()
+
+    def _load_table(self, rows):
+        ''' Build a table from a dictionary state_str -> action values
+
+        Args:
+            rows (dict): The saved rows
+
+        Returns:
+            (InfosetTable): The table, indexed by self.infosets
+        '''
+        table = InfosetTable(self.infosets, self.env.num_actions)
+        ids = np.array([self.infosets.index(obs) for obs in rows], dtype=np.int64)
+        if len(ids) > 0:
+            table.set_rows(ids, np.array(list(rows.values())))
+        return table
+
+class CFRWorkerPool(object):
+    ''' Run the traversals of a CFRAgent in worker processes.
+
+    Each worker owns a copy of the environment, seeded differently, and the
+    infoset ids and policy of the agent. For each traversal, the agent sends
+    the infoset keys added since the last traversal and the rows of its policy
+    and of the pruned actions that changed since then. Every worker
+    plays its own deal and sends back the regret and average policy deltas of
+    the infosets it updated, with the keys of the infosets it discovered. The
+    deltas of all the workers are then added to the tables of the agent.
+    '''
+
+    def __init__(self, agent, num_workers, start_method=None):
+        ''' Start the workers
+
+        Args:
+            agent (CFRAgent): The agent whose tables are updated
+            num_workers (int): The number of worker processes
+            start_method (string): The multiprocessing start method, e.g., 'fork' or 'spawn'.
+                Default is the platform default
+        '''
+        import multiprocessing as mp
+
+        self.agent = agent
+        ctx = mp.get_context(start_method)
+        # The seeds of the workers follow the random state of the environment
+        seed = int(agent.env.np_random.randint(2 ** 31 - num_workers))
+        self.remotes = []
+        self.processes = []
+        for i in range(num_workers):
+            remote, worker_remote = ctx.Pipe()
+            process = ctx.Process(target=_cfr_worker, args=(worker_remote, remote, agent.env, seed + i), daemon=True)
+            process.start()
+            worker_remote.close()
+            self.remotes.append(remote)
+            self.processes.append(process)
+
+        # The indexer and the number of its keys that the workers know
+        self.infosets = None
+        self.synced = 0
+        # The policy rows and the pruned actions that the workers hold
+        self.values = None
+        self.present = None
+        self.pruned = None
+        self.closed = False
+
+    def traverse(self, player_id):
+        ''' Traverse one deal per worker and add the deltas to the tables of the agent
+
+        Args:
+            player_id (int): The player to update
+        '''
+        if self.closed:
+            raise RuntimeError('CFRWorkerPool is closed')
+        agent = self.agent
+        # The indexer is replaced when a model is loaded
+        reset = agent.infosets is not self.infosets
+        num_actions = agent.env.num_actions
+        if reset:
+            self.infosets, self.synced = agent.infosets, 0
+            self.values = np.zeros((0, num_actions))
+            self.present = np.zeros(0, dtype=np.bool_)
+            self.pruned = np.zeros((0, num_actions), dtype=np.bool_)
+        size = len(agent.infosets)
+        policy = agent.policy
+        policy.reserve(size)
+
+        # Only the rows that changed since the last traversal are sent
+        self.values, self.present = _grow(self.values, size), _grow(self.present, size)
+        values, present = policy.values[:size], policy.present[:size]
+        ids = np.flatnonzero((self.values[:size] != values).any(axis=1) | (self.present[:size] != present))
+        self.values[ids], self.present[ids] = values[ids], present[ids]
+        policy_rows = (ids, values[ids], present[ids])
+        pruned_rows = None
+        if agent.pruned_actions is not None:
+            self.pruned = _grow(self.pruned, size)
+            pruned = np.zeros((size, num_actions), dtype=np.bool_)
+            pruned[:len(agent.pruned_actions)] = agent.pruned_actions[:size]
+            ids = np.flatnonzero((self.pruned[:size] != pruned).any(axis=1))
+            self.pruned[ids] = pruned[ids]
+            pruned_rows = (ids, pruned[ids])
+        data = (player_id, agent.regret_weight, agent.average_weight, reset, agent.infosets.keys[self.synced:size],
+                policy_rows, pruned_rows)
+        for remote in self.remotes:
+            remote.send(('traverse', data))
+        self.synced = size
+
+        results = [remote.recv() for remote in self.remotes]
+        errors = [result for result in results if isinstance(result, str)]
+        if errors:
+            raise RuntimeError('Error in CFRWorkerPool worker:\n{}'.format(errors[0]))
+        uniform = 1.0 / agent.env.num_actions
+        for ids, regrets, average_policy, new_keys, timesteps in results:
+            # The environment of the agent counts the steps of the workers
+            agent.env.timestep += timesteps
+            # The ids of the new infosets differ between the workers
+            new_ids = np.array([agent.infosets.index(key) for key in new_keys], dtype=np.int64)
+            for info_id in new_ids:
+                policy.row(info_id, uniform)
+            known = ids < size
+            ids[~known] = new_ids[ids[~known] - size]
+            agent.regrets.add_rows(ids, regrets)
+            agent.average_policy.add_rows(ids, average_policy)
+
+    def close(self):
+        ''' Stop the worker processes
+        '''
+        if self.closed:
+            return
+        for remote in self.remotes:
+            remote.send(('close', None))
+        for process in self.processes:
+            process.join()
+        self.closed = True
+
+def _cfr_worker(remote, parent_remote, env, seed):
+    ''' The loop of a CFRWorkerPool worker
+    '''
+    parent_remote.close()
+    env.seed(seed)
+    agent = CFRAgent(env)
+    pruned = np.zeros((0, env.num_actions), dtype=np.bool_)
+    while True:
+        command, data = remote.recv()
+        if command == 'close':
+            break
+        try:
+            if command == 'traverse':
+                player_id, agent.regret_weight, agent.average_weight, reset, keys, policy_rows, pruned_rows = data
+                if reset:
+                    agent.infosets.truncate(0)
+                    agent.policy.clear()
+                    pruned = np.zeros((0, env.num_actions), dtype=np.bool_)
+                for key in keys:
+                    agent.infosets.index(key)
+                size = len(agent.infosets)
+                agent.policy.reserve(size)
+                ids, values, present = policy_rows
+                agent.policy.values[ids] = values
+                agent.policy.present[ids] = present
+                agent.pruned_actions = None
+                if pruned_rows is not None:
+                    pruned = _grow(pruned, size)
+                    pruned[pruned_rows[0]] = pruned_rows[1]
+                    agent.pruned_actions = pruned[:size]
+                # The rows that the traversal adds are dropped, they are synced by the agent
+                present = agent.policy.present[:size].copy()
+
+                # The tables only hold the deltas of this traversal
+                agent.regrets.clear()
+                agent.average_policy.clear()
+                timestep = env.timestep
+                env.reset()
+                agent.traverse_tree(np.ones(env.num_players), player_id)
+                ids = agent.regrets.ids()
+                remote.send((ids, agent.regrets.values[ids], agent.average_policy.values[ids],
+                             agent.infosets.keys[size:], env.timestep - timestep))
+
+                # The agent assigns the ids of the new infosets
+                agent.infosets.truncate(size)
+                agent.policy.present[:size] = present
+                agent.policy.present[size:] = False
+            else:
+                raise ValueError('Unknown command: {}'.format(command))
+        except Exception:
+            remote.send(traceback.format_exc())
+    remote.close()
+
+def _grow(array, size):
+    ''' Grow an array along its first axis, doubling its capacity, so that it has at least size rows
+    '''
+    if size <= len(array):
+        return array
+    grown = np.zeros((max(size, 2 * len(array)),) + array.shape[1:], dtype=array.dtype)
+    grown[:len(array)] = array
+    return grown
@@ -0,0 +1,499 @@
+''' Deep CFR agent
+
+See the paper https://arxiv.org/abs/1811.00164 for more details.
+'''
+import os
+from copy import deepcopy
+
+import numpy as np
+import torch
+import torch.nn as nn
+
+from rlcard.utils.utils import get_legal_mask
+
+class DeepCFRAgent(object):
+    ''' Implement Deep CFR with external sampling.
+
+    In each iteration, the agent plays num_traversals external sampling
+    traversals per player with `step` and `step_back`, as MCCFRAgent does.
+    The regrets of the infosets are not stored in tables but approximated by
+    an advantage network per player, trained on a reservoir memory of the
+    sampled advantages. The strategies of the other players met in the
+    traversals are kept in a strategy memory, on which the policy network
+    that eval_step uses is trained by train_policy.
+
+    The traversals of several games run together: each traversal is a
+    generator that yields the states it needs the current strategy of, so
+    that the advantage networks evaluate the pending states of all the games
+    in one batch.
+    '''
+
+    def __init__(self,
+                 env,
+                 model_path='./deep_cfr_model',
+                 mlp_layers=None,
+                 num_traversals=100,
+                 batch_traversals=32,
+                 advantage_memory_capacity=100000,
+                 strategy_memory_capacity=100000,
+                 advantage_train_steps=200,
+                 policy_train_steps=400,
+                 batch_size=256,
+                 learning_rate=0.001,
+                 reinitialize_advantage_networks=True,
+                 device=None):
+        ''' Initilize Agent
+
+        Args:
+            env (Env): Env class, with allow_step_back
+            model_path (string): The path of the saved model
+            mlp_layers (list): The sizes of the hidden layers of the networks
+            num_traversals (int): The number of traversals per player in an iteration
+            batch_traversals (int): The number of traversals that run together
+            advantage_memory_capacity (int): The size of the advantage memory of each player
+            strategy_memory_capacity (int): The size of the strategy memory
+            advantage_train_steps (int): The number of batches an advantage network is trained on per iteration
+            policy_train_steps (int): The number of batches the policy network is trained on
+            batch_size (int): The batch size of the training
+            learning_rate (float): The learning rate of the networks
+            reinitialize_advantage_networks (boolean): True to train the
+                advantage networks from scratch in each iteration, as in the paper
+            device (torch.device): Whether to use the cpu or gpu
+        '''
+        if not env.allow_step_back:
+            raise ValueError('DeepCFRAgent needs an environment with allow_step_back.')
+        self.use_raw = False
+        self.env = env
+        self.model_path = model_path
+        self.num_actions = env.num_actions
+        self.num_players = env.num_players
+        self.state_shape = env.state_shape
+        self.mlp_layers = [64, 64] if mlp_layers is None else mlp_layers
+        self.num_traversals = num_traversals
+        self.batch_traversals = batch_traversals
+        self.advantage_train_steps = advantage_train_steps
+        self.policy_train_steps = policy_train_steps
+        self.batch_size = batch_size
+        self.learning_rate = learning_rate
+        self.reinitialize_advantage_networks = reinitialize_advantage_networks
+
+        if device is None:
+            self.device = torch.device('cuda:0' if torch.cuda.is_available() else 'cpu')
+        else:
+            self.device = device
+
+        self.advantage_networks = [self._build_network(player_id) for player_id in range(self.num_players)]
+        self.policy_networks = [self._build_network(player_id) for player_id in range(self.num_players)]
+        self.advantage_memories = [ReservoirMemory(advantage_memory_capacity, self.state_shape[player_id], self.num_actions)
+                                   for player_id in range(self.num_players)]
+        self.strategy_memories = [ReservoirMemory(strategy_memory_capacity, self.state_shape[player_id], self.num_actions)
+                                  for player_id in range(self.num_players)]
+
+        # The games of the traversals that run together, seeded from the environment
+        self.envs = []
+        for _ in range(batch_traversals):
+            env_copy = deepcopy(env)
+            env_copy.seed(int(env.np_random.randint(2 ** 31)))
+            self.envs.append(env_copy)
+
+        self.iteration = 0
+        # The iteration the policy networks were trained at
+        self.policy_iteration = 0
+
+    def _build_network(self, player_id):
+        ''' Build the network of a player
+
+        Args:
+            player_id (int): The player id
+
+        Returns:
+            (DeepCFRNetwork): The network, on self.device
+        '''
+        network = DeepCFRNetwork(self.num_actions, self.state_shape[player_id], self.mlp_layers)
+        return network.to(self.device)
+
+    def train(self):
+        ''' Do one iteration of Deep CFR: the traversals of each player, then
+        the training of its advantage network on its advantage memory
+        '''
+        self.iteration += 1
+        for player_id in range(self.num_players):
+            self.traverse(player_id, self.num_traversals)
+            if self.reinitialize_advantage_networks:
+                self.advantage_networks[player_id] = self._build_network(player_id)
+            self.train_network(self.advantage_networks[player_id], self.advantage_memories[player_id],
+                               self.advantage_train_steps, 'advantage')
+
+    def train_policy(self):
+        ''' Train the policy networks on the strategy memories. Call it after
+        the last iteration, before eval_step
+        '''
+        for player_id in range(self.num_players):
+            self.policy_networks[player_id] = self._build_network(player_id)
+            self.train_network(self.policy_networks[player_id], self.strategy_memories[player_id],
+                               self.policy_train_steps, 'policy')
+        self.policy_iteration = self.iteration
+
+    def train_network(self, network, memory, num_steps, target):
+        ''' Train a network on a memory. The samples are weighted by their
+        iteration, as in Linear CFR
+
+        Args:
+            network (DeepCFRNetwork): The network
+            memory (ReservoirMemory): The samples
+            num_steps (int): The number of batches
+            target (string): 'advantage' to regress the advantages of the
+                legal actions, 'policy' to fit the strategies with a cross entropy
+
+        Returns:
+            (float): The loss of the last batch, or None if the memory is empty
+        '''
+        if len(memory) == 0:
+            return None
+        optimizer = torch.optim.Adam(network.parameters(), lr=self.learning_rate)
+        network.train()
+        loss = None
+        for _ in range(num_steps):
+            obs, values, legal_mask, iterations = memory.sample(self.batch_size)
+            obs = torch.from_numpy(obs).to(self.device)
+            values = torch.from_numpy(values).to(self.device)
+            legal_mask = torch.from_numpy(legal_mask).to(self.device)
+            weights = torch.from_numpy(iterations / self.iteration).to(self.device)
+
+            outputs = network(obs)
+            if target == 'advantage':
+                losses = ((outputs - values) ** 2 * legal_mask).sum(dim=-1)
+            else:
+                log_probs = torch.log_softmax(outputs.masked_fill(~legal_mask, -1e9), dim=-1)
+                losses = -(values * log_probs.masked_fill(~legal_mask, 0.0)).sum(dim=-1)
+            batch_loss = (weights * losses).mean()
+            optimizer.zero_grad()
+            batch_loss.backward()
+            optimizer.step()
+            loss = batch_loss.item()
+        network.eval()
+        return loss
+
+    def traverse(self, player_id, num_traversals):
+        ''' Play external sampling traversals for a player, batch_traversals
+        games at a time, and fill the memories
+
+        Args:
+            player_id (int): The traverser
+            num_traversals (int): The number of traversals
+        '''
+        started = 0
+
+        def start(env):
+            ''' Start the next traversal in a game, skipping the games that are over right away
+
+            Returns:
+                (tuple): The traversal and its first request, or None if all the traversals are started
+            '''
+            nonlocal started
+            while started < num_traversals:
+                started += 1
+                env.reset()
+                traversal = self._traverse(env, player_id)
+                try:
+                    return traversal, next(traversal)
+                except StopIteration:
+                    pass
+            return None
+
+        pending = [item for item in (start(env) for env in self.envs) if item is not None]
+        while pending:
+            # The pending states of all the games, evaluated per player in one batch
+            strategies = [None] * len(pending)
+            for current_player in range(self.num_players):
+                indices = [i for i, (_, request) in enumerate(pending) if request[0] == current_player]
+                if not indices:
+                    continue
+                obs = np.array([pending[i][1][1] for i in indices], dtype=np.float32)
+                legal_mask = np.array([pending[i][1][2] for i in indices])
+                for i, strategy in zip(indices, self.current_strategies(current_player, obs, legal_mask)):
+                    strategies[i] = strategy
+
+            running = []
+            for (traversal, request), strategy in zip(pending, strategies):
+                try:
+                    running.append((traversal, traversal.send(strategy)))
+                except StopIteration:
+                    # The game of the finished traversal plays the next one
+                    item = start(request[3])
+                    if item is not None:
+                        running.append(item)
+            pending = running
+
+    def _traverse(self, env, player_id):
+        ''' An external sampling traversal of a game. It is a generator that
+        yields a request (player_id, obs, legal_mask, env) for the strategy of
+        each state it visits, and receives the strategy
+
+        Args:
+            env (Env): The game
+            player_id (int): The traverser
+
+        Returns:
+            (float): The sampled utility of the traverser
+        '''
+        if env.is_over():
+            return env.get_payoffs()[player_id]
+
+        current_player = env.get_player_id()
+        state = env.get_state(current_player)
+        obs = np.asarray(state['obs'], dtype=np.float32)
+        legal_mask = get_legal_mask(state, self.num_actions)
+        strategy = yield (current_player, obs, legal_mask, env)
+
+        if not current_player == player_id:
+            self.strategy_memories[current_player].add(obs, strategy, legal_mask, self.iteration)
+            action = np.random.choice(self.num_actions, p=strategy)
+            env.step(action)
+            utility = yield from self._traverse(env, player_id)
+            env.step_back()
+            return utility
+
+        action_utilities = np.zeros(self.num_actions)
+        for action in np.flatnonzero(legal_mask):
+            env.step(action)
+            action_utilities[action] = yield from self._traverse(env, player_id)
+            env.step_back()
+        state_utility = np.dot(strategy, action_utilities)
+        advantages = (action_utilities - state_utility) * legal_mask
+        self.advantage_memories[player_id].add(obs, advantages, legal_mask, self.iteration)
+        return state_utility
+
+    def current_strategies(self, player_id, obs, legal_mask):
+        ''' Apply regret matching to the predicted advantages of several states.
+        If no legal action has a positive advantage, the action with the
+        highest advantage is played. The untrained networks play uniformly
+
+        Args:
+            player_id (int): The player id
+            obs (numpy.array): The observations, one row per state
+            legal_mask (numpy.array): The boolean legal action masks, one row per state
+
+        Returns:
+            (numpy.array): The action probabilities, one row per state
+        '''
+        uniform = legal_mask / legal_mask.sum(axis=1, keepdims=True)
+        if self.iteration <= 1:
+            return uniform
+        with torch.no_grad():
+            advantages = self.advantage_networks[player_id](torch.from_numpy(obs).to(self.device)).cpu().numpy().astype(np.float64)
+        advantages = np.where(legal_mask, advantages, -np.inf)
+        positive = np.maximum(advantages, 0.0)
+        totals = positive.sum(axis=1, keepdims=True)
+        best = np.zeros(legal_mask.shape)
+        best[np.arange(len(best)), np.argmax(advantages, axis=1)] = 1.0
+        return np.where(totals > 0, positive / np.where(totals > 0, totals, 1.0), best)
+
+    def action_probs(self, state):
+        ''' Get the probabilities of the policy network in a state
+
+        Args:
+            state (dict): The state
+
+        Returns:
+            (numpy.array): The action probabilities
+        '''
+        player_id = self.player_of(state)
+        legal_mask = get_legal_mask(state, self.num_actions)
+        obs = torch.from_numpy(np.asarray(state['obs'], dtype=np.float32)[np.newaxis]).to(self.device)
+        with torch.no_grad():
+            logits = self.policy_networks[player_id](obs).cpu().numpy()[0].astype(np.float64)
+        logits = np.where(legal_mask, logits, -np.inf)
+        probs = np.exp(logits - np.max(logits))
+        return probs / probs.sum()
+
+    def player_of(self, state):
+        ''' Find the player of a state, from the raw observation if it tells,
+        otherwise from the shape of the observation
+
+        Args:
+            state (dict): The state
+
+        Returns:
+            (int): The player id
+        '''
+        raw_obs = state.get('raw_obs')
+        if isinstance(raw_obs, dict):
+            for key in ('current_player', 'self'):
+                if key in raw_obs:
+                    return int(raw_obs[key])
+        shape = np.shape(state['obs'])
+        for player_id, state_shape in enumerate(self.state_shape):
+            if tuple(state_shape) == shape:
+                return player_id
+        return 0
+
+    def eval_step(self, state):
+        ''' Given a state, predict action based on the policy network. The
+        network is the one of the last call to train_policy, see policy_iteration
+
+        Args:
+            state (numpy.array): State representation
+
+        Returns:
+            action (int): Predicted action
+            info (dict): A dictionary containing information
+        '''
+        probs = self.action_probs(state)
+        action = np.random.choice(len(probs), p=probs)
+
+        info = {}
+        info['probs'] = {state['raw_legal_actions'][i]: float(probs[list(state['legal_actions'].keys())[i]]) for i in range(len(state['legal_actions']))}
+
+        return action, info
+
+    def save(self):
+        ''' Save the networks. The memories are not saved
+        '''
+        if not os.path.exists(self.model_path):
+            os.makedirs(self.model_path)
+        torch.save({
+            'advantage_networks': [network.state_dict() for network in self.advantage_networks],
+            'policy_networks': [network.state_dict() for network in self.policy_networks],
+            'iteration': self.iteration,
+            'policy_iteration': self.policy_iteration,
+        }, os.path.join(self.model_path, 'deep_cfr.pt'))
+
+    def load(self):
+        ''' Load the networks
+        '''
+        path = os.path.join(self.model_path, 'deep_cfr.pt')
+        if not os.path.exists(path):
+            return
+        checkpoint = torch.load(path, map_location=self.device)
+        for network, state_dict in zip(self.advantage_networks, checkpoint['advantage_networks']):
+            network.load_state_dict(state_dict)
+        for network, state_dict in zip(self.policy_networks, checkpoint['policy_networks']):
+            network.load_state_dict(state_dict)
+        self.iteration = checkpoint['iteration']
+        self.policy_iteration = checkpoint['policy_iteration']
+
+    def set_device(self, device):
+        self.device = device
+        for network in self.advantage_networks + self.policy_networks:
+            network.to(device)
+
+class DeepCFRNetwork(nn.Module):
+    ''' The network of the advantages or of the policy of a player. It is a
+    series of ReLU layers, with one output per action
+    '''
+
+    def __init__(self, num_actions=2, state_shape=None, mlp_layers=None):
+        ''' Initialize the network
+
+        Args:
+            num_actions (int): number of actions
+            state_shape (list): shape of state tensor
+            mlp_layers (list): output size of each hidden layer
+        '''
+        super(DeepCFRNetwork, self).__init__()
+
+        layer_dims = [int(np.prod(state_shape))] + mlp_layers
+        fc = [nn.Flatten()]
+        for i in range(len(layer_dims)-1):
+            fc.append(nn.Linear(layer_dims[i], layer_dims[i+1]))
+            fc.append(nn.ReLU())
+        fc.append(nn.Linear(layer_dims[-1], num_actions))
+        self.fc_layers = nn.Sequential(*fc)
+
+    def forward(self, s):
+        ''' Predict the advantages or the logits of the actions
+
+        Args:
+            s  (Tensor): (batch, state_shape)
+        '''
+        return self.fc_layers(s)
+
+class ReservoirMemory(object):
+    ''' A reservoir sample of fixed size over a stream of (obs, values,
+    legal_mask, iteration) samples, stored in preallocated numpy arrays.
+
+    The values are stored sparsely, as the ids and the values of the legal
+    actions, padded to the largest number of legal actions seen so far, so
+    that the memory does not grow with the action space, e.g., of Dou Dizhu.
+    The values of the illegal actions are dropped.
+
+    See https://en.wikipedia.org/wiki/Reservoir_sampling for more details.
+    '''
+
+    def __init__(self, capacity, state_shape, num_actions):
+        ''' Allocate the memory
+
+        Args:
+            capacity (int): The maximum number of samples
+            state_shape (list): The shape of the observations
+            num_actions (int): The number of actions
+        '''
+        self.capacity = capacity
+        self.num_actions = num_actions
+        self.obs = np.zeros((capacity, *state_shape), dtype=np.float32)
+        self.action_ids = np.zeros((capacity, 0), dtype=np.int32)
+        self.values = np.zeros((capacity, 0), dtype=np.float32)
+        self.num_legal = np.zeros(capacity, dtype=np.int32)
+        self.iterations = np.zeros(capacity, dtype=np.float32)
+        self.size = 0
+        self.add_calls = 0
+
+    def _widen(self, width):
+        ''' Grow the padded rows of the action ids and the values to width columns
+        '''
+        action_ids = np.zeros((self.capacity, width), dtype=np.int32)
+        action_ids[:, :self.action_ids.shape[1]] = self.action_ids
+        values = np.zeros((self.capacity, width), dtype=np.float32)
+        values[:, :self.values.shape[1]] = self.values
+        self.action_ids, self.values = action_ids, values
+
+    def add(self, obs, values, legal_mask, iteration):
+        ''' Potentially add a sample
+
+        Args:
+            obs (numpy.array): The observation
+            values (numpy.array): The advantages or the action probabilities
+            legal_mask (numpy.array): The boolean legal action mask
+            iteration (int): The iteration of the sample
+        '''
+        if self.size < self.capacity:
+            index = self.size
+            self.size += 1
+        else:
+            index = np.random.randint(0, self.add_calls + 1)
+        self.add_calls += 1
+        if index < self.capacity:
+            action_ids = np.flatnonzero(legal_mask)
+            num_legal = len(action_ids)
+            if num_legal > self.action_ids.shape[1]:
+                self._widen(num_legal)
+            self.obs[index] = obs
+            self.action_ids[index, :num_legal] = action_ids
+            self.values[index, :num_legal] = values[action_ids]
+            self.num_legal[index] = num_legal
+            self.iterations[index] = iteration
+
+    def sample(self, batch_size):
+        ''' Sample a batch uniformly, with replacement
+
+        Args:
+            batch_size (int): The number of samples
+
+        Returns:
+            (tuple): The arrays of the observations, the values, the legal
+                action masks and the iterations of the samples
+        '''
+        indices = np.random.randint(0, self.size, size=batch_size)
+        # Scatter the legal actions of the batch into dense rows
+        legal = np.arange(self.action_ids.shape[1]) < self.num_legal[indices, np.newaxis]
+        rows = np.nonzero(legal)[0]
+        columns = self.action_ids[indices][legal]
+        values = np.zeros((batch_size, self.num_actions), dtype=np.float32)
+        values[rows, columns] = self.values[indices][legal]
+        legal_mask = np.zeros((batch_size, self.num_actions), dtype=np.bool_)
+        legal_mask[rows, columns] = True
+        return self.obs[indices], values, legal_mask, self.iterations[indices]
+
+    def __len__(self):
+        return self.size
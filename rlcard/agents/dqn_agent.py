@@ -32,9 +32,9 @@ import torch.nn as nn
 from collections import namedtuple
 from copy import deepcopy
 
-from rlcard.utils.utils import remove_illegal
+from rlcard.utils.utils import get_legal_mask
 
-Transition = namedtuple('Transition', ['state', 'action', 'reward', 'next_state', 'legal_actions', 'done'])
+Transition = namedtuple('Transition', ['state', 'action', 'reward', 'next_state', 'legal_mask', 'done'])
 
 
 class DQNAgent(object):
@@ -124,7 +124,7 @@ class DQNAgent(object):
             ts (list): a list of 5 elements that represent the transition
         '''
         (state, action, reward, next_state, done) = tuple(ts)
-        self.feed_memory(state['obs'], action, reward, next_state['obs'], list(next_state['legal_actions'].keys()), done)
+        self.feed_memory(state['obs'], action, reward, next_state['obs'], get_legal_mask(next_state, self.num_actions), done)
         self.total_t += 1
         tmp = self.total_t - self.replay_memory_init_size
         if tmp>=0 and tmp%self.train_every == 0:
@@ -142,9 +142,9 @@ class DQNAgent(object):
         '''
         q_values = self.predict(state)
         epsilon = self.epsilons[min(self.total_t, self.epsilon_decay_steps-1)]
-        legal_actions = list(state['legal_actions'].keys())
+        legal_actions = np.flatnonzero(get_legal_mask(state, self.num_actions))
         probs = np.ones(len(legal_actions), dtype=float) * epsilon / len(legal_actions)
-        best_action_idx = legal_actions.index(np.argmax(q_values))
+        best_action_idx = np.searchsorted(legal_actions, np.argmax(q_values))
         probs[best_action_idx] += (1.0 - epsilon)
         action_idx = np.random.choice(np.arange(len(probs)), p=probs)
 
@@ -179,28 +179,62 @@ class DQNAgent(object):
         '''
         
         q_values = self.q_estimator.predict_nograd(np.expand_dims(state['obs'], 0))[0]
-        masked_q_values = -np.inf * np.ones(self.num_actions, dtype=float)
-        legal_actions = list(state['legal_actions'].keys())
-        masked_q_values[legal_actions] = q_values[legal_actions]
+        masked_q_values = np.where(get_legal_mask(state, self.num_actions), q_values, -np.inf)
 
         return masked_q_values
 
+    def predict_batch(self, obs, legal_mask):
+        ''' Predict the masked Q-values of several states in one forward pass
+
+        Args:
+            obs (numpy.array): The stacked observations, e.g., of a VecEnv
+            legal_mask (numpy.array): The stacked boolean legal action masks
+
+        Returns:
+            q_values (numpy.array): The Q-values, one row per state
+        '''
+        q_values = self.q_estimator.predict_nograd(np.asarray(obs, dtype=np.float32))
+        return np.where(legal_mask, q_values, -np.inf)
+
+    def step_batch(self, obs, legal_mask):
+        ''' Predict the epsilon-greedy actions of several states for generating training data
+
+        Args:
+            obs (numpy.array): The stacked observations, e.g., of a VecEnv
+            legal_mask (numpy.array): The stacked boolean legal action masks
+
+        Returns:
+            actions (numpy.array): The action ids, one per state
+        '''
+        best_actions = np.argmax(self.predict_batch(obs, legal_mask), axis=1)
+        epsilon = self.epsilons[min(self.total_t, self.epsilon_decay_steps-1)]
+        # A uniform legal action, from the largest random key among the legal actions
+        random_actions = np.argmax(np.where(legal_mask, np.random.random_sample(legal_mask.shape), -1.0), axis=1)
+        return np.where(np.random.random_sample(len(best_actions)) < epsilon, random_actions, best_actions)
+
+    def eval_step_batch(self, obs, legal_mask):
+        ''' Predict the greedy actions of several states for evaluation
+
+        Args:
+            obs (numpy.array): The stacked observations, e.g., of a VecEnv
+            legal_mask (numpy.array): The stacked boolean legal action masks
+
+        Returns:
+            actions (numpy.array): The action ids, one per state
+        '''
+        return np.argmax(self.predict_batch(obs, legal_mask), axis=1)
+
     def train(self):
         ''' Train the network
 
         Returns:
             loss (float): The loss of the current batch.
         '''
-        state_batch, action_batch, reward_batch, next_state_batch, legal_actions_batch, done_batch = self.memory.sample()
+        state_batch, action_batch, reward_batch, next_state_batch, legal_mask_batch, done_batch = self.memory.sample()
 
         # Calculate best next actions using Q-network (Double DQN)
         q_values_next = self.q_estimator.predict_nograd(next_state_batch)
-        legal_actions = []
-        for b in range(self.batch_size):
-            legal_actions.extend([i + b * self.num_actions for i in legal_actions_batch[b]])
-        masked_q_values = -np.inf * np.ones(self.num_actions * self.batch_size, dtype=float)
-        masked_q_values[legal_actions] = q_values_next.flatten()[legal_actions]
-        masked_q_values = masked_q_values.reshape((self.batch_size, self.num_actions))
+        masked_q_values = np.where(legal_mask_batch, q_values_next, -np.inf)
         best_actions = np.argmax(masked_q_values, axis=1)
 
         # Evaluate best next actions using Target-network (Double DQN)
@@ -229,9 +263,15 @@ class DQNAgent(object):
             action (int): the performed action ID
             reward (float): the reward received
             next_state (numpy.array): the next state after performing the action
-            legal_actions (list): the legal actions of the next state
+            legal_actions (numpy.array or list): the boolean legal action mask of the next state,
+                or the list of its legal actions
             done (boolean): whether the episode is finished
         '''
+        legal_actions = np.asarray(legal_actions)
+        if legal_actions.dtype != np.bool_:
+            legal_mask = np.zeros(self.num_actions, dtype=np.bool_)
+            legal_mask[legal_actions.astype(int)] = True
+            legal_actions = legal_mask
         self.memory.save(state, action, reward, next_state, legal_actions, done)
 
     def set_device(self, device):
@@ -386,7 +426,7 @@ class Memory(object):
         self.batch_size = batch_size
         self.memory = []
 
-    def save(self, state, action, reward, next_state, legal_actions, done):
+    def save(self, state, action, reward, next_state, legal_mask, done):
         ''' Save transition into memory
 
         Args:
@@ -394,12 +434,12 @@ class Memory(object):
             action (int): the performed action ID
             reward (float): the reward received
             next_state (numpy.array): the next state after performing the action
-            legal_actions (list): the legal actions of the next state
+            legal_mask (numpy.array): the boolean legal action mask of the next state
             done (boolean): whether the episode is finished
         '''
         if len(self.memory) == self.memory_size:
             self.memory.pop(0)
-        transition = Transition(state, action, reward, next_state, legal_actions, done)
+        transition = Transition(state, action, reward, next_state, legal_mask, done)
         self.memory.append(transition)
 
     def sample(self):
@@ -410,7 +450,10 @@ class Memory(object):
             action_batch (list): a batch of actions
             reward_batch (list): a batch of rewards
             next_state_batch (list): a batch of states
+            legal_mask_batch (numpy.array): a batch of legal action masks of the next states
             done_batch (list): a batch of dones
         '''
         samples = random.sample(self.memory, self.batch_size)
-        return map(np.array, zip(*samples))
+        state_batch, action_batch, reward_batch, next_state_batch, legal_mask_batch, done_batch = zip(*samples)
+        return (np.array(state_batch), np.array(action_batch), np.array(reward_batch),
+                np.array(next_state_batch), np.array(legal_mask_batch), np.array(done_batch))
@@ -0,0 +1,350 @@
+''' Dense storage of the per-infoset arrays of the CFR agents, and their
+checkpoint format.
+
+A checkpoint is a directory of .npy files. The infoset keys, which are bytes,
+are sorted and concatenated in `keys.npy` with their boundaries in
+`key_offsets.npy`. Each table is a float32 matrix `<name>.npy` with one row per
+key in the sorted order, and a row of NaN for the keys that the table does not
+contain. The files can be memory-mapped, so that opening a large policy is
+immediate and the processes that read it share the pages.
+'''
+import os
+from bisect import bisect_left
+from collections.abc import Mapping, MutableMapping
+
+import numpy as np
+
+class InfosetIndexer(object):
+    ''' Map the infoset keys, e.g., the bytes of the observations, to dense
+    integer ids 0, 1, 2, ... in the order of their first lookup
+    '''
+
+    def __init__(self):
+        self.ids = {}
+        self.keys = []
+
+    def index(self, key):
+        ''' Get the id of a key, and assign the next id to a new key
+
+        Args:
+            key (hashable): The infoset key
+
+        Returns:
+            (int): The id of the infoset
+        '''
+        info_id = self.ids.get(key)
+        if info_id is None:
+            info_id = len(self.keys)
+            self.ids[key] = info_id
+            self.keys.append(key)
+        return info_id
+
+    def get(self, key, default=None):
+        ''' Get the id of a key without assigning one
+
+        Args:
+            key (hashable): The infoset key
+            default: The value returned for an unknown key
+
+        Returns:
+            (int): The id of the infoset, or default
+        '''
+        return self.ids.get(key, default)
+
+    def truncate(self, size):
+        ''' Forget the keys with ids greater than or equal to size
+
+        Args:
+            size (int): The number of keys to keep
+        '''
+        for key in self.keys[size:]:
+            del self.ids[key]
+        del self.keys[size:]
+
+    def __contains__(self, key):
+        return key in self.ids
+
+    def __len__(self):
+        return len(self.keys)
+
+class InfosetTable(MutableMapping):
+    ''' A 2-D float matrix with one row of num_actions values per infoset.
+
+    The rows are indexed by the ids of an InfosetIndexer, which several tables
+    can share so that one id addresses the regrets, the policy and the average
+    policy of an infoset. The matrix grows by chunks of rows. A table only
+    contains the infosets whose rows were written, so it can also be used as a
+    dictionary from the keys to the rows, as the tables of CFRAgent used to be.
+    '''
+
+    def __init__(self, indexer, num_actions, chunk_size=1024):
+        ''' Initialize an empty table
+
+        Args:
+            indexer (InfosetIndexer): The indexer of the infosets
+            num_actions (int): The number of actions
+            chunk_size (int): The number of rows allocated at a time
+        '''
+        self.indexer = indexer
+        self.num_actions = num_actions
+        self.chunk_size = chunk_size
+        self.values = np.zeros((chunk_size, num_actions))
+        self.present = np.zeros(chunk_size, dtype=np.bool_)
+
+    def reserve(self, size):
+        ''' Grow the matrix so that it has at least size rows
+        '''
+        capacity = len(self.present)
+        if size <= capacity:
+            return
+        capacity = -(-size // self.chunk_size) * self.chunk_size
+        values = np.zeros((capacity, self.num_actions))
+        values[:len(self.values)] = self.values
+        present = np.zeros(capacity, dtype=np.bool_)
+        present[:len(self.present)] = self.present
+        self.values, self.present = values, present
+
+    def has(self, info_id):
+        ''' Check if the row of an infoset id was written
+
+        Args:
+            info_id (int): The id of the infoset
+
+        Returns:
+            (boolean): True if the table contains the infoset
+        '''
+        return info_id < len(self.present) and self.present[info_id]
+
+    def row(self, info_id, fill=0.0):
+        ''' Get the row of an infoset id, and add it if it is missing
+
+        Args:
+            info_id (int): The id of the infoset
+            fill (float): The initial values of a new row
+
+        Returns:
+            (numpy.array): A view of the row, which is valid until the table grows
+        '''
+        if not self.has(info_id):
+            self.reserve(info_id + 1)
+            self.values[info_id] = fill
+            self.present[info_id] = True
+        return self.values[info_id]
+
+    def ids(self):
+        ''' Get the ids of the infosets in the table
+
+        Returns:
+            (numpy.array): The ids in increasing order
+        '''
+        return np.flatnonzero(self.present)
+
+    def set_rows(self, ids, rows):
+        ''' Write several rows at once
+
+        Args:
+            ids (numpy.array): The ids of the infosets
+            rows (numpy.array): The values, one row per id
+        '''
+        if len(ids) > 0:
+            self.reserve(int(np.max(ids)) + 1)
+        self.values[ids] = rows
+        self.present[ids] = True
+
+    def add_rows(self, ids, rows):
+        ''' Add values to several rows at once, the missing rows start at zero
+
+        Args:
+            ids (numpy.array): The ids of the infosets
+            rows (numpy.array): The values, one row per id
+        '''
+        if len(ids) > 0:
+            self.reserve(int(np.max(ids)) + 1)
+        self.values[ids[~self.present[ids]]] = 0.0
+        np.add.at(self.values, ids, rows)
+        self.present[ids] = True
+
+    def clear(self):
+        ''' Remove all the rows
+        '''
+        self.values[:] = 0.0
+        self.present[:] = False
+
+    def __getitem__(self, key):
+        info_id = self.indexer.get(key)
+        if info_id is None or not self.has(info_id):
+            raise KeyError(key)
+        return self.values[info_id]
+
+    def __setitem__(self, key, value):
+        self.row(self.indexer.index(key))[:] = value
+
+    def __delitem__(self, key):
+        info_id = self.indexer.get(key)
+        if info_id is None or not self.has(info_id):
+            raise KeyError(key)
+        self.present[info_id] = False
+
+    def __contains__(self, key):
+        info_id = self.indexer.get(key)
+        return info_id is not None and self.has(info_id)
+
+    def __iter__(self):
+        keys = self.indexer.keys
+        return (keys[info_id] for info_id in self.ids())
+
+    def __len__(self):
+        return int(np.count_nonzero(self.present))
+
+    def to_dict(self):
+        ''' Copy the table to a dictionary from the keys to the rows
+
+        Returns:
+            (dict): The rows keyed by the infoset keys
+        '''
+        keys = self.indexer.keys
+        return {keys[info_id]: self.values[info_id].copy() for info_id in self.ids()}
+
+class MappedInfosetTable(Mapping):
+    ''' A read-only table of a checkpoint, usually memory-mapped. The keys are
+    found by binary search in the sorted key index, so nothing is loaded
+    until it is read
+    '''
+
+    def __init__(self, keys, values):
+        ''' Wrap the arrays of a checkpoint
+
+        Args:
+            keys (SortedKeys): The sorted keys of the checkpoint
+            values (numpy.array): The rows of the table in the order of the keys
+        '''
+        self.keys = keys
+        self.values = values
+
+    def _find(self, key):
+        ''' Get the row index of a key, or -1 if the table does not contain it
+        '''
+        index = self.keys.find(key)
+        if index < 0 or np.isnan(self.values[index, 0]):
+            return -1
+        return index
+
+    def __getitem__(self, key):
+        index = self._find(key)
+        if index < 0:
+            raise KeyError(key)
+        return self.values[index]
+
+    def __contains__(self, key):
+        return self._find(key) >= 0
+
+    def __iter__(self):
+        present = np.flatnonzero(~np.isnan(self.values[:, 0]))
+        return (self.keys[index] for index in present)
+
+    def __len__(self):
+        return int(np.count_nonzero(~np.isnan(self.values[:, 0])))
+
+class SortedKeys(object):
+    ''' The sorted key index of a checkpoint, a sequence of bytes keys
+    '''
+
+    def __init__(self, data, offsets):
+        ''' Wrap the arrays of the index
+
+        Args:
+            data (numpy.array): The concatenated keys, as uint8
+            offsets (numpy.array): The start of each key in data, followed by the end of the last key
+        '''
+        self.data = data
+        self.offsets = offsets
+
+    def __getitem__(self, index):
+        return self.data[self.offsets[index]:self.offsets[index + 1]].tobytes()
+
+    def __len__(self):
+        return len(self.offsets) - 1
+
+    def find(self, key):
+        ''' Get the index of a key
+
+        Args:
+            key (bytes): The key
+
+        Returns:
+            (int): The index of the key, or -1 if it is missing
+        '''
+        index = bisect_left(self, key)
+        if index < len(self) and self[index] == key:
+            return index
+        return -1
+
+def save_tables(path, tables):
+    ''' Save tables that share an indexer as a checkpoint
+
+    Args:
+        path (string): The directory of the checkpoint
+        tables (dict): The InfosetTables keyed by their names. The infoset keys must be bytes
+    '''
+    if not os.path.exists(path):
+        os.makedirs(path)
+    indexer = next(iter(tables.values())).indexer
+    order = sorted(range(len(indexer)), key=indexer.keys.__getitem__)
+    keys = [indexer.keys[info_id] for info_id in order]
+    np.save(os.path.join(path, 'keys.npy'), np.frombuffer(b''.join(keys), dtype=np.uint8))
+    np.save(os.path.join(path, 'key_offsets.npy'), np.cumsum([0] + [len(key) for key in keys], dtype=np.int64))
+    order = np.array(order, dtype=np.int64)
+    for name, table in tables.items():
+        table.reserve(len(indexer))
+        values = table.values[order].astype(np.float32)
+        values[~table.present[order]] = np.nan
+        np.save(os.path.join(path, name + '.npy'), values)
+
+def is_checkpoint(path):
+    ''' Check if a directory contains a checkpoint in this format
+
+    Args:
+        path (string): The directory
+
+    Returns:
+        (boolean): True if the key index exists
+    '''
+    return os.path.exists(os.path.join(path, 'keys.npy'))
+
+def load_table(path, name, mmap_mode='r'):
+    ''' Open a table of a checkpoint without reading it
+
+    Args:
+        path (string): The directory of the checkpoint
+        name (string): The name of the table
+        mmap_mode (string): The mode of numpy.load, None to read the files into memory
+
+    Returns:
+        (MappedInfosetTable): The table
+    '''
+    keys = SortedKeys(np.load(os.path.join(path, 'keys.npy'), mmap_mode=mmap_mode),
+                      np.load(os.path.join(path, 'key_offsets.npy'), mmap_mode=mmap_mode))
+    return MappedInfosetTable(keys, np.load(os.path.join(path, name + '.npy'), mmap_mode=mmap_mode))
+
+def load_tables(path, names, indexer, num_actions):
+    ''' Read tables of a checkpoint into InfosetTables, e.g., to resume training
+
+    Args:
+        path (string): The directory of the checkpoint
+        names (list): The names of the tables
+        indexer (InfosetIndexer): The indexer of the new tables
+        num_actions (int): The number of actions
+
+    Returns:
+        (list): The InfosetTables, in the order of the names
+    '''
+    mapped = [load_table(path, name, mmap_mode=None) for name in names]
+    keys = mapped[0].keys
+    ids = np.array([indexer.index(keys[index]) for index in range(len(keys))], dtype=np.int64)
+    tables = []
+    for table in mapped:
+        present = ~np.isnan(table.values[:, 0])
+        rows = InfosetTable(indexer, num_actions)
+        rows.set_rows(ids[present], table.values[present].astype(np.float64))
+        tables.append(rows)
+    return tables
@@ -0,0 +1,142 @@
+import numpy as np
+
+from rlcard.agents.cfr_agent import CFRAgent
+from rlcard.utils.utils import remove_illegal
+
+class MCCFRAgent(CFRAgent):
+    ''' Implement Monte Carlo CFR with external sampling or outcome sampling.
+
+    With external sampling, the traversal visits all the actions of the
+    traverser and samples one action of the other players. With outcome
+    sampling, the traversal samples one action at every node, so an iteration
+    only plays one game per player. The chance events are sampled by the
+    environment, as in CFRAgent. The tables and the saved files have the same
+    layout as CFRAgent.
+    '''
+
+    def __init__(self, env, model_path='./mccfr_model', sampling='external', exploration=0.6):
+        ''' Initilize Agent
+
+        Args:
+            env (Env): Env class
+            model_path (string): The path of the saved model
+            sampling (string): 'external' or 'outcome'
+            exploration (float): The probability of sampling a uniformly random
+                action of the traverser with outcome sampling
+        '''
+        if sampling not in ('external', 'outcome'):
+            raise ValueError("'sampling' should be either 'external' or 'outcome'.")
+        super().__init__(env, model_path)
+        self.sampling = sampling
+        self.exploration = exploration
+
+    def train(self):
+        ''' Do one iteration of MCCFR, i.e., one sampled traversal per player
+        '''
+        self.iteration += 1
+        for player_id in range(self.env.num_players):
+            self.env.reset()
+            if self.sampling == 'external':
+                self.traverse_external(player_id)
+            else:
+                self.traverse_outcome(player_id, 1.0, 1.0, 1.0)
+
+    def current_policy(self, info_id, legal_actions):
+        ''' Get the regret matching policy of an infoset and store it in the policy table
+
+        Args:
+            info_id (int): The id of the infoset
+            legal_actions (list): Indices of legal actions
+
+        Returns:
+            action_probs (numpy.array): The action probabilities
+        '''
+        regrets = self.regrets.row(info_id)
+        action_probs = remove_illegal(self.regret_matching_rows(regrets[np.newaxis])[0], legal_actions)
+        self.policy.row(info_id)[:] = action_probs
+        return action_probs
+
+    def traverse_external(self, player_id):
+        ''' Traverse the tree with external sampling, update the regrets of the
+        traverser and the average policy of the other players
+
+        Args:
+            player_id (int): The traverser
+
+        Returns:
+            (float): The sampled utility of the traverser
+        '''
+        if self.env.is_over():
+            return self.env.get_payoffs()[player_id]
+
+        current_player = self.env.get_player_id()
+        obs, legal_actions = self.get_state(current_player)
+        info_id = self.infosets.index(obs)
+        action_probs = self.current_policy(info_id, legal_actions)
+
+        if not current_player == player_id:
+            self.average_policy.row(info_id)[legal_actions] += action_probs[legal_actions]
+            action = np.random.choice(len(action_probs), p=action_probs)
+            self.env.step(action)
+            utility = self.traverse_external(player_id)
+            self.env.step_back()
+            return utility
+
+        action_utilities = np.zeros(self.env.num_actions)
+        for action in legal_actions:
+            self.env.step(action)
+            action_utilities[action] = self.traverse_external(player_id)
+            self.env.step_back()
+
+        state_utility = np.dot(action_probs, action_utilities)
+        self.regrets.row(info_id)[legal_actions] += action_utilities[legal_actions] - state_utility
+        return state_utility
+
+    def traverse_outcome(self, player_id, player_prob, opponent_prob, sample_prob):
+        ''' Play one game with outcome sampling, update the regrets and the
+        average policy of the traverser
+
+        Args:
+            player_id (int): The traverser
+            player_prob (float): The reach probability of the traverser
+            opponent_prob (float): The reach probability of the other players and chance
+            sample_prob (float): The probability of sampling the current history
+
+        Returns:
+            (float): The sampled utility of the traverser, weighted by the
+                probability of the remaining actions
+        '''
+        if self.env.is_over():
+            return self.env.get_payoffs()[player_id]
+
+        current_player = self.env.get_player_id()
+        obs, legal_actions = self.get_state(current_player)
+        info_id = self.infosets.index(obs)
+        action_probs = self.current_policy(info_id, legal_actions)
+
+        if current_player == player_id:
+            sample_probs = (1 - self.exploration) * action_probs
+            sample_probs[legal_actions] += self.exploration / len(legal_actions)
+        else:
+            sample_probs = action_probs
+        action = np.random.choice(len(sample_probs), p=sample_probs)
+
+        self.env.step(action)
+        if current_player == player_id:
+            child_utility = self.traverse_outcome(player_id, player_prob * action_probs[action],
+                                                  opponent_prob, sample_prob * sample_probs[action])
+        else:
+            child_utility = self.traverse_outcome(player_id, player_prob,
+                                                  opponent_prob * action_probs[action], sample_prob * sample_probs[action])
+        self.env.step_back()
+
+        # The importance sampled utilities of the actions are zero except for the sampled one
+        action_utilities = np.zeros(self.env.num_actions)
+        action_utilities[action] = child_utility / sample_probs[action]
+        state_utility = action_probs[action] * action_utilities[action]
+
+        if current_player == player_id:
+            self.regrets.row(info_id)[legal_actions] += opponent_prob / sample_prob * \
+                (action_utilities[legal_actions] - state_utility)
+            self.average_policy.row(info_id)[legal_actions] += player_prob / sample_prob * action_probs[legal_actions]
+        return state_utility
@@ -28,7 +28,7 @@ import torch.nn as nn
 import torch.nn.functional as F
 
 from rlcard.agents.dqn_agent import DQNAgent
-from rlcard.utils.utils import remove_illegal
+from rlcard.utils.utils import remove_illegal, get_legal_mask
 
 Transition = collections.namedtuple('Transition', 'info_state action_probs')
 
@@ -167,7 +167,7 @@ class NFSPAgent(object):
             action (int): An action id
         '''
         obs = state['obs']
-        legal_actions = list(state['legal_actions'].keys())
+        legal_mask = get_legal_mask(state, self._num_actions)
         if self._mode == 'best_response':
             action = self._rl_agent.step(state)
             one_hot = np.zeros(self._num_actions)
@@ -176,7 +176,7 @@ class NFSPAgent(object):
 
         elif self._mode == 'average_policy':
             probs = self._act(obs)
-            probs = remove_illegal(probs, legal_actions)
+            probs = remove_illegal(probs, legal_mask)
             action = np.random.choice(len(probs), p=probs)
 
         return action
@@ -195,9 +195,8 @@ class NFSPAgent(object):
             action, info = self._rl_agent.eval_step(state)
         elif self.evaluate_with == 'average_policy':
             obs = state['obs']
-            legal_actions = list(state['legal_actions'].keys())
             probs = self._act(obs)
-            probs = remove_illegal(probs, legal_actions)
+            probs = remove_illegal(probs, get_legal_mask(state, self._num_actions))
             action = np.random.choice(len(probs), p=probs)
             info = {}
             info['probs'] = {state['raw_legal_actions'][i]: float(probs[list(state['legal_actions'].keys())[i]]) for i in range(len(state['legal_actions']))}
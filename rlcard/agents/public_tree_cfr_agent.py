@@ -0,0 +1,157 @@
+import numpy as np
+
+from rlcard.agents.cfr_agent import CFRAgent
+from rlcard.utils.public_tree import PublicTree
+
+class PublicTreeCFRAgent(CFRAgent):
+    ''' Implement CFR on the public tree of a small poker game, e.g., Leduc Hold'em.
+
+    An iteration walks the public tree once per player with the reach
+    probabilities of all the private cards as vectors, instead of playing one
+    deal with `step` and `step_back`, and the showdowns are matrix products.
+    The tables, the variants, eval_step and the saved files are the ones of
+    CFRAgent.
+
+    The observations of the environments do not contain the actions, so
+    different histories can share the state_str that CFRAgent uses as infoset.
+    CFR does not converge to an equilibrium on such imperfect recall infosets.
+    With perfect_recall, the default, the infoset keys also contain the
+    action record of the state.
+    '''
+
+    def __init__(self, env, model_path='./public_tree_cfr_model', perfect_recall=True, **kwargs):
+        ''' Initilize Agent and build the public tree
+
+        Args:
+            env (Env): Env class, with allow_step_back, see PublicTree
+            model_path (string): The path of the saved model
+            perfect_recall (boolean): False to use the infosets of CFRAgent
+            kwargs: The variant and its parameters, see CFRAgent
+        '''
+        super().__init__(env, model_path, **kwargs)
+        self.perfect_recall = perfect_recall
+        self.tree = PublicTree(env)
+        num_cards = len(self.tree.cards)
+        self._index_infosets()
+        self._legal_masks = np.array([state['legal_mask'] for node in self.tree.decision_nodes for state in node.states])
+        self._num_cards = num_cards
+        self._probs = None
+
+    def _index_infosets(self):
+        ''' Look up the infoset id of each private card at each decision node,
+        and add the missing rows to the tables
+        '''
+        self.infoset_ids = []
+        for node in self.tree.decision_nodes:
+            self.infoset_ids.append(np.array([self.infosets.index(self.state_key(state)) for state in node.states]))
+        uniform = 1.0 / self.env.num_actions
+        for ids in self.infoset_ids:
+            for info_id in ids:
+                self.policy.row(info_id, uniform)
+                self.regrets.row(info_id)
+                self.average_policy.row(info_id)
+        self._all_ids = np.concatenate(self.infoset_ids)
+
+    def load(self):
+        ''' Load model. The loaded tables are indexed anew, so the infoset ids
+        of the decision nodes are looked up again
+        '''
+        super().load()
+        self._index_infosets()
+
+    def state_key(self, state):
+        ''' Get the key of the infoset of a state
+
+        Args:
+            state (dict): The state
+
+        Returns:
+            (str): The state_str, followed by the action record with perfect_recall
+        '''
+        if not self.perfect_recall:
+            return state['obs'].tobytes()
+        return state['obs'].tobytes() + repr(state['action_record']).encode()
+
+    def train(self):
+        ''' Do one iteration of CFR over the whole public tree
+        '''
+        self.iteration += 1
+        self.regret_weight, self.average_weight = self.iteration_weights()
+        self._probs = self.policy_matrices()
+        for player_id in range(self.env.num_players):
+            reaches = [np.ones(self._num_cards) for _ in range(self.env.num_players)]
+            for root in self.tree.roots:
+                self.traverse_public_tree(root, player_id, reaches)
+            if self.variant == 'cfr+':
+                np.maximum(self.regrets.values, 0.0, out=self.regrets.values)
+                self.update_policy()
+                self._probs = self.policy_matrices()
+
+        if self.variant == 'dcfr':
+            self.discount()
+
+        if self.variant != 'cfr+':
+            self.update_policy()
+
+    def policy_matrices(self):
+        ''' Get the current policy at every decision node
+
+        Returns:
+            (list): For each decision node, the probabilities of its actions,
+                one row per private card of the acting player
+        '''
+        probs = self.policy.values[self._all_ids] * self._legal_masks
+        totals = probs.sum(axis=1, keepdims=True)
+        uniform = self._legal_masks / self._legal_masks.sum(axis=1, keepdims=True)
+        probs = np.where(totals > 0, probs / np.where(totals > 0, totals, 1.0), uniform)
+        num_cards = self._num_cards
+        return [probs[node.index * num_cards:(node.index + 1) * num_cards, node.actions]
+                for node in self.tree.decision_nodes]
+
+    def traverse_public_tree(self, node, player_id, reaches):
+        ''' Traverse the public tree, update the regrets and the average policy of a player
+
+        Args:
+            node (PublicNode): The current node
+            player_id (int): The player to update
+            reaches (list): The reach probabilities of the private cards of each player
+
+        Returns:
+            (numpy.array): The counterfactual values of the private cards of the player
+        '''
+        if node.is_terminal:
+            utilities = node.utilities[player_id]
+            if player_id == 0:
+                return utilities.dot(reaches[1])
+            return reaches[0].dot(utilities)
+
+        if node.is_chance:
+            values = 0
+            for card_index, child in enumerate(node.children):
+                # Nobody holds the public card
+                child_reaches = [reach.copy() for reach in reaches]
+                for reach in child_reaches:
+                    reach[card_index] = 0
+                values = values + self.traverse_public_tree(child, player_id, child_reaches)
+            return values
+
+        probs = self._probs[node.index]
+        current_player = node.player
+        action_values = []
+        for i, child in enumerate(node.children):
+            child_reaches = list(reaches)
+            child_reaches[current_player] = reaches[current_player] * probs[:, i]
+            action_values.append(self.traverse_public_tree(child, player_id, child_reaches))
+
+        if not current_player == player_id:
+            return sum(action_values)
+
+        action_values = np.array(action_values).T
+        values = np.sum(probs * action_values, axis=1)
+        rows = self.infoset_ids[node.index][:, np.newaxis]
+        columns = np.array(node.actions)[np.newaxis, :]
+        # Several private cards can share an infoset, e.g., the cards of the same rank
+        np.add.at(self.regrets.values, (rows, columns), self.regret_weight * (action_values - values[:, np.newaxis]))
+        np.add.at(self.average_policy.values, (rows, columns),
+                  self.average_weight * reaches[player_id][:, np.newaxis] * probs)
+        return values
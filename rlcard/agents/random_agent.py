@@ -1,5 +1,7 @@
 import numpy as np
 
+from rlcard.utils.utils import get_legal_mask
+
 
 class RandomAgent(object):
     ''' A random agent. Random agents is for running toy examples on the card games
@@ -24,6 +26,8 @@ class RandomAgent(object):
         Returns:
             action (int): The action predicted (randomly chosen) by the random agent
         '''
+        if 'legal_mask' in state:
+            return np.random.choice(np.flatnonzero(state['legal_mask']))
         return np.random.choice(list(state['legal_actions'].keys()))
 
     def eval_step(self, state):
@@ -37,9 +41,8 @@ class RandomAgent(object):
             action (int): The action predicted (randomly chosen) by the random agent
             probs (list): The list of action probabilities
         '''
-        probs = [0 for _ in range(self.num_actions)]
-        for i in state['legal_actions']:
-            probs[i] = 1/len(state['legal_actions'])
+        legal_mask = get_legal_mask(state, self.num_actions)
+        probs = legal_mask / np.count_nonzero(legal_mask)
 
         info = {}
         info['probs'] = {state['raw_legal_actions'][i]: probs[list(state['legal_actions'].keys())[i]] for i in range(len(state['legal_actions']))}
@@ -0,0 +1,4 @@
+''' Benchmarks of the environments and the algorithms. Run all of them with
+`python -m rlcard.benchmarks`, or one of them with
+`python -m rlcard.benchmarks.<name>`
+'''
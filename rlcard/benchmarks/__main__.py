@@ -0,0 +1,105 @@
+''' Run the benchmark suite and write the results to a JSON file, so that the
+results of different commits can be compared
+
+    python -m rlcard.benchmarks --output results.json
+    python -m rlcard.benchmarks --suites envs cfr --num-games 20
+'''
+import argparse
+import datetime
+import json
+import os
+import platform
+import subprocess
+import sys
+
+import numpy as np
+
+import rlcard
+from rlcard.benchmarks import env_throughput, cfr_traversal, cfr_convergence, tournament, feed, startup
+
+SUITES = ['envs', 'cfr', 'convergence', 'tournament', 'feed', 'startup']
+
+def get_git_commit():
+    ''' Get the commit of the rlcard checkout, None if it is not a git repository
+    '''
+    try:
+        return subprocess.check_output(['git', 'rev-parse', 'HEAD'],
+                                       cwd=os.path.dirname(os.path.abspath(rlcard.__file__)),
+                                       stderr=subprocess.DEVNULL).decode().strip()
+    except (OSError, subprocess.CalledProcessError):
+        return None
+
+def run_suites(suites, num_games=100, cfr_iterations=2, convergence_iterations=200, tournament_games=1000,
+               num_transitions=2000, startup_repeats=5):
+    ''' Run the benchmark suites
+
+    Args:
+        suites (list): The names of the suites, from SUITES
+        num_games (int): The number of games of each environment in 'envs'
+        cfr_iterations (int): The number of CFR iterations in 'cfr'
+        convergence_iterations (int): The number of iterations of each CFR variant in 'convergence'
+        tournament_games (int): The number of games of each tournament in 'tournament'
+        num_transitions (int): The number of transitions fed in 'feed'
+        startup_repeats (int): The number of processes of each statement in 'startup'
+
+    Returns:
+        (dict): The results keyed by the suites, with the environment in 'meta'
+    '''
+    results = {'meta': {
+        'commit': get_git_commit(),
+        'rlcard_version': rlcard.__version__,
+        'python_version': platform.python_version(),
+        'numpy_version': np.__version__,
+        'platform': platform.platform(),
+        'time': datetime.datetime.now().isoformat(),
+    }}
+    for suite in suites:
+        print('Running', suite, file=sys.stderr)
+        if suite == 'envs':
+            results[suite] = env_throughput.run(num_games=num_games)
+        elif suite == 'cfr':
+            # Only the default step_back, the legacy modes are in cfr_traversal
+            results[suite] = cfr_traversal.run(iterations=cfr_iterations, modes=['undo'])
+        elif suite == 'convergence':
+            evaluate_every = max(1, convergence_iterations // 10)
+            results[suite] = {
+                'chance_sampling': cfr_convergence.run(iterations=convergence_iterations, evaluate_every=evaluate_every),
+                'public_tree': cfr_convergence.run(iterations=convergence_iterations, evaluate_every=evaluate_every,
+                                                   public_tree=True),
+            }
+        elif suite == 'tournament':
+            results[suite] = tournament.run(num_games=tournament_games)
+        elif suite == 'feed':
+            results[suite] = feed.run(num_transitions=num_transitions)
+        elif suite == 'startup':
+            results[suite] = startup.run(repeats=startup_repeats)
+        else:
+            raise ValueError('Unknown benchmark suite: {}'.format(suite))
+    return results
+
+def main():
+    parser = argparse.ArgumentParser('RLCard benchmarks')
+    parser.add_argument('--suites', nargs='+', default=SUITES, choices=SUITES)
+    parser.add_argument('--output', type=str, default='benchmark_results.json')
+    parser.add_argument('--num-games', type=int, default=100)
+    parser.add_argument('--cfr-iterations', type=int, default=2)
+    parser.add_argument('--convergence-iterations', type=int, default=200)
+    parser.add_argument('--tournament-games', type=int, default=1000)
+    parser.add_argument('--num-transitions', type=int, default=2000)
+    parser.add_argument('--startup-repeats', type=int, default=5)
+    args = parser.parse_args()
+
+    results = run_suites(args.suites,
+                         num_games=args.num_games,
+                         cfr_iterations=args.cfr_iterations,
+                         convergence_iterations=args.convergence_iterations,
+                         tournament_games=args.tournament_games,
+                         num_transitions=args.num_transitions,
+                         startup_repeats=args.startup_repeats)
+    with open(args.output, 'w') as f:
+        json.dump(results, f, indent=2)
+    print(json.dumps(results, indent=2))
+    print('Results saved in', args.output, file=sys.stderr)
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,90 @@
+''' Benchmark the convergence of the CFR variants on Leduc Hold'em: the exact
+exploitability of the average policy against the training time, with the
+chance sampling CFRAgent or with the PublicTreeCFRAgent
+
+    python -m rlcard.benchmarks.cfr_convergence --iterations 1000
+    python -m rlcard.benchmarks.cfr_convergence --iterations 1000 --public-tree
+    python -m rlcard.benchmarks.cfr_convergence --iterations 1000 --prune-threshold -20
+'''
+import argparse
+import time
+
+import numpy as np
+
+import rlcard
+from rlcard.agents.cfr_agent import CFRAgent, VARIANTS
+from rlcard.agents.public_tree_cfr_agent import PublicTreeCFRAgent
+from rlcard.utils.exploitability import exploitability
+from rlcard.utils.public_tree import PublicTree
+
+def convergence(variant, iterations, evaluate_every, tree, seed=0, public_tree=False, prune_threshold=None):
+    ''' Train a CFRAgent and evaluate its average policy
+
+    Args:
+        variant (string): The variant of CFRAgent
+        iterations (int): The number of CFR iterations
+        evaluate_every (int): The number of iterations between two evaluations
+        tree (PublicTree): The public tree of Leduc Hold'em
+        seed (int): The seed of the environment and of numpy
+        public_tree (boolean): True to train a PublicTreeCFRAgent
+        prune_threshold (float): The regret-based pruning threshold of the CFRAgent, None for no pruning
+
+    Returns:
+        (list): A dictionary per evaluation with the 'iteration', the training
+            'seconds' so far and the 'exploitability'
+    '''
+    np.random.seed(seed)
+    env = rlcard.make('leduc-holdem', config={'seed': seed, 'allow_step_back': True, 'lazy_state': True})
+    if public_tree:
+        agent = PublicTreeCFRAgent(env, variant=variant)
+    else:
+        agent = CFRAgent(env, variant=variant, prune_threshold=prune_threshold)
+    results = []
+    seconds = 0.0
+    for iteration in range(1, iterations + 1):
+        start = time.perf_counter()
+        agent.train()
+        seconds += time.perf_counter() - start
+        if iteration % evaluate_every == 0 or iteration == iterations:
+            results.append({
+                'iteration': iteration,
+                'seconds': seconds,
+                'exploitability': exploitability(tree, agent),
+            })
+    return results
+
+def run(variants=VARIANTS, iterations=200, evaluate_every=50, public_tree=False, prune_threshold=None):
+    ''' Benchmark the convergence of the CFR variants
+
+    Args:
+        variants (list): The variants of CFRAgent
+        iterations (int): The number of CFR iterations of each variant
+        evaluate_every (int): The number of iterations between two evaluations
+        public_tree (boolean): True to train PublicTreeCFRAgents
+        prune_threshold (float): The regret-based pruning threshold of the CFRAgents, None for no pruning
+
+    Returns:
+        (dict): The evaluations of each variant, see `convergence`
+    '''
+    tree = PublicTree(rlcard.make('leduc-holdem', config={'allow_step_back': True}))
+    return {variant: convergence(variant, iterations, evaluate_every, tree, public_tree=public_tree,
+                                 prune_threshold=prune_threshold)
+            for variant in variants}
+
+def main():
+    parser = argparse.ArgumentParser('CFR convergence benchmark')
+    parser.add_argument('--variants', nargs='+', default=list(VARIANTS), choices=VARIANTS)
+    parser.add_argument('--iterations', type=int, default=1000)
+    parser.add_argument('--evaluate-every', type=int, default=100)
+    parser.add_argument('--public-tree', action='store_true')
+    parser.add_argument('--prune-threshold', type=float, default=None)
+    args = parser.parse_args()
+
+    print('{:<10}{:>12}{:>14}{:>16}'.format('variant', 'iteration', 'seconds', 'exploitability'))
+    for variant, results in run(args.variants, args.iterations, args.evaluate_every, args.public_tree,
+                                    args.prune_threshold).items():
+        for result in results:
+            print('{:<10}{:>12}{:>14.3f}{:>16.5f}'.format(variant, result['iteration'], result['seconds'], result['exploitability']))
+
+if __name__ == '__main__':
+    main()
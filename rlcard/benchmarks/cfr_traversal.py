@@ -0,0 +1,89 @@
+''' Benchmark the CFR traversal with the different ways of stepping back:
+the legacy deep copies, the compact snapshots and the undo records of the
+hold'em games
+
+    python -m rlcard.benchmarks.cfr_traversal --iterations 2
+'''
+import argparse
+import time
+from copy import deepcopy
+
+import rlcard
+from rlcard.agents import CFRAgent
+
+MODES = ['deepcopy', 'snapshot', 'undo']
+
+def use_step_back_mode(env, mode):
+    ''' Make the game of the environment record its history for step_back
+    in the given way
+
+    Args:
+        env (Env): The environment
+        mode (string): 'deepcopy' for deep copies of the game, as the games did
+            before the compact snapshots, 'snapshot' for the compact snapshots
+            and 'undo' for the default, i.e., the undo records of the hold'em
+            games and the snapshots of the other games
+    '''
+    game = env.game
+    if mode == 'deepcopy':
+        memo = {id(game): game, id(game.np_random): game.np_random}
+        hooks = ('history', 'snapshot', 'restore', '_undo_record', '_undo')
+
+        def snapshot():
+            game_dict = {key: value for key, value in game.__dict__.items() if key not in hooks}
+            return deepcopy(game_dict, dict(memo))
+
+        def restore(snapshot):
+            game.__dict__.update(snapshot)
+
+        game.snapshot = game._undo_record = snapshot
+        game.restore = game._undo = restore
+    elif mode == 'snapshot':
+        game._undo_record = game.snapshot
+        game._undo = game.restore
+
+def time_cfr(env_id, iterations, mode='undo'):
+    ''' Time the iterations of a CFRAgent
+
+    Args:
+        env_id (string): The name of the environment
+        iterations (int): The number of CFR iterations
+        mode (string): How the game records its history, see `use_step_back_mode`
+
+    Returns:
+        (float): The seconds per iteration
+    '''
+    env = rlcard.make(env_id, config={'seed': 0, 'allow_step_back': True, 'lazy_state': True})
+    use_step_back_mode(env, mode)
+    agent = CFRAgent(env)
+    start = time.perf_counter()
+    for _ in range(iterations):
+        agent.train()
+    return (time.perf_counter() - start) / iterations
+
+def run(env_ids=('leduc-holdem', 'limit-holdem'), iterations=2, modes=MODES):
+    ''' Benchmark the CFR iterations
+
+    Args:
+        env_ids (list): The names of the environments
+        iterations (int): The number of CFR iterations
+        modes (list): The ways of stepping back, see `use_step_back_mode`
+
+    Returns:
+        (dict): For each environment, the seconds per iteration keyed by the modes
+    '''
+    return {env_id: {mode: time_cfr(env_id, iterations, mode) for mode in modes} for env_id in env_ids}
+
+def main():
+    parser = argparse.ArgumentParser('CFR traversal benchmark')
+    parser.add_argument('--envs', nargs='+', default=['leduc-holdem', 'limit-holdem'])
+    parser.add_argument('--iterations', type=int, default=2)
+    args = parser.parse_args()
+
+    print(('{:<16}' + '{:>14}' * len(MODES) + '{:>10}').format('env', *['{} (s)'.format(mode) for mode in MODES], 'speedup'))
+    for env_id, results in run(args.envs, args.iterations).items():
+        seconds = [results[mode] for mode in MODES]
+        print(('{:<16}' + '{:>14.4f}' * len(MODES) + '{:>9.1f}x').format(env_id, *seconds, seconds[0] / seconds[-1]))
+
+if __name__ == '__main__':
+    main()
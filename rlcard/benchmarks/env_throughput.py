@@ -0,0 +1,65 @@
+''' Benchmark the games/sec and steps/sec of the environments with random agents
+
+    python -m rlcard.benchmarks.env_throughput --num-games 100
+'''
+import argparse
+import time
+
+import rlcard
+from rlcard.agents import RandomAgent
+from rlcard.envs.registration import registry
+
+def benchmark_env(env_id, num_games, seed=0):
+    ''' Play games with random agents and time them
+
+    Args:
+        env_id (string): The name of the environment
+        num_games (int): The number of games
+        seed (int): The random seed of the environment
+
+    Returns:
+        (dict): The 'games', the 'steps', the 'seconds', the 'games_per_sec'
+            and the 'steps_per_sec'
+    '''
+    env = rlcard.make(env_id, config={'seed': seed})
+    env.set_agents([RandomAgent(num_actions=env.num_actions) for _ in range(env.num_players)])
+    start_timestep = env.timestep
+    start = time.perf_counter()
+    for _ in range(num_games):
+        env.run(is_training=False)
+    seconds = time.perf_counter() - start
+    steps = env.timestep - start_timestep
+    return {
+        'games': num_games,
+        'steps': steps,
+        'seconds': seconds,
+        'games_per_sec': num_games / seconds,
+        'steps_per_sec': steps / seconds,
+    }
+
+def run(env_ids=None, num_games=100):
+    ''' Benchmark the environments
+
+    Args:
+        env_ids (list): The names of the environments. Default is all the registered ones
+        num_games (int): The number of games of each environment
+
+    Returns:
+        (dict): The results of `benchmark_env` keyed by the environment names
+    '''
+    if env_ids is None:
+        env_ids = list(registry.env_specs)
+    return {env_id: benchmark_env(env_id, num_games) for env_id in env_ids}
+
+def main():
+    parser = argparse.ArgumentParser('Environment throughput benchmark')
+    parser.add_argument('--envs', nargs='+', default=None)
+    parser.add_argument('--num-games', type=int, default=100)
+    args = parser.parse_args()
+
+    print('{:<16}{:>14}{:>14}'.format('env', 'games/sec', 'steps/sec'))
+    for env_id, result in run(args.envs, args.num_games).items():
+        print('{:<16}{:>14.1f}{:>14.1f}'.format(env_id, result['games_per_sec'], result['steps_per_sec']))
+
+if __name__ == '__main__':
+    main()
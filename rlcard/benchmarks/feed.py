@@ -0,0 +1,111 @@
+''' Benchmark the `feed` of the DQN and NFSP agents, i.e., storing the
+transitions and training the networks. Requires PyTorch.
+
+    python -m rlcard.benchmarks.feed --num-transitions 2000
+'''
+import argparse
+import time
+
+import rlcard
+from rlcard.agents import RandomAgent
+from rlcard.utils import reorganize
+
+def collect_transitions(env, num_transitions):
+    ''' Collect the transitions of the first player with random agents
+
+    Args:
+        env (Env): The environment
+        num_transitions (int): The number of transitions
+
+    Returns:
+        (list): The transitions, as given by `reorganize`
+    '''
+    env.set_agents([RandomAgent(num_actions=env.num_actions) for _ in range(env.num_players)])
+    transitions = []
+    while len(transitions) < num_transitions:
+        trajectories, payoffs = env.run(is_training=True)
+        transitions.extend(reorganize(trajectories, payoffs)[0])
+    return transitions[:num_transitions]
+
+def make_agent(algorithm, env):
+    ''' Make a small DQN or NFSP agent for the environment
+    '''
+    if algorithm == 'dqn':
+        from rlcard.agents import DQNAgent
+        return DQNAgent(num_actions=env.num_actions,
+                        state_shape=env.state_shape[0],
+                        mlp_layers=[64, 64],
+                        replay_memory_init_size=100,
+                        device='cpu')
+    from rlcard.agents import NFSPAgent
+    return NFSPAgent(num_actions=env.num_actions,
+                     state_shape=env.state_shape[0],
+                     hidden_layers_sizes=[64, 64],
+                     q_mlp_layers=[64, 64],
+                     min_buffer_size_to_learn=100,
+                     device='cpu')
+
+def benchmark_feed(algorithm, env_id, num_transitions):
+    ''' Time the feed of the transitions into an agent
+
+    Args:
+        algorithm (string): 'dqn' or 'nfsp'
+        env_id (string): The name of the environment
+        num_transitions (int): The number of transitions
+
+    Returns:
+        (dict): The 'transitions', the 'seconds' and the 'transitions_per_sec'
+    '''
+    env = rlcard.make(env_id, config={'seed': 0})
+    transitions = collect_transitions(env, num_transitions)
+    agent = make_agent(algorithm, env)
+    if algorithm == 'nfsp':
+        # Fill the reservoir buffer of the average policy as in the training loop
+        agent.sample_episode_policy()
+        for transition in transitions:
+            agent.step(transition[0])
+    start = time.perf_counter()
+    for transition in transitions:
+        agent.feed(transition)
+    seconds = time.perf_counter() - start
+    return {
+        'transitions': num_transitions,
+        'seconds': seconds,
+        'transitions_per_sec': num_transitions / seconds,
+    }
+
+def run(algorithms=('dqn', 'nfsp'), env_id='leduc-holdem', num_transitions=2000):
+    ''' Benchmark the feed of the agents. Skipped if PyTorch is not installed
+
+    Args:
+        algorithms (list): 'dqn' and/or 'nfsp'
+        env_id (string): The name of the environment
+        num_transitions (int): The number of transitions
+
+    Returns:
+        (dict): The results of `benchmark_feed` keyed by the algorithms, or
+            {'skipped': reason} if PyTorch is not installed
+    '''
+    try:
+        import torch
+    except ImportError:
+        return {'skipped': 'torch is not installed'}
+    return {algorithm: benchmark_feed(algorithm, env_id, num_transitions) for algorithm in algorithms}
+
+def main():
+    parser = argparse.ArgumentParser('DQN/NFSP feed benchmark')
+    parser.add_argument('--algorithms', nargs='+', default=['dqn', 'nfsp'])
+    parser.add_argument('--env', type=str, default='leduc-holdem')
+    parser.add_argument('--num-transitions', type=int, default=2000)
+    args = parser.parse_args()
+
+    results = run(args.algorithms, args.env, args.num_transitions)
+    if 'skipped' in results:
+        print('Skipped:', results['skipped'])
+        return
+    print('{:<16}{:>18}'.format('algorithm', 'transitions/sec'))
+    for algorithm, result in results.items():
+        print('{:<16}{:>18.1f}'.format(algorithm, result['transitions_per_sec']))
+
+if __name__ == '__main__':
+    main()
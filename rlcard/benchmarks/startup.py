@@ -0,0 +1,61 @@
+''' Benchmark the startup time, i.e., the time for a fresh Python process to
+import rlcard and make an environment
+
+    python -m rlcard.benchmarks.startup --repeats 5
+'''
+import argparse
+import subprocess
+import sys
+import time
+
+import numpy as np
+
+# Name -> the statements run in a fresh process
+STATEMENTS = {
+    'python': 'pass',
+    'import numpy': 'import numpy',
+    'import rlcard': 'import rlcard',
+    'import rlcard.agents, rlcard.models': 'import rlcard.agents, rlcard.models',
+    'make leduc-holdem': "import rlcard; rlcard.make('leduc-holdem')",
+    'make doudizhu': "import rlcard; rlcard.make('doudizhu')",
+}
+
+def time_process(statement, repeats):
+    ''' Time fresh Python processes that run the statement
+
+    Args:
+        statement (string): The Python statements
+        repeats (int): The number of processes
+
+    Returns:
+        (dict): The 'min' and the 'median' seconds of a process
+    '''
+    seconds = []
+    for _ in range(repeats):
+        start = time.perf_counter()
+        subprocess.check_call([sys.executable, '-c', statement])
+        seconds.append(time.perf_counter() - start)
+    return {'min': float(np.min(seconds)), 'median': float(np.median(seconds))}
+
+def run(repeats=5):
+    ''' Benchmark the startup
+
+    Args:
+        repeats (int): The number of processes of each statement
+
+    Returns:
+        (dict): The results of `time_process` keyed by the names in STATEMENTS
+    '''
+    return {name: time_process(statement, repeats) for name, statement in STATEMENTS.items()}
+
+def main():
+    parser = argparse.ArgumentParser('Startup time benchmark')
+    parser.add_argument('--repeats', type=int, default=5)
+    args = parser.parse_args()
+
+    print('{:<40}{:>10}{:>12}'.format('statement', 'min (s)', 'median (s)'))
+    for name, result in run(args.repeats).items():
+        print('{:<40}{:>10.3f}{:>12.3f}'.format(name, result['min'], result['median']))
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,56 @@
+''' Benchmark the `tournament` evaluation with random agents
+
+    python -m rlcard.benchmarks.tournament --num-games 1000
+'''
+import argparse
+import time
+
+import rlcard
+from rlcard.agents import RandomAgent
+from rlcard.utils import tournament
+
+def benchmark_tournament(env_id, num_games, seed=0):
+    ''' Time a tournament of random agents
+
+    Args:
+        env_id (string): The name of the environment
+        num_games (int): The number of games of the tournament
+
+    Returns:
+        (dict): The 'games', the 'seconds' and the 'games_per_sec'
+    '''
+    env = rlcard.make(env_id, config={'seed': seed})
+    env.set_agents([RandomAgent(num_actions=env.num_actions) for _ in range(env.num_players)])
+    start = time.perf_counter()
+    tournament(env, num_games)
+    seconds = time.perf_counter() - start
+    return {
+        'games': num_games,
+        'seconds': seconds,
+        'games_per_sec': num_games / seconds,
+    }
+
+def run(env_ids=('leduc-holdem', 'limit-holdem'), num_games=1000):
+    ''' Benchmark the tournaments
+
+    Args:
+        env_ids (list): The names of the environments
+        num_games (int): The number of games of each tournament
+
+    Returns:
+        (dict): The results of `benchmark_tournament` keyed by the environment names
+    '''
+    return {env_id: benchmark_tournament(env_id, num_games) for env_id in env_ids}
+
+def main():
+    parser = argparse.ArgumentParser('Tournament benchmark')
+    parser.add_argument('--envs', nargs='+', default=['leduc-holdem', 'limit-holdem'])
+    parser.add_argument('--num-games', type=int, default=1000)
+    args = parser.parse_args()
+
+    print('{:<16}{:>14}'.format('env', 'games/sec'))
+    for env_id, result in run(args.envs, args.num_games).items():
+        print('{:<16}{:>14.1f}'.format(env_id, result['games_per_sec']))
+
+if __name__ == '__main__':
+    main()
@@ -13,6 +13,9 @@ class BlackjackEnv(Env):
     ''' Blackjack Environment
     '''
 
+    # The extraction only reads the raw state
+    pure_state_extraction = True
+
     def __init__(self, config):
         ''' Initialize the Blackjack environment
         '''
@@ -35,6 +38,17 @@ class BlackjackEnv(Env):
             encoded_action_list.append(i)
         return encoded_action_list
 
+    def _get_legal_action_ids(self, state):
+        ''' Get the ids of the legal actions of a raw state
+
+        Args:
+            state (dict): The raw state
+
+        Returns:
+            (list): The ids of the legal actions
+        '''
+        return list(range(len(self.actions)))
+
     def _extract_state(self, state):
         ''' Extract the state representation from state dictionary for agent
 
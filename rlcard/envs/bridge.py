@@ -81,6 +81,17 @@ class BridgeEnv(Env):
         '''
         return self.bridgeStateExtractor.extract_state(game=self.game)
 
+    def _get_legal_action_ids(self, state):
+        ''' Get the ids of the legal actions of a raw state
+
+        Args:
+            state (dict): The raw state
+
+        Returns:
+            (list): The ids of the legal actions
+        '''
+        return [action_event.action_id for action_event in self.game.judger.get_legal_actions()]
+
     def _decode_action(self, action_id):
         ''' Decode Action id to the action in the game.
 
@@ -2,6 +2,7 @@ from collections import Counter, OrderedDict
 import numpy as np
 
 from rlcard.envs import Env
+from rlcard.envs.lazy_state import LazyLegalActions
 
 
 class DoudizhuEnv(Env):
@@ -111,11 +112,22 @@ class DoudizhuEnv(Env):
         ''' Get all legal actions for current state
 
         Returns:
-            legal_actions (list): a list of legal actions' id
+            legal_actions (LazyLegalActions): the legal actions' ids, with their
+            card arrays encoded on first access
         '''
         legal_actions = self.game.state['actions']
-        legal_actions = {self._ACTION_2_ID[action]: _cards2array(action) for action in legal_actions}
-        return legal_actions
+        return LazyLegalActions([self._ACTION_2_ID[action] for action in legal_actions], legal_actions, _cards2array)
+
+    def _get_legal_action_ids(self, state):
+        ''' Get the ids of the legal actions of a raw state
+
+        Args:
+            state (dict): The raw state
+
+        Returns:
+            (list): The ids of the legal actions
+        '''
+        return [self._ACTION_2_ID[action] for action in state['actions']]
 
     def get_perfect_information(self):
         ''' Get the perfect information of the current state
@@ -1,4 +1,10 @@
+import time
+import weakref
+from copy import deepcopy
+
 from rlcard.utils import *
+from rlcard.envs.lazy_state import LazyState
+from rlcard.utils.profiler import Profiler
 
 class Env(object):
     '''
@@ -6,6 +12,17 @@ class Env(object):
     we should base on this class and implement as many functions
     as we can.
     '''
+    # True if `_extract_state` only reads the raw state, which the game does
+    # not mutate afterwards. Then the lazy states never need to be
+    # materialized before the game moves on. Blackjack and the hold'em games
+    # set it. The other games read the game itself, so their lazy states are
+    # only skipped when nothing references them any more at the next step
+    pure_state_extraction = False
+
+    # The methods timed by `enable_profiling`
+    _PROFILED_ENV_METHODS = ('_decode_action', '_extract_state', '_get_legal_actions')
+    _PROFILED_GAME_METHODS = ('step', 'get_state', 'get_legal_actions')
+
     def __init__(self, config):
         ''' Initialize the environment
 
@@ -15,6 +32,13 @@ class Env(object):
                 'seed' (int) - A environment local random seed.
                 'allow_step_back' (boolean) - True if allowing
                  step_back.
+                'lazy_state' (boolean) - True if the states are
+                 extracted only when they are accessed. This only saves
+                 work with `pure_state_extraction`, otherwise the states
+                 that are still referenced are extracted before the
+                 game moves on.
+                'profile' (boolean) - True if timing the phases of
+                 the steps, see `enable_profiling`.
                 There can be some game specific configurations, e.g., the
                 number of players in the game. These fields should start with
                 'game_', e.g., 'game_num_players' which specify the number of
@@ -27,6 +51,10 @@ class Env(object):
         self.allow_step_back = self.game.allow_step_back = config['allow_step_back']
         self.action_recorder = []
 
+        # The lazy states that may still be read, see `_make_state`
+        self.lazy_state = config.get('lazy_state', False)
+        self._lazy_states = []
+
         # Game specific configurations
         # Currently only support blackjack、limit-holdem、no-limit-holdem
         # TODO support game configurations for all the games
@@ -48,6 +76,11 @@ class Env(object):
         # Set random seed, default is None
         self.seed(config['seed'])
 
+        # The profiler of the phases, None if profiling is off
+        self.profiler = None
+        if config.get('profile', False):
+            self.enable_profiling()
+
 
     def reset(self):
         ''' Start a new game
@@ -58,9 +91,10 @@ class Env(object):
                 (numpy.array): The begining state of the game
                 (int): The begining player
         '''
+        self._materialize_states()
         state, player_id = self.game.init_game()
         self.action_recorder = []
-        return self._extract_state(state), player_id
+        return self._make_state(state), player_id
 
     def step(self, action, raw_action=False):
         ''' Step forward
@@ -79,11 +113,12 @@ class Env(object):
             action = self._decode_action(action)
 
         self.timestep += 1
+        self._materialize_states()
         # Record the action for human interface
         self.action_recorder.append((self.get_player_id(), action))
         next_state, player_id = self.game.step(action)
 
-        return self._extract_state(next_state), player_id
+        return self._make_state(next_state), player_id
 
     def step_back(self):
         ''' Take one step backward.
@@ -99,14 +134,58 @@ class Env(object):
         if not self.allow_step_back:
             raise Exception('Step back is off. To use step_back, please set allow_step_back=True in rlcard.make')
 
+        self._materialize_states()
         if not self.game.step_back():
             return False
+        if self.action_recorder:
+            self.action_recorder.pop()
 
         player_id = self.get_player_id()
         state = self.get_state(player_id)
 
         return state, player_id
 
+    def snapshot(self):
+        ''' Take a snapshot of the current game, which can be restored later
+        with `restore`. This does not require allow_step_back.
+
+        Returns:
+            (object): An opaque snapshot of the game and the action record
+
+        Note: The games that implement `snapshot` and `restore` return compact
+              tuples. The other games fall back to a deep copy of the game.
+              The random number generator is shared and never captured.
+        '''
+        if hasattr(self.game, 'snapshot'):
+            game_snapshot = self.game.snapshot()
+        else:
+            game_snapshot = self._copy_game_dict(self.game.__dict__)
+        return game_snapshot, tuple(self.action_recorder)
+
+    def restore(self, snapshot):
+        ''' Restore the game to a snapshot taken by `snapshot`. The same
+        snapshot can be restored many times.
+
+        Args:
+            snapshot (object): A snapshot returned by `snapshot`
+        '''
+        game_snapshot, action_record = snapshot
+        self._materialize_states()
+        if hasattr(self.game, 'restore'):
+            self.game.restore(game_snapshot)
+        else:
+            self.game.__dict__.update(self._copy_game_dict(game_snapshot))
+        self.action_recorder[:] = action_record
+
+    def _copy_game_dict(self, game_dict):
+        ''' Deep copy the attributes of a game, except the step back history,
+        the random number generator and the references back to the game itself
+        '''
+        game_dict = {key: value for key, value in game_dict.items()
+                     if key != 'history' and key not in self._PROFILED_GAME_METHODS}
+        memo = {id(self.game): self.game, id(self.game.np_random): self.game.np_random}
+        return deepcopy(game_dict, memo)
+
     def set_agents(self, agents):
         '''
         Set the agents that will interact with the environment.
@@ -117,22 +196,28 @@ class Env(object):
         '''
         self.agents = agents
 
-    def run(self, is_training=False):
+    def run(self, is_training=False, buffer=None):
         '''
         Run a complete game, either for evaluation or training RL agent.
 
         Args:
             is_training (boolean): True if for training purpose.
+            buffer (TrajectoryBuffer): Optional. If given, the transitions are
+                written into the buffer instead of being returned as lists.
 
         Returns:
             (tuple) Tuple containing:
 
                 (list): A list of trajectories generated from the environment.
+                    If a buffer is given, the buffer is returned instead.
                 (list): A list payoffs. Each entry corresponds to one player.
 
         Note: The trajectories are 3-dimension list. The first dimension is for different players.
               The second dimension is for different transitions. The third dimension is for the contents of each transiton
         '''
+        if buffer is not None:
+            return self._run_into_buffer(is_training, buffer)
+
         trajectories = [[] for _ in range(self.num_players)]
         state, player_id = self.reset()
 
@@ -140,10 +225,7 @@ class Env(object):
         trajectories[player_id].append(state)
         while not self.is_over():
             # Agent plays
-            if not is_training:
-                action, _ = self.agents[player_id].eval_step(state)
-            else:
-                action = self.agents[player_id].step(state)
+            action = self._agent_act(self.agents[player_id], state, is_training)
 
             # Environment steps
             next_state, next_player_id = self.step(action, self.agents[player_id].use_raw)
@@ -168,6 +250,91 @@ class Env(object):
 
         return trajectories, payoffs
 
+    def _run_into_buffer(self, is_training, buffer):
+        ''' Run a complete game and write the transitions into a TrajectoryBuffer.
+        The transitions are the same as the ones given by `reorganize`.
+        '''
+        # The last state and action of each player, waiting for the next state
+        pending = [None for _ in range(self.num_players)]
+        state, player_id = self.reset()
+
+        while not self.is_over():
+            if pending[player_id] is not None:
+                last_state, last_action = pending[player_id]
+                buffer.add(player_id, last_state, last_action, 0, state, False)
+
+            # Agent plays
+            agent = self.agents[player_id]
+            action = self._agent_act(agent, state, is_training)
+            # The buffer stores action ids, so look up the id of a raw action
+            action_id = list(state['legal_actions'])[state['raw_legal_actions'].index(action)] if agent.use_raw else action
+            pending[player_id] = (state, action_id)
+
+            # Environment steps
+            state, player_id = self.step(action, agent.use_raw)
+
+        # The last transition of each player ends with the final state and the payoff
+        payoffs = self.get_payoffs()
+        for player_id in range(self.num_players):
+            if pending[player_id] is not None:
+                last_state, last_action = pending[player_id]
+                buffer.add(player_id, last_state, last_action, payoffs[player_id], self.get_state(player_id), True)
+
+        return buffer, payoffs
+
+    def _agent_act(self, agent, state, is_training):
+        ''' Let the agent choose an action with `step` if training, `eval_step` otherwise
+        '''
+        if self.profiler is None:
+            if is_training:
+                return agent.step(state)
+            return agent.eval_step(state)[0]
+        start = time.perf_counter()
+        if is_training:
+            action = agent.step(state)
+            self.profiler.record('agent.step', time.perf_counter() - start)
+        else:
+            action = agent.eval_step(state)[0]
+            self.profiler.record('agent.eval_step', time.perf_counter() - start)
+        return action
+
+    def enable_profiling(self, profiler=None):
+        ''' Time the phases of the steps: `_decode_action`, `game.step`,
+        `game.get_state`, `_extract_state`, the legal action computations of the
+        env and the game, and the `step`/`eval_step` of the agents in `run`.
+        The phases nest, e.g., `_extract_state` may call `_get_legal_actions`.
+
+        The timed functions are installed on this env and its game only while
+        profiling is on, so there is no overhead otherwise.
+
+        Args:
+            profiler (Profiler): Optional. A profiler to share between environments
+
+        Returns:
+            (Profiler): The profiler that records the timings
+        '''
+        self.disable_profiling()
+        self.profiler = Profiler() if profiler is None else profiler
+        for name in self._PROFILED_ENV_METHODS:
+            setattr(self, name, self.profiler.wrap(name, getattr(self, name)))
+        # Not every game has all the methods, e.g., get_legal_actions
+        for name in self._PROFILED_GAME_METHODS:
+            method = getattr(self.game, name, None)
+            if method is not None:
+                setattr(self.game, name, self.profiler.wrap('game.' + name, method))
+        return self.profiler
+
+    def disable_profiling(self):
+        ''' Remove the timed functions. The profiler keeps its records
+        '''
+        if self.profiler is None:
+            return
+        for name in self._PROFILED_ENV_METHODS:
+            self.__dict__.pop(name, None)
+        for name in self._PROFILED_GAME_METHODS:
+            self.game.__dict__.pop(name, None)
+        self.profiler = None
+
     def is_over(self):
         ''' Check whether the curent game is over
 
@@ -194,7 +361,31 @@ class Env(object):
         Returns:
             (numpy.array): The observed state of the player
         '''
-        return self._extract_state(self.game.get_state(player_id))
+        return self._make_state(self.game.get_state(player_id))
+
+    def infoset_key(self, player_id):
+        ''' Get the key of the information set of a player, i.e., the bytes
+        of its observation, without building its state. The tree search
+        algorithms, e.g., CFR, call it at every node.
+
+        Args:
+            player_id (int): The player id
+
+        Returns:
+            (bytes): The bytes of the observation, equal to `state['obs'].tobytes()`
+
+        Note: The environments can override it with a cheaper encoding of the
+              same observation.
+        '''
+        return self._extract_state(self.game.get_state(player_id))['obs'].tobytes()
+
+    def legal_action_ids(self):
+        ''' Get the legal actions of the current player without building its state
+
+        Returns:
+            (list): The ids of the legal actions, in the order of `state['legal_actions']`
+        '''
+        return self._get_legal_action_ids(self.game.get_state(self.get_player_id()))
 
     def get_payoffs(self):
         ''' Get the payoffs of players. Must be implemented in the child class.
@@ -230,6 +421,47 @@ class Env(object):
         self.game.np_random = self.np_random
         return seed
 
+    def _make_state(self, state):
+        ''' Build the state given to the agents from the raw state. With the
+        'lazy_state' config, the extraction is deferred to the first access.
+
+        Args:
+            state (dict): The raw state
+
+        Returns:
+            (dict): The extracted state, or a LazyState
+        '''
+        if not self.lazy_state:
+            return self._extract_state_with_mask(state)
+        lazy_state = LazyState(self._extract_state_with_mask, state)
+        if not self.pure_state_extraction:
+            self._lazy_states.append(weakref.ref(lazy_state))
+        return lazy_state
+
+    def _extract_state_with_mask(self, state):
+        ''' Extract the state and add the boolean legal action mask as 'legal_mask'
+        '''
+        extracted_state = self._extract_state(state)
+        # Each state owns its mask. The states are kept in the trajectories and
+        # the memories of the agents, so a buffer shared by the env would be
+        # overwritten by the next step, and copying it costs the same as this
+        # allocation.
+        legal_mask = np.zeros(self.num_actions, dtype=np.bool_)
+        legal_mask[self._get_legal_action_ids(state)] = True
+        extracted_state['legal_mask'] = legal_mask
+        return extracted_state
+
+    def _materialize_states(self):
+        ''' Extract the lazy states that are still referenced before the game
+        changes, since the extraction may read the current game
+        '''
+        if self._lazy_states:
+            for ref in self._lazy_states:
+                lazy_state = ref()
+                if lazy_state is not None:
+                    lazy_state.materialize()
+            self._lazy_states = []
+
     def _extract_state(self, state):
         ''' Extract useful information from state for RL. Must be implemented in the child class.
 
@@ -241,6 +473,21 @@ class Env(object):
         '''
         raise NotImplementedError
 
+    def _get_legal_action_ids(self, state):
+        ''' Get the ids of the legal actions of a raw state without building the
+        'legal_actions' of the extracted state
+
+        Args:
+            state (dict): The raw state
+
+        Returns:
+            (list): The ids of the legal actions, in the order of `state['legal_actions']`
+
+        Note: The environments override it with a direct lookup, this default
+              extracts the state.
+        '''
+        return list(self._extract_state(state)['legal_actions'])
+
     def _decode_action(self, action_id):
         ''' Decode Action id to the action in the game.
 
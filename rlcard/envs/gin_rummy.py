@@ -98,3 +98,14 @@ class GinRummyEnv(Env):
         legal_actions = self.game.judge.get_legal_actions()
         legal_actions_ids = {action_event.action_id: None for action_event in legal_actions}
         return OrderedDict(legal_actions_ids)
+
+    def _get_legal_action_ids(self, state):
+        ''' Get the ids of the legal actions of a raw state
+
+        Args:
+            state (dict): The raw state
+
+        Returns:
+            (list): The ids of the legal actions
+        '''
+        return [action_event.action_id for action_event in self.game.judge.get_legal_actions()]
@@ -0,0 +1,152 @@
+''' A state dictionary that is extracted from the raw game state on first access
+'''
+from collections import OrderedDict
+from collections.abc import Mapping
+
+class LazyState(dict):
+    ''' A dictionary with the same keys as the output of `Env._extract_state`.
+    The extraction runs the first time the state is read, so the states that
+    no agent looks at, e.g., the next states in a tree traversal or the final
+    states of the players that do not learn, cost nothing to encode.
+
+    The environment materializes the states that are still alive before the
+    game moves on, unless the extraction of the environment only reads the raw
+    state, which the game does not mutate afterwards.
+    '''
+
+    def __init__(self, extract, raw_state):
+        ''' Initialize the lazy state
+
+        Args:
+            extract (function): The extraction function, e.g., env._extract_state
+            raw_state (dict): The raw state from the game
+        '''
+        super().__init__()
+        self._extract = extract
+        self._raw_state = raw_state
+
+    def materialize(self):
+        ''' Run the extraction if it has not run yet
+        '''
+        if self._extract is not None:
+            extract, raw_state = self._extract, self._raw_state
+            self._extract = self._raw_state = None
+            dict.update(self, extract(raw_state))
+
+    @property
+    def is_materialized(self):
+        ''' True if the extraction has run
+        '''
+        return self._extract is None
+
+    def __getitem__(self, key):
+        self.materialize()
+        return dict.__getitem__(self, key)
+
+    def __setitem__(self, key, value):
+        self.materialize()
+        dict.__setitem__(self, key, value)
+
+    def __delitem__(self, key):
+        self.materialize()
+        dict.__delitem__(self, key)
+
+    def __contains__(self, key):
+        self.materialize()
+        return dict.__contains__(self, key)
+
+    def __iter__(self):
+        self.materialize()
+        return dict.__iter__(self)
+
+    def __len__(self):
+        self.materialize()
+        return dict.__len__(self)
+
+    def __eq__(self, other):
+        self.materialize()
+        return dict.__eq__(self, other)
+
+    def __ne__(self, other):
+        return not self == other
+
+    def __repr__(self):
+        self.materialize()
+        return dict.__repr__(self)
+
+    def __reduce__(self):
+        # Pickle and copy as a plain dictionary
+        self.materialize()
+        return dict, (dict(self),)
+
+    def get(self, key, default=None):
+        self.materialize()
+        return dict.get(self, key, default)
+
+    def keys(self):
+        self.materialize()
+        return dict.keys(self)
+
+    def values(self):
+        self.materialize()
+        return dict.values(self)
+
+    def items(self):
+        self.materialize()
+        return dict.items(self)
+
+    def copy(self):
+        self.materialize()
+        return dict(self)
+
+    def pop(self, *args):
+        self.materialize()
+        return dict.pop(self, *args)
+
+    def setdefault(self, key, default=None):
+        self.materialize()
+        return dict.setdefault(self, key, default)
+
+    def update(self, *args, **kwargs):
+        self.materialize()
+        dict.update(self, *args, **kwargs)
+
+
+class LazyLegalActions(Mapping):
+    ''' The legal actions of a state, keyed by action id in the order of the
+    game. The values, e.g., the action features of DouDizhu, are encoded the
+    first time they are read, so building the state only costs the ids.
+    '''
+
+    def __init__(self, action_ids, actions, encode):
+        ''' Initialize the legal actions
+
+        Args:
+            action_ids (list): The ids of the legal actions
+            actions (list): The legal actions in the game, in the same order
+            encode (function): The function that encodes an action into its value
+        '''
+        self._actions = OrderedDict(zip(action_ids, actions))
+        self._encode = encode
+        self._values = {}
+
+    def __getitem__(self, action_id):
+        if action_id not in self._values:
+            self._values[action_id] = self._encode(self._actions[action_id])
+        return self._values[action_id]
+
+    def __iter__(self):
+        return iter(self._actions)
+
+    def __len__(self):
+        return len(self._actions)
+
+    def __contains__(self, action_id):
+        return action_id in self._actions
+
+    def __repr__(self):
+        return repr(OrderedDict(self.items()))
+
+    def __reduce__(self):
+        # Pickle and copy as a plain ordered dictionary
+        return OrderedDict, (list(self.items()),)
@@ -16,6 +16,9 @@ class LeducholdemEnv(Env):
     ''' Leduc Hold'em Environment
     '''
 
+    # The extraction only reads the raw state
+    pure_state_extraction = True
+
     def __init__(self, config):
         ''' Initialize the Limitholdem environment
         '''
@@ -24,12 +27,16 @@ class LeducholdemEnv(Env):
         self.game = Game()
         super().__init__(config)
         self.actions = ['call', 'raise', 'fold', 'check']
+        self.action_ids = {action: action_id for action_id, action in enumerate(self.actions)}
         self.state_shape = [[36] for _ in range(self.num_players)]
         self.action_shape = [None for _ in range(self.num_players)]
 
         with open(os.path.join(rlcard.__path__[0], 'games/leducholdem/card2index.json'), 'r') as file:
             self.card2index = json.load(file)
 
+        # The infoset keys of the observations already encoded
+        self._infoset_keys = {}
+
     def _get_legal_actions(self):
         ''' Get all leagal actions
 
@@ -38,6 +45,17 @@ class LeducholdemEnv(Env):
         '''
         return self.game.get_legal_actions()
 
+    def _get_legal_action_ids(self, state):
+        ''' Get the ids of the legal actions of a raw state
+
+        Args:
+            state (dict): The raw state
+
+        Returns:
+            (list): The ids of the legal actions
+        '''
+        return [self.action_ids[action] for action in state['legal_actions']]
+
     def _extract_state(self, state):
         ''' Extract the state representation from state dictionary for agent
 
@@ -54,15 +72,7 @@ class LeducholdemEnv(Env):
         legal_actions = OrderedDict({self.actions.index(a): None for a in state['legal_actions']})
         extracted_state['legal_actions'] = legal_actions
 
-        public_card = state['public_card']
-        hand = state['hand']
-        obs = np.zeros(36)
-        obs[self.card2index[hand]] = 1
-        if public_card:
-            obs[self.card2index[public_card]+3] = 1
-        obs[state['my_chips']+6] = 1
-        obs[sum(state['all_chips'])-state['my_chips']+21] = 1
-        extracted_state['obs'] = obs
+        extracted_state['obs'] = self._encode_obs(state['hand'], state['public_card'], state['my_chips'], sum(state['all_chips']))
 
         extracted_state['raw_obs'] = state
         extracted_state['raw_legal_actions'] = [a for a in state['legal_actions']]
@@ -70,6 +80,53 @@ class LeducholdemEnv(Env):
 
         return extracted_state
 
+    def _encode_obs(self, hand, public_card, my_chips, all_chips):
+        ''' Encode the observation of a player
+
+        Args:
+            hand (str): The index of the hand card
+            public_card (str): The index of the public card, None before it is dealt
+            my_chips (int): The chips of the player
+            all_chips (int): The chips of all the players
+
+        Returns:
+            (numpy.array): The observation
+        '''
+        obs = np.zeros(36)
+        obs[self.card2index[hand]] = 1
+        if public_card:
+            obs[self.card2index[public_card]+3] = 1
+        obs[my_chips+6] = 1
+        obs[all_chips-my_chips+21] = 1
+        return obs
+
+    def infoset_key(self, player_id):
+        ''' Get the bytes of the observation of a player, read from the game
+        and cached by its cards and chips
+
+        Args:
+            player_id (int): The player id
+
+        Returns:
+            (bytes): The bytes of the observation, equal to `state['obs'].tobytes()`
+        '''
+        game = self.game
+        player = game.players[player_id]
+        signature = (player.hand.get_index(), game.public_card.get_index() if game.public_card else None,
+                     player.in_chips, sum(p.in_chips for p in game.players))
+        key = self._infoset_keys.get(signature)
+        if key is None:
+            key = self._infoset_keys[signature] = self._encode_obs(*signature).tobytes()
+        return key
+
+    def legal_action_ids(self):
+        ''' Get the legal actions of the current player without building its state
+
+        Returns:
+            (list): The ids of the legal actions, in the order of `state['legal_actions']`
+        '''
+        return [self.action_ids[action] for action in self.game.get_legal_actions()]
+
     def get_payoffs(self):
         ''' Get the payoff of a game
 
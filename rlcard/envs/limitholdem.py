@@ -6,15 +6,22 @@ from collections import OrderedDict
 import rlcard
 from rlcard.envs import Env
 from rlcard.games.limitholdem import Game
+from rlcard.games.limitholdem.abstraction import make_abstraction
 
 DEFAULT_GAME_CONFIG = {
         'game_num_players': 2,
         }
 
+# The maximum number of cached infoset keys
+MAX_CACHED_KEYS = 1 << 20
+
 class LimitholdemEnv(Env):
     ''' Limitholdem Environment
     '''
 
+    # The extraction only reads the raw state
+    pure_state_extraction = True
+
     def __init__(self, config):
         ''' Initialize the Limitholdem environment
         '''
@@ -23,12 +30,19 @@ class LimitholdemEnv(Env):
         self.game = Game()
         super().__init__(config)
         self.actions = ['call', 'raise', 'fold', 'check']
-        self.state_shape = [[72] for _ in range(self.num_players)]
+        self.action_ids = {action: action_id for action_id, action in enumerate(self.actions)}
+        # The cards are encoded with their buckets with a card abstraction, see abstraction.py
+        self.abstraction = make_abstraction(config.get('card_abstraction'))
+        num_card_features = 52 if self.abstraction is None else self.abstraction.num_features
+        self.state_shape = [[num_card_features + 20] for _ in range(self.num_players)]
         self.action_shape = [None for _ in range(self.num_players)]
 
         with open(os.path.join(rlcard.__path__[0], 'games/limitholdem/card2index.json'), 'r') as file:
             self.card2index = json.load(file)
 
+        # The infoset keys of the observations already encoded
+        self._infoset_keys = {}
+
     def _get_legal_actions(self):
         ''' Get all leagal actions
 
@@ -37,6 +51,17 @@ class LimitholdemEnv(Env):
         '''
         return self.game.get_legal_actions()
 
+    def _get_legal_action_ids(self, state):
+        ''' Get the ids of the legal actions of a raw state
+
+        Args:
+            state (dict): The raw state
+
+        Returns:
+            (list): The ids of the legal actions
+        '''
+        return [self.action_ids[action] for action in state['legal_actions']]
+
     def _extract_state(self, state):
         ''' Extract the state representation from state dictionary for agent
 
@@ -53,16 +78,7 @@ class LimitholdemEnv(Env):
         legal_actions = OrderedDict({self.actions.index(a): None for a in state['legal_actions']})
         extracted_state['legal_actions'] = legal_actions
 
-        public_cards = state['public_cards']
-        hand = state['hand']
-        raise_nums = state['raise_nums']
-        cards = public_cards + hand
-        idx = [self.card2index[card] for card in cards]
-        obs = np.zeros(72)
-        obs[idx] = 1
-        for i, num in enumerate(raise_nums):
-            obs[52 + i * 5 + num] = 1
-        extracted_state['obs'] = obs
+        extracted_state['obs'] = self._encode_obs(state['hand'], state['public_cards'], state['raise_nums'])
 
         extracted_state['raw_obs'] = state
         extracted_state['raw_legal_actions'] = [a for a in state['legal_actions']]
@@ -70,6 +86,57 @@ class LimitholdemEnv(Env):
 
         return extracted_state
 
+    def _encode_obs(self, hand, public_cards, raise_nums):
+        ''' Encode the observation of a player
+
+        Args:
+            hand (list): The indices of the hand cards
+            public_cards (list): The indices of the public cards
+            raise_nums (list): The number of raises in each round
+
+        Returns:
+            (numpy.array): The observation
+        '''
+        obs = np.zeros(self.state_shape[0][0])
+        if self.abstraction is None:
+            cards = list(public_cards) + list(hand)
+            idx = [self.card2index[card] for card in cards]
+            obs[idx] = 1
+        else:
+            obs[:self.abstraction.num_features] = self.abstraction.encode(hand, public_cards)
+        for i, num in enumerate(raise_nums):
+            obs[-20 + i * 5 + num] = 1
+        return obs
+
+    def infoset_key(self, player_id):
+        ''' Get the bytes of the observation of a player, read from the game
+        and cached by its cards and raises
+
+        Args:
+            player_id (int): The player id
+
+        Returns:
+            (bytes): The bytes of the observation, equal to `state['obs'].tobytes()`
+        '''
+        game = self.game
+        signature = (tuple(card.get_index() for card in game.players[player_id].hand),
+                     tuple(card.get_index() for card in game.public_cards),
+                     tuple(game.history_raise_nums))
+        key = self._infoset_keys.get(signature)
+        if key is None:
+            if len(self._infoset_keys) >= MAX_CACHED_KEYS:
+                self._infoset_keys.clear()
+            key = self._infoset_keys[signature] = self._encode_obs(*signature).tobytes()
+        return key
+
+    def legal_action_ids(self):
+        ''' Get the legal actions of the current player without building its state
+
+        Returns:
+            (list): The ids of the legal actions, in the order of `state['legal_actions']`
+        '''
+        return [self.action_ids[action] for action in self.game.get_legal_actions()]
+
     def get_payoffs(self):
         ''' Get the payoff of a game
 
@@ -109,3 +109,14 @@ class MahjongEnv(Env):
             #print(self.game.get_state(self.game.round.current_player))
             #exit()
         return OrderedDict(legal_action_id)
+
+    def _get_legal_action_ids(self, state):
+        ''' Get the ids of the legal actions of a raw state
+
+        Args:
+            state (dict): The raw state
+
+        Returns:
+            (list): The ids of the legal actions
+        '''
+        return list(self._get_legal_actions())
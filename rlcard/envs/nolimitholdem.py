@@ -7,6 +7,7 @@ import rlcard
 from rlcard.envs import Env
 from rlcard.games.nolimitholdem import Game
 from rlcard.games.nolimitholdem.round import Action
+from rlcard.games.limitholdem.abstraction import make_abstraction
 
 DEFAULT_GAME_CONFIG = {
         'game_num_players': 2,
@@ -18,6 +19,9 @@ class NolimitholdemEnv(Env):
     ''' Limitholdem Environment
     '''
 
+    # The extraction only reads the raw state
+    pure_state_extraction = True
+
     def __init__(self, config):
         ''' Initialize the Limitholdem environment
         '''
@@ -26,7 +30,10 @@ class NolimitholdemEnv(Env):
         self.game = Game()
         super().__init__(config)
         self.actions = Action
-        self.state_shape = [[54] for _ in range(self.num_players)]
+        # The cards are encoded with their buckets with a card abstraction, see abstraction.py
+        self.abstraction = make_abstraction(config.get('card_abstraction'))
+        num_card_features = 52 if self.abstraction is None else self.abstraction.num_features
+        self.state_shape = [[num_card_features + 2] for _ in range(self.num_players)]
         self.action_shape = [None for _ in range(self.num_players)]
         # for raise_amount in range(1, self.game.init_chips+1):
         #     self.actions.append(raise_amount)
@@ -42,6 +49,17 @@ class NolimitholdemEnv(Env):
         '''
         return self.game.get_legal_actions()
 
+    def _get_legal_action_ids(self, state):
+        ''' Get the ids of the legal actions of a raw state
+
+        Args:
+            state (dict): The raw state
+
+        Returns:
+            (list): The ids of the legal actions
+        '''
+        return [action.value for action in state['legal_actions']]
+
     def _extract_state(self, state):
         ''' Extract the state representation from state dictionary for agent
 
@@ -62,12 +80,15 @@ class NolimitholdemEnv(Env):
         hand = state['hand']
         my_chips = state['my_chips']
         all_chips = state['all_chips']
-        cards = public_cards + hand
-        idx = [self.card2index[card] for card in cards]
-        obs = np.zeros(54)
-        obs[idx] = 1
-        obs[52] = float(my_chips)
-        obs[53] = float(max(all_chips))
+        obs = np.zeros(self.state_shape[0][0])
+        if self.abstraction is None:
+            cards = public_cards + hand
+            idx = [self.card2index[card] for card in cards]
+            obs[idx] = 1
+        else:
+            obs[:self.abstraction.num_features] = self.abstraction.encode(hand, public_cards)
+        obs[-2] = float(my_chips)
+        obs[-1] = float(max(all_chips))
         extracted_state['obs'] = obs
 
         extracted_state['raw_obs'] = state
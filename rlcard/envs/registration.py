@@ -1,9 +1,13 @@
 import importlib
 
+from rlcard.envs.vec_env import VecEnv, SubprocVecEnv
+
 # Default Config
 DEFAULT_CONFIG = {
         'allow_step_back': False,
         'seed': None,
+        'lazy_state': False,
+        'profile': False,
         }
 
 class EnvSpec(object):
@@ -18,8 +22,9 @@ class EnvSpec(object):
             entry_point (string): A string the indicates the location of the envronment class
         '''
         self.env_id = env_id
-        mod_name, class_name = entry_point.split(':')
-        self._entry_point = getattr(importlib.import_module(mod_name), class_name)
+        self.entry_point = entry_point
+        # The module of the environment is imported by the first `make`
+        self._entry_point = None
 
     def make(self, config=DEFAULT_CONFIG):
         ''' Instantiates an instance of the environment
@@ -28,6 +33,9 @@ class EnvSpec(object):
             env (Env): An instance of the environemnt
             config (dict): A dictionary of the environment settings
         '''
+        if self._entry_point is None:
+            mod_name, class_name = self.entry_point.split(':')
+            self._entry_point = getattr(importlib.import_module(mod_name), class_name)
         env = self._entry_point(config)
         return env
 
@@ -87,3 +95,25 @@ def make(env_id, config={}):
         _config[key] = config[key]
 
     return registry.make(env_id, _config)
+
+def make_vec(env_id, num_envs=1, config={}, num_workers=0):
+    ''' Create a vectorized environment that steps several games together
+
+    Args:
+        env_id (string): The name of the environment
+        num_envs (int): The number of games
+        config (dict): A dictionary of the environment settings. If a seed
+            is given, the i-th game is seeded with `seed + i`
+        num_workers (int): The number of worker processes. If 0, the games are
+            stepped in the current process. If None, one worker per CPU is used
+
+    Returns:
+        (VecEnv or SubprocVecEnv): The vectorized environment
+    '''
+    if num_workers != 0:
+        return SubprocVecEnv(env_id, num_envs, config, num_workers=num_workers)
+    envs = [make(env_id, config) for _ in range(num_envs)]
+    vec_env = VecEnv(envs)
+    if config.get('seed') is not None:
+        vec_env.seed(config['seed'])
+    return vec_env
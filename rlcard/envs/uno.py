@@ -49,6 +49,17 @@ class UnoEnv(Env):
         legal_ids = {ACTION_SPACE[action]: None for action in legal_actions}
         return OrderedDict(legal_ids)
 
+    def _get_legal_action_ids(self, state):
+        ''' Get the ids of the legal actions of a raw state
+
+        Args:
+            state (dict): The raw state
+
+        Returns:
+            (list): The ids of the legal actions
+        '''
+        return list(self._get_legal_actions())
+
     def get_perfect_information(self):
         ''' Get the perfect information of the current state
 
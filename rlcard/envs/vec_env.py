@@ -0,0 +1,348 @@
+''' Vectorized environments that step several games together
+'''
+import traceback
+
+import numpy as np
+
+
+class VecEnv(object):
+    ''' Step a batch of independent games of the same environment together.
+
+    The observations, the legal action masks, the player ids and the done
+    flags of all the games are written into stacked numpy arrays, so that an
+    agent can run one batched forward pass over all the games at each tick.
+    A game that is over is reset automatically in the same call.
+
+    When the players have observations of different shapes, e.g., in Dou
+    Dizhu, the observations are zero-padded to the largest shape, and
+    `player_batch` gives the observations of one player in its own shape.
+    '''
+
+    def __init__(self, envs, buffers=None):
+        ''' Initialize the vectorized environment
+
+        Args:
+            envs (list): A list of Env objects of the same game
+            buffers (dict): Optional preallocated arrays to write the outputs into,
+                keyed by 'obs', 'legal_mask', 'player_ids', 'dones' and 'payoffs'.
+                They are allocated here if not given.
+        '''
+        if len(envs) == 0:
+            raise ValueError('VecEnv needs at least one environment')
+        self.envs = envs
+        self.num_envs = len(envs)
+        self.num_players = envs[0].num_players
+        self.num_actions = envs[0].num_actions
+
+        self.state_shapes = [list(shape) for shape in envs[0].state_shape]
+        self.state_shape = _padded_shape(self.state_shapes)
+
+        # The stacked outputs. They are overwritten by every call of reset and step
+        if buffers is None:
+            buffers = {name: np.zeros(shape, dtype=dtype)
+                       for name, (shape, dtype) in _buffer_specs(self.num_envs, self.state_shape, self.num_actions, self.num_players).items()}
+        self.obs = buffers['obs']
+        self.legal_mask = buffers['legal_mask']
+        self.player_ids = buffers['player_ids']
+        self.dones = buffers['dones']
+        self.payoffs = buffers['payoffs']
+
+        # The latest state dictionary of each game, for agents that need raw information
+        self.states = [None for _ in range(self.num_envs)]
+
+    def seed(self, seed=None):
+        ''' Seed the games. The i-th game is seeded with `seed + i`
+
+        Args:
+            seed (int): The base random seed
+        '''
+        for i, env in enumerate(self.envs):
+            env.seed(None if seed is None else seed + i)
+
+    def reset(self):
+        ''' Start a new game in every environment
+
+        Returns:
+            (tuple): Tuple containing:
+
+                (numpy.array): The stacked observations of the current players
+                (numpy.array): The stacked boolean legal action masks
+                (numpy.array): The ids of the current players
+        '''
+        self.dones[:] = False
+        self.payoffs[:] = 0
+        for i, env in enumerate(self.envs):
+            state, player_id = env.reset()
+            self._write(i, state, player_id)
+        return self.obs, self.legal_mask, self.player_ids
+
+    def step(self, actions, raw_action=False):
+        ''' Step forward every game with one action each
+
+        Args:
+            actions (list): The action for the current player of each game
+            raw_action (boolean): True if the actions are raw actions
+
+        Returns:
+            (tuple): Tuple containing:
+
+                (numpy.array): The stacked observations of the next players
+                (numpy.array): The stacked boolean legal action masks
+                (numpy.array): The ids of the next players
+                (numpy.array): True for the games that are over after this step
+                (numpy.array): The payoffs of the games that are over, zeros elsewhere
+
+        Note: A game that is over is reset right away, so the returned observation
+              of that game is the first observation of the new game.
+        '''
+        if len(actions) != self.num_envs:
+            raise ValueError('Expected {} actions, got {}'.format(self.num_envs, len(actions)))
+        for i, env in enumerate(self.envs):
+            state, player_id = env.step(actions[i], raw_action)
+            if env.is_over():
+                self.dones[i] = True
+                self.payoffs[i] = env.get_payoffs()
+                state, player_id = env.reset()
+            else:
+                self.dones[i] = False
+                self.payoffs[i] = 0
+            self._write(i, state, player_id)
+        return self.obs, self.legal_mask, self.player_ids, self.dones, self.payoffs
+
+    def player_batch(self, player_id):
+        ''' Get the games where a player is to act, see `player_batch`
+        '''
+        return player_batch(self, player_id)
+
+    def close(self):
+        ''' Release the resources. Nothing to do for the in-process environments
+        '''
+        pass
+
+    def _write(self, i, state, player_id):
+        ''' Write the state of the i-th game into the stacked arrays
+        '''
+        self.states[i] = state
+        obs = np.asarray(state['obs'])
+        if obs.shape == self.obs.shape[1:]:
+            self.obs[i] = obs
+        else:
+            self.obs[i] = 0
+            self.obs[i][tuple(slice(0, size) for size in obs.shape)] = obs
+        self.legal_mask[i] = state['legal_mask']
+        self.player_ids[i] = player_id
+
+
+class SubprocVecEnv(object):
+    ''' Step a batch of games in worker processes.
+
+    Each worker process owns a contiguous shard of the games. The workers write
+    the observations, the legal action masks, the player ids, the done flags and
+    the payoffs straight into shared-memory numpy arrays, and read the actions
+    from a shared-memory array, so no state dictionary is pickled between the
+    processes. The outputs have the same layout as the ones of VecEnv.
+    '''
+
+    def __init__(self, env_id, num_envs, config={}, num_workers=None, start_method=None):
+        ''' Initialize the workers
+
+        Args:
+            env_id (string): The name of the environment
+            num_envs (int): The number of games
+            config (dict): A dictionary of the environment settings. If a seed
+                is given, the i-th game is seeded with `seed + i`
+            num_workers (int): The number of worker processes. Default is the number of CPUs
+            start_method (string): The multiprocessing start method, e.g., 'fork' or 'spawn'.
+                Default is the platform default
+        '''
+        import multiprocessing as mp
+        from rlcard.envs.registration import make
+
+        if num_workers is None:
+            num_workers = mp.cpu_count()
+        num_workers = max(1, min(num_workers, num_envs))
+
+        # Query the shapes from a local instance
+        env = make(env_id, config)
+        self.num_envs = num_envs
+        self.num_players = env.num_players
+        self.num_actions = env.num_actions
+        self.state_shapes = [list(shape) for shape in env.state_shape]
+        self.state_shape = _padded_shape(self.state_shapes)
+
+        ctx = mp.get_context(start_method)
+
+        # Allocate the shared memory and wrap it with numpy arrays
+        specs = _buffer_specs(self.num_envs, self.state_shape, self.num_actions, self.num_players)
+        specs['actions'] = ((self.num_envs,), np.int64)
+        self._shared = {}
+        buffers = {}
+        for name, (shape, dtype) in specs.items():
+            raw = ctx.RawArray('b', int(np.prod(shape)) * np.dtype(dtype).itemsize)
+            self._shared[name] = (raw, shape, dtype)
+            buffers[name] = np.frombuffer(raw, dtype=dtype).reshape(shape)
+        self.obs = buffers['obs']
+        self.legal_mask = buffers['legal_mask']
+        self.player_ids = buffers['player_ids']
+        self.dones = buffers['dones']
+        self.payoffs = buffers['payoffs']
+        self._actions = buffers['actions']
+
+        # Start the workers, each of them owns a shard [start, end) of the games
+        bounds = np.linspace(0, self.num_envs, num_workers + 1).astype(int)
+        self.remotes = []
+        self.processes = []
+        for start, end in zip(bounds[:-1], bounds[1:]):
+            remote, worker_remote = ctx.Pipe()
+            process = ctx.Process(target=_subproc_worker,
+                                  args=(worker_remote, remote, env_id, config, int(start), int(end), self._shared),
+                                  daemon=True)
+            process.start()
+            worker_remote.close()
+            self.remotes.append(remote)
+            self.processes.append(process)
+        self.closed = False
+
+    def seed(self, seed=None):
+        ''' Seed the games. The i-th game is seeded with `seed + i`
+
+        Args:
+            seed (int): The base random seed
+        '''
+        self._call('seed', seed)
+
+    def reset(self):
+        ''' Start a new game in every environment
+
+        Returns:
+            (tuple): Tuple containing:
+
+                (numpy.array): The stacked observations of the current players
+                (numpy.array): The stacked boolean legal action masks
+                (numpy.array): The ids of the current players
+
+        Note: The returned arrays live in shared memory and are overwritten by the next call.
+        '''
+        self._call('reset')
+        return self.obs, self.legal_mask, self.player_ids
+
+    def step(self, actions):
+        ''' Step forward every game with one action id each
+
+        Args:
+            actions (list): The action id for the current player of each game
+
+        Returns:
+            (tuple): Tuple containing:
+
+                (numpy.array): The stacked observations of the next players
+                (numpy.array): The stacked boolean legal action masks
+                (numpy.array): The ids of the next players
+                (numpy.array): True for the games that are over after this step
+                (numpy.array): The payoffs of the games that are over, zeros elsewhere
+
+        Note: A game that is over is reset right away, like in VecEnv. The returned
+              arrays live in shared memory and are overwritten by the next call.
+        '''
+        if len(actions) != self.num_envs:
+            raise ValueError('Expected {} actions, got {}'.format(self.num_envs, len(actions)))
+        self._actions[:] = actions
+        self._call('step')
+        return self.obs, self.legal_mask, self.player_ids, self.dones, self.payoffs
+
+    def player_batch(self, player_id):
+        ''' Get the games where a player is to act, see `player_batch`
+        '''
+        return player_batch(self, player_id)
+
+    def close(self):
+        ''' Stop the worker processes
+        '''
+        if self.closed:
+            return
+        for remote in self.remotes:
+            remote.send(('close', None))
+        for process in self.processes:
+            process.join()
+        self.closed = True
+
+    def _call(self, command, data=None):
+        ''' Send a command to all the workers and wait until they are done
+        '''
+        if self.closed:
+            raise RuntimeError('SubprocVecEnv is closed')
+        for remote in self.remotes:
+            remote.send((command, data))
+        errors = [message for message in (remote.recv() for remote in self.remotes) if message is not None]
+        if errors:
+            raise RuntimeError('Error in SubprocVecEnv worker:\n{}'.format(errors[0]))
+
+def player_batch(vec_env, player_id):
+    ''' Get the games of a vectorized environment where a player is to act,
+    with the observations in the state shape of the player, e.g., to run the
+    agent of each player on its own games
+
+    Args:
+        vec_env (VecEnv or SubprocVecEnv): The vectorized environment
+        player_id (int): The player id
+
+    Returns:
+        (tuple): Tuple containing:
+
+            (numpy.array): The indices of the games
+            (numpy.array): The stacked observations of the player in these games
+            (numpy.array): The stacked boolean legal action masks
+    '''
+    indices = np.flatnonzero(vec_env.player_ids == player_id)
+    shape = vec_env.state_shapes[player_id]
+    obs = vec_env.obs[indices][(slice(None),) + tuple(slice(0, size) for size in shape)]
+    return indices, obs, vec_env.legal_mask[indices]
+
+def _padded_shape(state_shapes):
+    ''' The smallest shape that holds the observations of all the players
+    '''
+    if len(set(len(shape) for shape in state_shapes)) != 1:
+        raise ValueError('The state shapes of the players must have the same number of dimensions, got {}'.format(state_shapes))
+    return [int(size) for size in np.max(np.array(state_shapes), axis=0)]
+
+def _buffer_specs(num_envs, state_shape, num_actions, num_players):
+    ''' The shapes and dtypes of the stacked outputs of a vectorized environment
+    '''
+    return {
+        'obs': ((num_envs, *state_shape), np.float32),
+        'legal_mask': ((num_envs, num_actions), np.bool_),
+        'player_ids': ((num_envs,), np.int64),
+        'dones': ((num_envs,), np.bool_),
+        'payoffs': ((num_envs, num_players), np.float32),
+    }
+
+def _subproc_worker(remote, parent_remote, env_id, config, start, end, shared):
+    ''' The loop of a SubprocVecEnv worker. It steps the games [start, end)
+    '''
+    from rlcard.envs.registration import make
+
+    parent_remote.close()
+    buffers = {name: np.frombuffer(raw, dtype=dtype).reshape(shape)[start:end]
+               for name, (raw, shape, dtype) in shared.items()}
+    actions = buffers.pop('actions')
+    vec_env = VecEnv([make(env_id, config) for _ in range(end - start)], buffers)
+    if config.get('seed') is not None:
+        vec_env.seed(config['seed'] + start)
+
+    while True:
+        command, data = remote.recv()
+        if command == 'close':
+            break
+        try:
+            if command == 'reset':
+                vec_env.reset()
+            elif command == 'step':
+                vec_env.step(actions.tolist())
+            elif command == 'seed':
+                vec_env.seed(None if data is None else data + start)
+            else:
+                raise ValueError('Unknown command: {}'.format(command))
+            remote.send(None)
+        except Exception:
+            remote.send(traceback.format_exc())
+    remote.close()
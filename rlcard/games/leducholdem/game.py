@@ -1,5 +1,4 @@
 import numpy as np
-from copy import copy
 
 from rlcard.games.leducholdem import Dealer
 from rlcard.games.leducholdem import Player
@@ -107,16 +106,8 @@ class LeducholdemGame(Game):
                 (int): next plater's id
         '''
         if self.allow_step_back:
-            # First snapshot the current state
-            r = copy(self.round)
-            r_raised = copy(self.round.raised)
-            gp = self.game_pointer
-            r_c = self.round_counter
-            d_deck = copy(self.dealer.deck)
-            p = copy(self.public_card)
-            ps = [copy(self.players[i]) for i in range(self.num_players)]
-            ps_hand = [copy(self.players[i].hand) for i in range(self.num_players)]
-            self.history.append((r, r_raised, gp, r_c, d_deck, p, ps, ps_hand))
+            # First record what this action will change
+            self.history.append(self._undo_record())
 
         # Then we proceed to the next round
         self.game_pointer = self.round.proceed_round(self.players, action)
@@ -177,17 +168,55 @@ class LeducholdemGame(Game):
         payoffs = np.array(chips_payoffs) / (self.big_blind)
         return payoffs
 
-    def step_back(self):
-        ''' Return to the previous state of the game
+    def _undo_record(self):
+        ''' Record the fields that the next action can change
 
         Returns:
-            (bool): True if the game steps back successfully
+            (tuple): The undo record that can be passed to `_undo`
         '''
-        if len(self.history) > 0:
-            self.round, r_raised, self.game_pointer, self.round_counter, d_deck, self.public_card, self.players, ps_hand = self.history.pop()
-            self.round.raised = r_raised
-            self.dealer.deck = d_deck
-            for i, hand in enumerate(ps_hand):
-                self.players[i].hand = hand
-            return True
-        return False
+        player = self.players[self.round.game_pointer]
+        return (self.game_pointer,
+                self.round_counter,
+                self.public_card,
+                player.in_chips,
+                player.status,
+                self._undo_round_record())
+
+    def _undo(self, record):
+        ''' Reverse one action with its undo record
+
+        Args:
+            record (tuple): The undo record taken by `_undo_record` before the action
+        '''
+        self.game_pointer, self.round_counter, public_card, in_chips, status, round_record = record
+        if self.public_card is not public_card:
+            self.dealer.deck.append(self.public_card)
+            self.public_card = public_card
+        self._undo_round(round_record)
+        player = self.players[self.round.game_pointer]
+        player.in_chips, player.status = in_chips, status
+
+    def snapshot(self):
+        ''' Take a compact snapshot of the game
+
+        Returns:
+            (tuple): The snapshot that can be passed to `restore`
+        '''
+        return (self.game_pointer,
+                self.round_counter,
+                tuple(self.dealer.deck),
+                self.public_card,
+                tuple((p.in_chips, p.status, p.hand) for p in self.players),
+                self._snapshot_round())
+
+    def restore(self, snapshot):
+        ''' Restore the game to a snapshot taken by `snapshot`
+
+        Args:
+            snapshot (tuple): The snapshot
+        '''
+        self.game_pointer, self.round_counter, deck, self.public_card, players, round_snapshot = snapshot
+        self.dealer.deck = list(deck)
+        for player, (in_chips, status, hand) in zip(self.players, players):
+            player.in_chips, player.status, player.hand = in_chips, status, hand
+        self._restore_round(round_snapshot)
@@ -0,0 +1,349 @@
+''' A card abstraction of hold'em: the hole cards and the board of each
+round are mapped to a small number of buckets of similar hands.
+
+The buckets come from the hand strength HS, i.e., the probability to win, plus
+half the probability to tie, against one random hand on the river. The board is
+completed to the river by sampled rollouts, and the metric of a hand is
+
+    - 'ehs': the expected hand strength E[HS] over the rollouts
+    - 'ehs2': the expected squared hand strength E[HS^2], which also rewards
+      the hands whose strength varies, e.g., the draws
+    - 'histogram': the histogram of HS over the rollouts
+
+The scalar metrics are bucketed by quantiles, so the buckets of a round hold
+as many hands, and the histograms by k-means. The bucket tables, i.e., the
+buckets of the 169 canonical preflop hands and the quantiles or centroids of
+the later rounds, are fitted once on sampled hands with `fit` and saved.
+The postflop buckets are computed when a hand is first seen, with rollouts
+seeded by its cards, and cached.
+
+The limit-holdem and no-limit-holdem environments encode their observations
+with the buckets when the 'card_abstraction' config is set, so that tabular
+CFR and MCCFR keep a bounded number of infosets:
+
+    env = rlcard.make('limit-holdem', config={'card_abstraction': True})
+'''
+import os
+import zlib
+
+import numpy as np
+
+from rlcard.games.limitholdem.equity import to_card_ids
+from rlcard.games.limitholdem.evaluator import evaluate_batch
+from rlcard.games.limitholdem.preflop import NUM_HANDS, preflop_hand, preflop_index
+
+METRICS = ('ehs', 'ehs2', 'histogram')
+NUM_ROUNDS = 4
+# The number of board cards in each round
+BOARD_SIZES = (0, 3, 4, 5)
+DEFAULT_ABSTRACTION_PATH = os.path.join(os.path.dirname(os.path.abspath(__file__)), 'abstraction_ehs2.npz')
+
+class HandAbstraction(object):
+    ''' Map the hole cards and the board to buckets, see the module docstring
+    '''
+
+    def __init__(self, num_buckets=8, metric='ehs2', num_rollouts=64, num_opponent_samples=64,
+                 num_bins=10, cache_size=1 << 20):
+        ''' Initialize an abstraction, which needs to be fitted or loaded
+
+        Args:
+            num_buckets (int or list): The number of buckets, or the number of buckets of each round
+            metric (string): The metric of the hands, 'ehs', 'ehs2' or 'histogram'
+            num_rollouts (int): The number of sampled completions of the flop
+                board and the preflop board. The turn is completed with every card
+            num_opponent_samples (int): The number of sampled opponent hands of each rollout.
+                The river hand strength is exact, against every opponent hand
+            num_bins (int): The number of bins of the histograms
+            cache_size (int): The maximum number of cached buckets
+        '''
+        if metric not in METRICS:
+            raise ValueError('Unknown metric {}, the metrics are {}'.format(metric, METRICS))
+        if isinstance(num_buckets, int):
+            num_buckets = [num_buckets] * NUM_ROUNDS
+        self.num_buckets = list(num_buckets)
+        self.metric = metric
+        self.num_rollouts = num_rollouts
+        self.num_opponent_samples = num_opponent_samples
+        self.num_bins = num_bins
+        self.cache_size = cache_size
+
+        # The bucket of each canonical preflop hand, see preflop.py
+        self.preflop_buckets = None
+        # The quantiles of the scalar metrics, or the centroids of the histograms, of each round
+        self.tables = None
+        self._cache = {}
+
+    @property
+    def is_fitted(self):
+        return self.tables is not None
+
+    def hand_strengths(self, hand, board, num_rollouts=None):
+        ''' Sample the river hand strengths of a hand
+
+        Args:
+            hand (list): The ids of the two hole cards
+            board (list): The ids of the board cards
+            num_rollouts (int): The number of rollouts, num_rollouts of the abstraction by default
+
+        Returns:
+            (numpy.array): The hand strength on the river of each completion of the board
+        '''
+        np_random = np.random.RandomState(_seed(hand, board))
+        known = list(hand) + list(board)
+        unknown = np.array([card for card in range(52) if card not in known], dtype=np.int64)
+        num_board = 5 - len(board)
+        # The completions of the board, as indexes of the unknown cards
+        if num_board == 0:
+            picks = np.zeros((1, 0), dtype=np.int64)
+        elif num_board == 1:
+            picks = np.arange(len(unknown))[:, np.newaxis]
+        else:
+            num_rollouts = num_rollouts or self.num_rollouts
+            picks = np.argpartition(np_random.random_sample((num_rollouts, len(unknown))), num_board - 1, axis=1)
+            picks = picks[:, :num_board]
+        completions = unknown[picks]
+        num_completions = len(completions)
+
+        if num_board == 0:
+            # Every opponent hand
+            first, second = np.triu_indices(len(unknown), 1)
+            opponents = np.stack([unknown[first], unknown[second]], axis=1)[np.newaxis]
+        else:
+            # Two distinct cards, redrawn until none of them is in the completion
+            shape = (num_completions, self.num_opponent_samples)
+            first = np.zeros(shape, dtype=np.int64)
+            second = np.zeros(shape, dtype=np.int64)
+            redraw = np.ones(shape, dtype=bool)
+            while redraw.any():
+                num_redrawn = np.count_nonzero(redraw)
+                first[redraw] = np_random.randint(len(unknown), size=num_redrawn)
+                second[redraw] = np_random.randint(len(unknown) - 1, size=num_redrawn)
+                second[redraw] += second[redraw] >= first[redraw]
+                redraw = ((first[:, :, np.newaxis] == picks[:, np.newaxis, :]) |
+                          (second[:, :, np.newaxis] == picks[:, np.newaxis, :])).any(axis=2)
+            opponents = np.stack([unknown[first], unknown[second]], axis=2)
+        num_opponents = opponents.shape[1]
+
+        boards = np.concatenate([np.tile(np.array(board, dtype=np.int64), (num_completions, 1)), completions], axis=1)
+        strengths = evaluate_batch(np.concatenate([np.tile(np.array(hand, dtype=np.int64), (num_completions, 1)), boards], axis=1))
+        opponent_hands = np.concatenate([opponents, np.repeat(boards[:, np.newaxis, :], num_opponents, axis=1)], axis=2)
+        opponent_strengths = evaluate_batch(opponent_hands.reshape(-1, 7)).reshape(num_completions, num_opponents)
+        wins = strengths[:, np.newaxis] > opponent_strengths
+        ties = strengths[:, np.newaxis] == opponent_strengths
+        return (wins + ties / 2).mean(axis=1)
+
+    def features(self, hand, board, num_rollouts=None):
+        ''' Compute the metric of a hand
+
+        Args:
+            hand (list): The two hole cards, as card ids, strings or Card objects
+            board (list): The board cards
+            num_rollouts (int): The number of rollouts, num_rollouts of the abstraction by default
+
+        Returns:
+            (numpy.array): The metric, of size 1 for 'ehs' and 'ehs2' and num_bins for 'histogram'
+        '''
+        strengths = self.hand_strengths(to_card_ids(hand), to_card_ids(board), num_rollouts)
+        if self.metric == 'ehs':
+            return np.array([strengths.mean()])
+        if self.metric == 'ehs2':
+            return np.array([np.mean(strengths ** 2)])
+        return np.histogram(strengths, bins=self.num_bins, range=(0.0, 1.0))[0] / len(strengths)
+
+    def fit(self, num_hands=1000, num_preflop_rollouts=2048, np_random=None):
+        ''' Fit the bucket tables on the 169 canonical preflop hands and on
+        sampled hands of the later rounds
+
+        Args:
+            num_hands (int): The number of sampled hands of each postflop round
+            num_preflop_rollouts (int): The number of rollouts of the canonical preflop hands, which are few
+            np_random (numpy.random.RandomState): The random state of the sampled hands
+
+        Returns:
+            (HandAbstraction): The abstraction itself
+        '''
+        if np_random is None:
+            np_random = np.random.RandomState()
+        self._cache = {}
+        self.tables = []
+
+        # The canonical hands are weighted by their number of hole cards
+        preflop_features = np.array([self.features(preflop_hand(index), [], num_preflop_rollouts)
+                                     for index in range(NUM_HANDS)])
+        weights = np.array([_num_combos(index) for index in range(NUM_HANDS)])
+        self.tables.append(self._fit_round(np.repeat(preflop_features, weights, axis=0), 0, np_random))
+        self.preflop_buckets = np.array([self._assign(features, 0) for features in preflop_features], dtype=np.int64)
+
+        for round_index in range(1, NUM_ROUNDS):
+            features = []
+            for _ in range(num_hands):
+                cards = np_random.choice(52, 2 + BOARD_SIZES[round_index], replace=False).tolist()
+                features.append(self.features(cards[:2], cards[2:]))
+            self.tables.append(self._fit_round(np.array(features), round_index, np_random))
+        return self
+
+    def bucket(self, hand, board):
+        ''' Get the bucket of a hand in the round of its board
+
+        Args:
+            hand (list): The two hole cards, as card ids, strings or Card objects
+            board (list): The 0, 3, 4 or 5 board cards
+
+        Returns:
+            (int): The bucket, from 0 to the number of buckets of the round - 1
+        '''
+        if not self.is_fitted:
+            raise ValueError('The abstraction is not fitted, call fit or load it')
+        hand, board = to_card_ids(hand), to_card_ids(board)
+        if not board:
+            return int(self.preflop_buckets[preflop_index(hand)])
+
+        key = (tuple(sorted(hand)), tuple(sorted(board)))
+        bucket = self._cache.get(key)
+        if bucket is None:
+            if len(self._cache) >= self.cache_size:
+                self._cache.clear()
+            bucket = self._cache[key] = self._assign(self.features(hand, board), BOARD_SIZES.index(len(board)))
+        return bucket
+
+    def buckets(self, hand, board):
+        ''' Get the buckets of a hand in every round so far, i.e., the
+        abstraction with perfect recall of the buckets
+
+        Args:
+            hand (list): The two hole cards
+            board (list): The board cards, dealt in order
+
+        Returns:
+            (list): The bucket of each round up to the round of the board
+        '''
+        return [self.bucket(hand, board[:size]) for size in BOARD_SIZES if size <= len(board)]
+
+    @property
+    def num_features(self):
+        ''' The size of the encoding of the buckets, see `encode`
+        '''
+        return sum(self.num_buckets)
+
+    def encode(self, hand, board):
+        ''' Encode the buckets of a hand in every round so far
+
+        Args:
+            hand (list): The two hole cards
+            board (list): The board cards, dealt in order
+
+        Returns:
+            (numpy.array): A one-hot encoding of the bucket of each round, of size num_features
+        '''
+        features = np.zeros(self.num_features)
+        offset = 0
+        for round_index, bucket in enumerate(self.buckets(hand, board)):
+            features[offset + bucket] = 1
+            offset += self.num_buckets[round_index]
+        return features
+
+    def save(self, path):
+        ''' Save the abstraction and its bucket tables
+
+        Args:
+            path (string): The path of the .npz file
+        '''
+        if not self.is_fitted:
+            raise ValueError('The abstraction is not fitted, call fit or load it')
+        tables = {'table_{}'.format(round_index): table for round_index, table in enumerate(self.tables)}
+        np.savez(path, metric=self.metric, num_buckets=self.num_buckets, num_rollouts=self.num_rollouts,
+                 num_opponent_samples=self.num_opponent_samples, num_bins=self.num_bins,
+                 preflop_buckets=self.preflop_buckets, **tables)
+
+    @classmethod
+    def load(cls, path=DEFAULT_ABSTRACTION_PATH):
+        ''' Load a saved abstraction
+
+        Args:
+            path (string): The path of the .npz file, the abstraction shipped with rlcard by default
+
+        Returns:
+            (HandAbstraction): The abstraction
+        '''
+        with np.load(path) as data:
+            abstraction = cls(num_buckets=data['num_buckets'].tolist(), metric=str(data['metric']),
+                              num_rollouts=int(data['num_rollouts']),
+                              num_opponent_samples=int(data['num_opponent_samples']), num_bins=int(data['num_bins']))
+            abstraction.preflop_buckets = data['preflop_buckets']
+            abstraction.tables = [data['table_{}'.format(round_index)] for round_index in range(NUM_ROUNDS)]
+        return abstraction
+
+    def _fit_round(self, features, round_index, np_random):
+        ''' Fit the quantiles or the centroids of a round
+        '''
+        num_buckets = self.num_buckets[round_index]
+        if self.metric == 'histogram':
+            centroids = _kmeans(features, num_buckets, np_random)
+            # The buckets of the stronger hands come last
+            return centroids[np.argsort(centroids.dot(np.arange(self.num_bins)))]
+        return np.quantile(features[:, 0], np.arange(1, num_buckets) / num_buckets)
+
+    def _assign(self, features, round_index):
+        ''' Get the bucket of the metric of a hand
+        '''
+        table = self.tables[round_index]
+        if self.metric == 'histogram':
+            return int(np.argmin(((table - features) ** 2).sum(axis=1)))
+        return int(np.searchsorted(table, features[0], side='right'))
+
+def make_abstraction(config):
+    ''' Get the abstraction of the 'card_abstraction' config of an environment
+
+    Args:
+        config (object): None or False for no abstraction, True for the
+            abstraction shipped with rlcard, the path of a saved abstraction,
+            or a fitted HandAbstraction
+
+    Returns:
+        (HandAbstraction): The abstraction, None for no abstraction
+    '''
+    if config is None or config is False:
+        return None
+    if config is True:
+        return HandAbstraction.load()
+    if isinstance(config, str):
+        return HandAbstraction.load(config)
+    if not config.is_fitted:
+        raise ValueError('The card abstraction is not fitted, call fit or load it')
+    return config
+
+def _seed(hand, board):
+    ''' A seed that only depends on the cards, so a hand always gets the same bucket
+    '''
+    return zlib.crc32(bytes(sorted(hand) + [52] + sorted(board)))
+
+def _num_combos(index):
+    ''' The number of pairs of hole cards of a canonical hand
+    '''
+    row, column = divmod(index, 13)
+    if row == column:
+        return 6
+    return 4 if row > column else 12
+
+def _kmeans(points, k, np_random, num_iterations=50):
+    ''' Cluster points with k-means++ seeding and Lloyd iterations
+
+    Returns:
+        (numpy.array): The k centroids
+    '''
+    centroids = [points[np_random.randint(len(points))]]
+    for _ in range(1, k):
+        distances = np.min([((points - centroid) ** 2).sum(axis=1) for centroid in centroids], axis=0)
+        if distances.sum() == 0:
+            centroids.append(points[np_random.randint(len(points))])
+        else:
+            centroids.append(points[np_random.choice(len(points), p=distances / distances.sum())])
+    centroids = np.array(centroids, dtype=np.float64)
+    for _ in range(num_iterations):
+        labels = np.argmin(((points[:, np.newaxis, :] - centroids[np.newaxis]) ** 2).sum(axis=2), axis=1)
+        updated = np.array([points[labels == i].mean(axis=0) if np.any(labels == i) else centroids[i]
+                            for i in range(k)])
+        if np.allclose(updated, centroids):
+            break
+        centroids = updated
+    return centroids
@@ -0,0 +1,177 @@
+''' The equity of a hold'em hand against random hands of the opponents.
+
+The unknown cards, i.e., the rest of the board and the hole cards of the
+opponents, are enumerated when there are at most `max_exact` deals of them,
+e.g., on the turn or the river heads-up, and sampled otherwise. The showdowns
+are evaluated together with evaluator.evaluate_batch.
+
+The cards can be card ids, strings such as 'SA' or 'HT', as in the raw
+observations of limit-holdem and no-limit-holdem, or Card objects:
+
+    from rlcard.games.limitholdem.equity import equity
+
+    raw_obs = state['raw_obs']
+    result = equity(raw_obs['hand'], raw_obs['public_cards'], num_opponents=1)
+    if result.win + result.tie / 2 > 0.6:
+        ...
+'''
+import itertools
+import math
+from collections import namedtuple
+
+import numpy as np
+
+from rlcard.games.limitholdem.evaluator import card_id, evaluate_batch
+
+# The number of deals evaluated together
+CHUNK_SIZE = 1 << 16
+
+Equity = namedtuple('Equity', ['win', 'tie', 'loss', 'share'])
+Equity.__doc__ = ''' The probabilities that the hand wins, ties and loses the
+showdown, and the expected share of the pot, where a tie with k other players
+is worth 1 / (k + 1)
+'''
+
+def to_card_ids(cards):
+    ''' Get the ids of cards
+
+    Args:
+        cards (list): Card ids, strings such as 'SA', or Card objects
+
+    Returns:
+        (list): The card ids, see evaluator.py
+    '''
+    card_ids = []
+    for card in cards:
+        if isinstance(card, str):
+            card = card_id(card)
+        elif hasattr(card, 'get_index'):
+            card = card_id(card.get_index())
+        card_ids.append(int(card))
+    return card_ids
+
+def num_deals(num_unknown, num_board, num_opponents):
+    ''' Count the deals of the unknown cards
+
+    Args:
+        num_unknown (int): The number of cards that can be dealt
+        num_board (int): The number of board cards to deal
+        num_opponents (int): The number of opponents, with two hole cards each
+
+    Returns:
+        (int): The number of deals, with the opponents in order
+    '''
+    count = _comb(num_unknown, num_board)
+    for i in range(num_opponents):
+        count *= _comb(num_unknown - num_board - 2 * i, 2)
+    return count
+
+def equity(hand, board=(), num_opponents=1, num_samples=10000, max_exact=200000, dead_cards=(),
+           num_workers=0, start_method=None, np_random=None):
+    ''' Compute the equity of a hand against random hands
+
+    Args:
+        hand (list): The two hole cards
+        board (list): The known board cards, 0 to 5 of them
+        num_opponents (int): The number of opponents
+        num_samples (int): The number of sampled deals, when they are not enumerated
+        max_exact (int): The maximum number of deals to enumerate them all
+        dead_cards (list): Other cards that cannot be dealt, e.g., the folded cards
+        num_workers (int): The number of worker processes, 0 to evaluate in this process
+        start_method (string): The multiprocessing start method of the workers, None for the default
+        np_random (numpy.random.RandomState): The random state of the sampling
+
+    Returns:
+        (Equity): The win, tie and loss probabilities and the share of the pot
+    '''
+    hand, board, dead_cards = to_card_ids(hand), to_card_ids(board), to_card_ids(dead_cards)
+    known = hand + board + dead_cards
+    if len(hand) != 2 or len(board) > 5 or num_opponents < 1:
+        raise ValueError('The equity needs two hole cards, at most five board cards and at least one opponent')
+    if len(set(known)) != len(known):
+        raise ValueError('The cards {} are not distinct'.format(known))
+    unknown = np.array([card for card in range(52) if card not in known], dtype=np.int64)
+    num_board = 5 - len(board)
+    if num_board + 2 * num_opponents > len(unknown):
+        raise ValueError('There are not enough cards for {} opponents'.format(num_opponents))
+
+    deals = num_deals(len(unknown), num_board, num_opponents)
+    if deals <= max_exact:
+        # Each task enumerates the opponent hands for a part of the boards
+        boards = np.array(list(itertools.combinations(unknown, num_board)), dtype=np.int64)
+        boards = boards.reshape(_comb(len(unknown), num_board), num_board)
+        num_chunks = min(len(boards), max(1, num_workers, -(-deals // CHUNK_SIZE)))
+        tasks = [('exact', chunk) for chunk in np.array_split(boards, num_chunks)]
+    else:
+        if np_random is None:
+            np_random = np.random.RandomState()
+        sizes = [len(chunk) for chunk in np.array_split(np.arange(num_samples), max(1, num_workers))]
+        tasks = [('sample', (size, np_random.randint(2**31))) for size in sizes]
+    args = [(hand, board, unknown, num_opponents, kind, task) for kind, task in tasks]
+
+    if num_workers > 0:
+        import multiprocessing as mp
+        with mp.get_context(start_method).Pool(min(num_workers, len(args))) as pool:
+            counts = pool.starmap(_count_outcomes, args)
+    else:
+        counts = [_count_outcomes(*arg) for arg in args]
+    counts = np.sum(counts, axis=0)
+    return Equity(*(counts[1:] / counts[0]).tolist())
+
+def _comb(n, k):
+    if not 0 <= k <= n:
+        return 0
+    return math.factorial(n) // (math.factorial(k) * math.factorial(n - k))
+
+def _deal_opponents(rows, unknown, num_opponents):
+    ''' Append every pair of hole cards of each opponent to the rows of dealt cards
+    '''
+    pairs = np.array(list(itertools.combinations(unknown, 2)), dtype=np.int64)
+    for _ in range(num_opponents):
+        left = np.repeat(rows, len(pairs), axis=0)
+        right = np.tile(pairs, (len(rows), 1))
+        keep = ~(left[:, :, np.newaxis] == right[:, np.newaxis, :]).any(axis=(1, 2))
+        rows = np.concatenate([left[keep], right[keep]], axis=1)
+    return rows
+
+def _count_outcomes(hand, board, unknown, num_opponents, kind, task):
+    ''' Evaluate the showdowns of a part of the deals
+
+    Returns:
+        (numpy.array): The number of deals, wins, ties, losses and the sum of the pot shares
+    '''
+    num_board = 5 - len(board)
+    if kind == 'exact':
+        return _showdowns(hand, board, _deal_opponents(task, unknown, num_opponents), num_opponents)
+
+    size, seed = task
+    np_random = np.random.RandomState(seed)
+    num_dealt = num_board + 2 * num_opponents
+    outcomes = np.zeros(5)
+    # The deals are drawn by chunks to bound the memory, the random numbers are the same
+    for start in range(0, size, CHUNK_SIZE):
+        chunk_size = min(CHUNK_SIZE, size - start)
+        # A full sort, a partition would not deal the picked cards in a uniform order
+        picks = np.argsort(np_random.random_sample((chunk_size, len(unknown))), axis=1)[:, :num_dealt]
+        outcomes += _showdowns(hand, board, unknown[picks], num_opponents)
+    return outcomes
+
+def _showdowns(hand, board, rows, num_opponents):
+    ''' Evaluate the showdowns of some deals
+
+    Args:
+        rows (numpy.array): The missing board cards followed by the cards of each opponent, one row per deal
+
+    Returns:
+        (numpy.array): The number of deals, wins, ties, losses and the sum of the pot shares
+    '''
+    num_board = 5 - len(board)
+    boards = np.concatenate([np.tile(np.array(board, dtype=np.int64), (len(rows), 1)), rows[:, :num_board]], axis=1)
+    strength = evaluate_batch(np.concatenate([np.tile(np.array(hand, dtype=np.int64), (len(rows), 1)), boards], axis=1))
+    opponents = np.stack([evaluate_batch(np.concatenate([rows[:, num_board + 2 * i:num_board + 2 * i + 2], boards], axis=1))
+                          for i in range(num_opponents)], axis=1)
+    best = opponents.max(axis=1)
+    win = strength > best
+    tie = strength == best
+    shares = win + tie / (1 + (opponents == strength[:, np.newaxis]).sum(axis=1))
+    return np.array([len(rows), win.sum(), tie.sum(), (strength < best).sum(), shares.sum()], dtype=np.float64)
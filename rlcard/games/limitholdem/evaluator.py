@@ -0,0 +1,238 @@
+''' A table-driven evaluator of the hold'em hands.
+
+The cards are the integer ids of card2index.json, i.e.,
+suit_index * 13 + rank_index with the suits 'SHDC' and the ranks
+'A23456789TJQK'. The strength of a hand of 5 to 7 cards is a single integer,
+greater for better hands:
+
+    strength = category << 20 | the ranks of the best five cards, 4 bits each
+
+where the categories are the ones of utils.Hand, from 1 (high card) to 9
+(straight flush), and the ranks go from 0 for a deuce to 12 for an ace. The
+ranks are ordered by importance, e.g., the rank of the pair and the ranks of
+the three kickers for a pair, and only the highest card for a straight.
+
+`evaluate_batch` evaluates an (N, 7) array of card ids with the same
+tables, e.g., for equities or logged showdowns.
+
+The strengths come from two tables, built once on the first evaluation:
+
+    - the multisets of ranks, for the hands without flush, keyed by the sum
+      of 1 << (3 * rank) over the cards, i.e., the counts of the ranks
+    - the 13-bit masks of the ranks of a suit, for the flushes
+
+A flush of 5 to 7 cards never comes with a four of a kind or a full house,
+so the strength of a hand is the best of the two lookups.
+'''
+import itertools
+
+import numpy as np
+
+SUITS = 'SHDC'
+RANKS = 'A23456789TJQK'
+
+CATEGORIES = ['High_Card', 'One_Pair', 'Two_Pairs', 'Three_of_a_Kind', 'Straight',
+              'Flush', 'Full_House', 'Four_of_a_Kind', 'Straight_Flush']
+
+# The rank from 0 (deuce) to 12 (ace), the rank key and the suit of each card id
+CARD_RANKS = np.array([(card_id % 13 - 1) % 13 for card_id in range(52)])
+CARD_SUITS = np.array([card_id // 13 for card_id in range(52)])
+CARD_KEYS = np.left_shift(1, 3 * CARD_RANKS).astype(np.int64)
+CARD_BITS = np.left_shift(1, CARD_RANKS).astype(np.int64)
+
+_RANK_KEYS = CARD_KEYS.tolist()
+_RANK_BITS = CARD_BITS.tolist()
+_SUITS = CARD_SUITS.tolist()
+
+_TABLES = None
+
+class HandTables(object):
+    ''' The lookup tables of the evaluator
+
+    Attributes:
+        keys (numpy.array): The sorted rank keys of the multisets of 5 to 7 ranks
+        values (numpy.array): The strength of each multiset, without flush
+        flushes (numpy.array): The strength of each 13-bit mask of ranks, 0
+            for the masks of less than five ranks
+        ranks (dict): The keys mapped to the values, for single evaluations
+    '''
+
+    def __init__(self):
+        keys, values = [], []
+        rank_keys = [1 << (3 * rank) for rank in range(13)]
+        for num_cards in range(5, 8):
+            # The ranks in descending order
+            for ranks in itertools.combinations_with_replacement(range(12, -1, -1), num_cards):
+                keys.append(sum(rank_keys[rank] for rank in ranks))
+                values.append(_rank_strength([(rank, len(list(group))) for rank, group in itertools.groupby(ranks)]))
+        order = np.argsort(keys)
+        self.keys = np.array(keys, dtype=np.int64)[order]
+        self.values = np.array(values, dtype=np.int64)[order]
+        self.flushes = np.array([_flush_strength(mask) for mask in range(1 << 13)], dtype=np.int64)
+        self.ranks = dict(zip(self.keys.tolist(), self.values.tolist()))
+        self._flushes = self.flushes.tolist()
+
+def get_tables():
+    ''' Get the lookup tables, built on the first call
+
+    Returns:
+        (HandTables): The tables
+    '''
+    global _TABLES
+    if _TABLES is None:
+        _TABLES = HandTables()
+    return _TABLES
+
+def card_id(card):
+    ''' Get the id of a card
+
+    Args:
+        card (string): The suit and the rank of the card, e.g., 'SA' or 'HT'
+
+    Returns:
+        (int): The id of the card in card2index.json
+    '''
+    return SUITS.index(card[0]) * 13 + RANKS.index(card[1])
+
+def evaluate(card_ids):
+    ''' Evaluate a hand
+
+    Args:
+        card_ids (list): The ids of 5 to 7 cards
+
+    Returns:
+        (int): The strength of the best five cards
+    '''
+    tables = get_tables()
+    key = 0
+    masks = [0, 0, 0, 0]
+    for card in card_ids:
+        key += _RANK_KEYS[card]
+        masks[_SUITS[card]] |= _RANK_BITS[card]
+    flushes = tables._flushes
+    return max(tables.ranks[key], flushes[masks[0]], flushes[masks[1]], flushes[masks[2]], flushes[masks[3]])
+
+def evaluate_batch(card_ids, chunk_size=1 << 16):
+    ''' Evaluate many hands at once with numpy
+
+    Args:
+        card_ids (numpy.array): The card ids of the hands, of shape (N, 5 to 7)
+        chunk_size (int): The number of hands evaluated together, which bounds
+            the size of the intermediate arrays
+
+    Returns:
+        (numpy.array): The N strengths, as in `evaluate`
+    '''
+    tables = get_tables()
+    card_ids = np.asarray(card_ids)
+    if card_ids.ndim != 2 or not 5 <= card_ids.shape[1] <= 7:
+        raise ValueError('The hands must be an array of shape (N, 5 to 7), got {}'.format(card_ids.shape))
+    strengths = np.empty(len(card_ids), dtype=np.int64)
+    for start in range(0, len(card_ids), chunk_size):
+        ids = card_ids[start:start + chunk_size]
+        keys = CARD_KEYS[ids].sum(axis=1)
+        index = np.minimum(np.searchsorted(tables.keys, keys), len(tables.keys) - 1)
+        if np.any(tables.keys[index] != keys):
+            raise ValueError('The hands have more than seven cards of a rank')
+        chunk = tables.values[index]
+        suits = CARD_SUITS[ids]
+        bits = CARD_BITS[ids]
+        for suit in range(4):
+            masks = np.bitwise_or.reduce(np.where(suits == suit, bits, 0), axis=1)
+            np.maximum(chunk, tables.flushes[masks], out=chunk)
+        strengths[start:start + chunk_size] = chunk
+    return strengths
+
+def evaluate_cards(cards):
+    ''' Evaluate a hand of cards given as strings, e.g., 'SA' or 'HT'
+
+    Only the equality of the suits matters, so any letter can be a suit, as
+    long as the hand has at most four of them.
+
+    Args:
+        cards (list): The 5 to 7 cards
+
+    Returns:
+        (int): The strength of the best five cards
+    '''
+    suits = {}
+    return evaluate([suits.setdefault(card[0], len(suits)) * 13 + RANKS.index(card[1]) for card in cards])
+
+def category(strength):
+    ''' Get the category of a strength
+
+    Args:
+        strength (int or numpy.array): The strength of a hand, or the strengths of `evaluate_batch`
+
+    Returns:
+        (int or numpy.array): The category of the hand, from 1 (high card) to 9 (straight flush)
+    '''
+    return strength >> 20
+
+def category_name(strength):
+    ''' Get the name of the category of a strength, e.g., 'Full_House'
+    '''
+    return CATEGORIES[category(strength) - 1]
+
+def winners(strengths):
+    ''' Find the winners of a showdown
+
+    Args:
+        strengths (list): The strength of each player, None for the players who folded
+
+    Returns:
+        (list): 1 for the players with the best strength, 0 for the others
+    '''
+    best = max(strength for strength in strengths if strength is not None)
+    return [int(strength == best) for strength in strengths]
+
+def _strength(category, ranks):
+    strength = category
+    for rank in ranks:
+        strength = strength << 4 | rank
+    return strength << 4 * (5 - len(ranks))
+
+def _straight(mask):
+    ''' The highest rank of the best straight of a mask of ranks, None if there is no straight
+    '''
+    for high in range(12, 3, -1):
+        if (mask >> (high - 4)) & 0b11111 == 0b11111:
+            return high
+    # The wheel, A-2-3-4-5
+    if mask & 0b1000000001111 == 0b1000000001111:
+        return 3
+    return None
+
+def _rank_strength(groups):
+    ''' The strength of the best five cards of a multiset of ranks, without
+    flush, given as the count of each rank in descending order of the ranks
+    '''
+    singles = [rank for rank, _ in groups]
+    pairs = [rank for rank, count in groups if count >= 2]
+    trips = [rank for rank, count in groups if count >= 3]
+    quads = [rank for rank, count in groups if count >= 4]
+    if quads:
+        return _strength(8, [quads[0]] + [rank for rank in singles if rank != quads[0]][:1])
+    if trips and len(pairs) > 1:
+        return _strength(7, [trips[0], [rank for rank in pairs if rank != trips[0]][0]])
+    high = _straight(sum(1 << rank for rank in singles))
+    if high is not None:
+        return _strength(5, [high])
+    if trips:
+        return _strength(4, [trips[0]] + [rank for rank in singles if rank != trips[0]][:2])
+    if len(pairs) > 1:
+        return _strength(3, pairs[:2] + [rank for rank in singles if rank not in pairs[:2]][:1])
+    if pairs:
+        return _strength(2, pairs[:1] + [rank for rank in singles if rank != pairs[0]][:3])
+    return _strength(1, singles[:5])
+
+def _flush_strength(mask):
+    ''' The strength of the best five cards of a suit, 0 without flush
+    '''
+    ranks = [rank for rank in range(12, -1, -1) if mask >> rank & 1]
+    if len(ranks) < 5:
+        return 0
+    high = _straight(mask)
+    if high is not None:
+        return _strength(9, [high])
+    return _strength(6, ranks[:5])
@@ -1,4 +1,3 @@
-from copy import deepcopy, copy
 import numpy as np
 
 from rlcard.games.limitholdem import Dealer
@@ -37,7 +36,6 @@ class LimitHoldemGame:
         self.round = None
         self.round_counter = None
         self.history = None
-        self.history_raises_nums = None
 
     def configure(self, game_config):
         """Specify some game specific parameters, such as number of players"""
@@ -95,11 +93,11 @@ class LimitHoldemGame:
         # Save the history for stepping back to the last state.
         self.history = []
 
-        state = self.get_state(self.game_pointer)
-
         # Save betting history
         self.history_raise_nums = [0 for _ in range(4)]
 
+        state = self.get_state(self.game_pointer)
+
         return state, self.game_pointer
 
     def step(self, action):
@@ -116,15 +114,8 @@ class LimitHoldemGame:
                 (int): next player id
         """
         if self.allow_step_back:
-            # First snapshot the current state
-            r = deepcopy(self.round)
-            b = self.game_pointer
-            r_c = self.round_counter
-            d = deepcopy(self.dealer)
-            p = deepcopy(self.public_cards)
-            ps = deepcopy(self.players)
-            rn = copy(self.history_raise_nums)
-            self.history.append((r, b, r_c, d, p, ps, rn))
+            # First record what this action will change
+            self.history.append(self._undo_record())
 
         # Then we proceed to the next round
         self.game_pointer = self.round.proceed_round(self.players, action)
@@ -163,11 +154,103 @@ class LimitHoldemGame:
             (bool): True if the game steps back successfully
         """
         if len(self.history) > 0:
-            self.round, self.game_pointer, self.round_counter, self.dealer, self.public_cards, \
-                self.players, self.history_raises_nums = self.history.pop()
+            self._undo(self.history.pop())
             return True
         return False
 
+    def _undo_record(self):
+        """
+        Record the fields that the next action can change: the chips and the status
+        of the acting player, the round counters, the raise number of this round and
+        the number of public cards, so that the dealt cards can be put back.
+
+        Returns:
+            (tuple): The undo record that can be passed to `_undo`
+        """
+        player = self.players[self.round.game_pointer]
+        return (self.game_pointer,
+                self.round_counter,
+                self.history_raise_nums[self.round_counter],
+                len(self.public_cards),
+                player.in_chips,
+                player.status,
+                self._undo_round_record())
+
+    def _undo(self, record):
+        """
+        Reverse one action with its undo record
+
+        Args:
+            record (tuple): The undo record taken by `_undo_record` before the action
+        """
+        self.game_pointer, self.round_counter, raise_num, num_public_cards, in_chips, status, round_record = record
+        self.history_raise_nums[self.round_counter] = raise_num
+        while len(self.public_cards) > num_public_cards:
+            self.dealer.deck.append(self.public_cards.pop())
+        self._undo_round(round_record)
+        player = self.players[self.round.game_pointer]
+        player.in_chips, player.status = in_chips, status
+
+    def _undo_round_record(self):
+        r = self.round
+        # A new round replaces the raised list, so keeping the list itself is enough
+        return (r.game_pointer, r.raise_amount, r.have_raised, r.not_raise_num,
+                r.raised, r.raised[r.game_pointer], r.player_folded)
+
+    def _undo_round(self, round_record):
+        r = self.round
+        r.game_pointer, r.raise_amount, r.have_raised, r.not_raise_num, r.raised, raised, r.player_folded = round_record
+        r.raised[r.game_pointer] = raised
+
+    def snapshot(self):
+        """
+        Take a compact snapshot of the game. The cards are never mutated, so the
+        snapshot only holds tuples of references to them and small integers.
+
+        Returns:
+            (tuple): The snapshot that can be passed to `restore`
+        """
+        return (self.game_pointer,
+                self.round_counter,
+                tuple(self.history_raise_nums),
+                tuple(self.dealer.deck),
+                tuple(self.public_cards),
+                tuple(self._snapshot_player(p) for p in self.players),
+                self._snapshot_round())
+
+    def restore(self, snapshot):
+        """
+        Restore the game to a snapshot taken by `snapshot`
+
+        Args:
+            snapshot (tuple): The snapshot
+        """
+        self.game_pointer, self.round_counter, raise_nums, deck, public_cards, players, round_snapshot = snapshot
+        self.history_raise_nums = list(raise_nums)
+        self.dealer.deck = list(deck)
+        self.public_cards = list(public_cards)
+        for player, player_snapshot in zip(self.players, players):
+            self._restore_player(player, player_snapshot)
+        self._restore_round(round_snapshot)
+
+    @staticmethod
+    def _snapshot_player(player):
+        return player.in_chips, player.status, tuple(player.hand)
+
+    @staticmethod
+    def _restore_player(player, player_snapshot):
+        player.in_chips, player.status, hand = player_snapshot
+        player.hand = list(hand)
+
+    def _snapshot_round(self):
+        r = self.round
+        return r.game_pointer, r.raise_amount, r.have_raised, r.not_raise_num, tuple(r.raised), r.player_folded
+
+    def _restore_round(self, round_snapshot):
+        r = self.round
+        r.game_pointer, r.raise_amount, r.have_raised, r.not_raise_num, raised, r.player_folded = round_snapshot
+        r.raised = list(raised)
+
     def get_num_players(self):
         """
         Return the number of players in limit texas holdem
@@ -209,7 +292,7 @@ class LimitHoldemGame:
         chips = [self.players[i].in_chips for i in range(self.num_players)]
         legal_actions = self.get_legal_actions()
         state = self.players[player].get_state(self.public_cards, chips, legal_actions)
-        state['raise_nums'] = self.history_raise_nums
+        state['raise_nums'] = list(self.history_raise_nums)
 
         return state
 
@@ -1,4 +1,5 @@
-from rlcard.games.limitholdem.utils import compare_hands
+from rlcard.games.limitholdem.evaluator import card_id, evaluate
+from rlcard.games.limitholdem.evaluator import winners as find_winners
 import numpy as np
 
 
@@ -19,10 +20,13 @@ class LimitHoldemJudger:
         Returns:
             (list): Each entry of the list corresponds to one entry of the
         """
-        # Convert the hands into card indexes
-        hands = [[card.get_index() for card in hand] if hand is not None else None for hand in hands]
-
-        winners = compare_hands(hands)
+        if sum(hand is not None for hand in hands) == 1:
+            # Everyone else folded, the board may not be complete
+            winners = [int(hand is not None) for hand in hands]
+        else:
+            # Evaluate the hands from their card ids, see evaluator.py
+            winners = find_winners([evaluate([card_id(card.get_index()) for card in hand]) if hand is not None else None
+                                    for hand in hands])
 
         in_chips = [p.in_chips for p in players]
         each_win = self.split_pots_among_players(in_chips, winners)
@@ -0,0 +1,145 @@
+''' The preflop equities of the 169 canonical hold'em hands.
+
+Before the flop only the ranks of the hole cards and whether they are suited
+matter, so the 1326 pairs of hole cards fall into 169 canonical hands: 13
+pairs, 78 suited and 78 offsuit hands. The canonical hands are the cells of a
+13 x 13 grid of ranks, from 0 for a deuce to 12 for an ace:
+
+    index = high * 13 + low for the suited hands
+    index = low * 13 + high for the offsuit hands and the pairs
+
+The equities of the canonical hands against 1 to MAX_OPPONENTS random hands
+are shipped in preflop_equity.npy, an array of shape (169, MAX_OPPONENTS, 4)
+of the win, tie and loss probabilities and the share of the pot, see
+equity.Equity. It is memory-mapped on the first lookup. Regenerate it with
+
+    python -m rlcard.games.limitholdem.preflop --num-samples 400000
+'''
+import argparse
+import os
+
+import numpy as np
+
+from rlcard.games.limitholdem.equity import Equity, equity, to_card_ids
+from rlcard.games.limitholdem.evaluator import CARD_RANKS, CARD_SUITS
+
+NUM_HANDS = 169
+MAX_OPPONENTS = 5
+RANK_NAMES = '23456789TJQKA'
+PREFLOP_PATH = os.path.join(os.path.dirname(os.path.abspath(__file__)), 'preflop_equity.npy')
+
+_TABLE = None
+
+def preflop_index(hand):
+    ''' Get the index of the canonical hand of two hole cards
+
+    Args:
+        hand (list): The two hole cards, as card ids, strings or Card objects
+
+    Returns:
+        (int): The index of the canonical hand, from 0 to 168
+    '''
+    first, second = to_card_ids(hand)
+    high, low = sorted((CARD_RANKS[first], CARD_RANKS[second]), reverse=True)
+    if CARD_SUITS[first] == CARD_SUITS[second]:
+        return int(high * 13 + low)
+    return int(low * 13 + high)
+
+def preflop_name(index):
+    ''' Get the name of a canonical hand, e.g., 'AKs', 'AKo' or 'AA'
+
+    Args:
+        index (int): The index of the canonical hand
+
+    Returns:
+        (string): The name
+    '''
+    row, column = divmod(index, 13)
+    if row == column:
+        return RANK_NAMES[row] * 2
+    if row > column:
+        return RANK_NAMES[row] + RANK_NAMES[column] + 's'
+    return RANK_NAMES[column] + RANK_NAMES[row] + 'o'
+
+def preflop_hand(index):
+    ''' Get two hole cards of a canonical hand
+
+    Args:
+        index (int): The index of the canonical hand
+
+    Returns:
+        (list): The ids of two hole cards
+    '''
+    row, column = divmod(index, 13)
+    # The card id of a rank is suit * 13 + (rank + 1) % 13, see evaluator.py
+    first = (row + 1) % 13
+    second = (column + 1) % 13
+    return [first, second] if row > column else [first, 13 + second]
+
+def load_preflop_table(path=PREFLOP_PATH, mmap_mode='r'):
+    ''' Load the preflop equity table
+
+    Args:
+        path (string): The path of the table
+        mmap_mode (string): The mmap mode of numpy.load, None to read the table into memory
+
+    Returns:
+        (numpy.array): The table, of shape (169, MAX_OPPONENTS, 4)
+    '''
+    return np.load(path, mmap_mode=mmap_mode)
+
+def preflop_equity(hand, num_opponents=1):
+    ''' Look up the preflop equity of two hole cards
+
+    Args:
+        hand (list): The two hole cards, as card ids, strings or Card objects
+        num_opponents (int): The number of opponents, from 1 to MAX_OPPONENTS
+
+    Returns:
+        (Equity): The win, tie and loss probabilities and the share of the pot
+    '''
+    global _TABLE
+    if not 1 <= num_opponents <= MAX_OPPONENTS:
+        raise ValueError('The preflop table has 1 to {} opponents, got {}'.format(MAX_OPPONENTS, num_opponents))
+    if _TABLE is None:
+        _TABLE = load_preflop_table()
+    return Equity(*_TABLE[preflop_index(hand), num_opponents - 1].tolist())
+
+def build_preflop_table(path=PREFLOP_PATH, num_samples=400000, max_opponents=MAX_OPPONENTS, num_workers=0, seed=0):
+    ''' Compute the preflop equities with sampled deals and save them
+
+    Args:
+        path (string): The path of the table
+        num_samples (int): The number of sampled deals of each hand and number of opponents
+        max_opponents (int): The maximum number of opponents
+        num_workers (int): The number of worker processes of `equity`
+        seed (int): The seed of the sampling
+
+    Returns:
+        (numpy.array): The table, of shape (169, max_opponents, 4)
+    '''
+    np_random = np.random.RandomState(seed)
+    table = np.zeros((NUM_HANDS, max_opponents, 4), dtype=np.float32)
+    for index in range(NUM_HANDS):
+        for num_opponents in range(1, max_opponents + 1):
+            table[index, num_opponents - 1] = equity(preflop_hand(index), num_opponents=num_opponents,
+                                                     num_samples=num_samples, num_workers=num_workers,
+                                                     np_random=np_random)
+    np.save(path, table)
+    return table
+
+def main():
+    parser = argparse.ArgumentParser('Build the preflop equity table')
+    parser.add_argument('--path', type=str, default=PREFLOP_PATH)
+    parser.add_argument('--num-samples', type=int, default=400000)
+    parser.add_argument('--max-opponents', type=int, default=MAX_OPPONENTS)
+    parser.add_argument('--num-workers', type=int, default=0)
+    parser.add_argument('--seed', type=int, default=0)
+    args = parser.parse_args()
+
+    table = build_preflop_table(args.path, args.num_samples, args.max_opponents, args.num_workers, args.seed)
+    for index in np.argsort(-table[:, 0, 3])[:10]:
+        print('{:<5}{:>8.4f}'.format(preflop_name(index), table[index, 0, 3]))
+
+if __name__ == '__main__':
+    main()
@@ -1,6 +1,11 @@
-import numpy as np
+from rlcard.games.limitholdem.evaluator import category, evaluate_cards, winners
 
 class Hand:
+    '''
+    The category and the best five cards of seven cards, derived from their
+    strength, which evaluator.py computes with lookup tables. The showdowns
+    only need the strength, see compare_hands
+    '''
     def __init__(self, all_cards):
         self.all_cards = all_cards # two hand cards + five public cards
         self.category = 0
@@ -13,6 +18,8 @@ class Hand:
         #cards after sort
         self.product = 1
         #cards’ type indicator
+        self.strength = 0
+        #comparable strength of the hand, see evaluator.py
         self.RANK_TO_STRING = {2: "2", 3: "3", 4: "4", 5: "5", 6: "6",
                                7: "7", 8: "8", 9: "9", 10: "T", 11: "J", 12: "Q", 13: "K", 14: "A"}
         self.STRING_TO_RANK = {v:k for k, v in self.RANK_TO_STRING.items()}
@@ -37,51 +44,45 @@ class Hand:
     def evaluateHand(self):
         """
         Evaluate all the seven cards, get the best combination catagory
-        And pick the best five cards (for comparing in case 2 hands have the same Category) .
+        And pick the best five cards, from the least to the most significant.
         """
         if len(self.all_cards) != 7:
             raise Exception(
                 "There are not enough 7 cards in this hand, quit evaluation now ! ")
 
+        self.strength = evaluate_cards(self.all_cards)
+        self.category = int(category(self.strength))
         self._sort_cards()
-        self.cards_by_rank, self.product = self._getcards_by_rank(
-            self.all_cards)
-
-        if self._has_straight_flush():
-            self.category = 9
-            #Straight Flush
-        elif self._has_four():
-            self.category = 8
-            #Four of a Kind
-            self.best_five = self._get_Four_of_a_kind_cards()
-        elif self._has_fullhouse():
-            self.category = 7
-            #Full house
-            self.best_five = self._get_Fullhouse_cards()
-        elif self._has_flush():
-            self.category = 6
-            #Flush
-            i = len(self.flush_cards)
-            self.best_five = [card for card in self.flush_cards[i-5:i]]
-        elif self._has_straight(self.all_cards):
-            self.category = 5
-            #Straight
-        elif self._has_three():
-            self.category = 4
-            #Three of a Kind
-            self.best_five = self._get_Three_of_a_kind_cards()
-        elif self._has_two_pairs():
-            self.category = 3
-            #Two Pairs
-            self.best_five = self._get_Two_Pair_cards()
-        elif self._has_pair():
-            self.category = 2
-            #One Pair
-            self.best_five = self._get_One_Pair_cards()
-        elif self._has_high_card():
-            self.category = 1
-            #High Card
-            self.best_five = self._get_High_cards()
+        self.best_five = self._get_best_five()
+
+    def _get_best_five(self):
+        '''
+        Pick the best five cards from the ranks encoded in the strength
+        Returns:
+            (list): the best five cards, from the least to the most significant
+        '''
+        # The ranks of the strength, from the most significant, 0 for a deuce
+        ranks = [self.strength >> 4 * (4 - i) & 0xF for i in range(5)]
+        if self.category in (5, 9):
+            high = ranks[0]
+            groups = [(high - i, 1) for i in range(5)] if high > 3 else [(rank, 1) for rank in (3, 2, 1, 0, 12)]
+        else:
+            counts = {8: [4, 1], 7: [3, 2], 4: [3, 1, 1], 3: [2, 2, 1], 2: [2, 1, 1, 1]}.get(self.category, [1] * 5)
+            groups = list(zip(ranks, counts))
+
+        cards = self.all_cards
+        if self.category in (6, 9):
+            suits = [card[0] for card in cards]
+            flush_suit = max(set(suits), key=suits.count)
+            cards = [card for card in cards if card[0] == flush_suit]
+        best_five = []
+        for rank, count in groups:
+            best_five += [card for card in cards if self.RANK_LOOKUP.index(card[1]) == rank][:count]
+        best_five.reverse()
+        return best_five
+
+    # The helpers of the previous evaluator, which evaluateHand no longer uses.
+    # They are kept for the code that calls them directly.
 
     def _has_straight_flush(self):
         '''
@@ -406,13 +407,27 @@ class Hand:
         High_cards = self.all_cards[2:7]
         return High_cards
 
+def _mark_winners(hands, all_players, potential_winner_index):
+    '''
+    Mark the evaluated hands with the best strength as winners
+    Args:
+        hands(list): the evaluated Hand of each potential winner
+        all_players(list): all the players in this round, 0 for losing and 1 for winning or draw
+        potential_winner_index(list): the positions of the hands in all_players
+    Returns:
+        (list): all_players, updated
+    '''
+    for i, winner in enumerate(winners([hand.strength for hand in hands])):
+        if winner:
+            all_players[potential_winner_index[i]] = 1
+    return all_players
+
 def compare_ranks(position, hands, winner):
     '''
     Compare cards in same position of plays' five handcards
     Args:
         position(int): the position of a card in a sorted handcard
-        hands(list): cards of those players.
-        e.g. hands = [['CT', 'ST', 'H9', 'B9', 'C2', 'C8', 'C7'], ['CJ', 'SJ', 'H9', 'B9', 'C2', 'C8', 'C7'], ['CT', 'ST', 'H9', 'B9', 'C2', 'C8', 'C7']]
+        hands(list): the evaluated Hand of those players
         winner: array of same length than hands with 1 if the hand is among winners and 0 among losers
     Returns:
         new updated winner array
@@ -424,35 +439,17 @@ def compare_ranks(position, hands, winner):
     '''
     assert len(hands) == len(winner)
     RANKS = '23456789TJQKA'
-    cards_figure_all_players = [None]*len(hands)  #cards without suit
-    for i, hand in enumerate(hands):
-        if winner[i]:
-            cards = hands[i].get_hand_five_cards()
-            if len(cards[0]) != 1:# remove suit
-                for p in range(5):
-                    cards[p] = cards[p][1:]
-            cards_figure_all_players[i] = cards
-
-    rival_ranks = [] # ranks of rival_figures
-    for i, cards_figure in enumerate(cards_figure_all_players):
-        if winner[i]:
-            rank = cards_figure_all_players[i][position]
-            rival_ranks.append(RANKS.index(rank))
-        else:
-            rival_ranks.append(-1)  # player has already lost
-    new_winner = list(winner)
-    for i, rival_rank in enumerate(rival_ranks):
-        if rival_rank != max(rival_ranks):
-            new_winner[i] = 0
-    return new_winner
+    rival_ranks = [RANKS.index(hand.get_hand_five_cards()[position][-1]) if winner[i] else -1
+                   for i, hand in enumerate(hands)]
+    return [int(bool(winner[i]) and rank == max(rival_ranks)) for i, rank in enumerate(rival_ranks)]
 
 def determine_winner(key_index, hands, all_players, potential_winner_index):
     '''
-    Find out who wins in the situation of having players with same highest hand_catagory
+    Find out who wins in the situation of having players with same highest hand_catagory.
+    The strengths of the hands already break the ties, so key_index is not needed
     Args:
-        key_index(int): the position of a card in a sorted handcard
-        hands(list): cards of those players with same highest hand_catagory.
-        e.g. hands = [['CT', 'ST', 'H9', 'B9', 'C2', 'C8', 'C7'], ['CJ', 'SJ', 'H9', 'B9', 'C2', 'C8', 'C7'], ['CT', 'ST', 'H9', 'B9', 'C2', 'C8', 'C7']]
+        key_index(list): the positions of the cards that break the ties, unused
+        hands(list): the evaluated Hand of those players with same highest hand_catagory
         all_players(list): all the players in this round, 0 for losing and 1 for winning or draw
         potential_winner_index(list): the positions of those players with same highest hand_catagory in all_players
     Returns:
@@ -462,23 +459,13 @@ def determine_winner(key_index, hands, all_players, potential_winner_index):
         [1, 1, 0]: player1 and player0 draws
 
     '''
-    winner = [1]*len(hands)
-    i_index = 0
-    while i_index < len(key_index) and sum(winner) > 1:
-        index_break_tie = key_index[i_index]
-        winner = compare_ranks(index_break_tie, hands, winner)
-        i_index += 1
-    for i in range(len(potential_winner_index)):
-        if winner[i]:
-            all_players[potential_winner_index[i]] = 1
-    return all_players
+    return _mark_winners(hands, all_players, potential_winner_index)
 
 def determine_winner_straight(hands, all_players, potential_winner_index):
     '''
     Find out who wins in the situation of having players all having a straight or straight flush
     Args:
-        key_index(int): the position of a card in a sorted handcard
-        hands(list): cards of those players which all have a straight or straight flush
+        hands(list): the evaluated Hand of those players which all have a straight or straight flush
         all_players(list): all the players in this round, 0 for losing and 1 for winning or draw
         potential_winner_index(list): the positions of those players with same highest hand_catagory in all_players
     Returns:
@@ -487,23 +474,13 @@ def determine_winner_straight(hands, all_players, potential_winner_index):
         [1, 1, 1]: draw
         [1, 1, 0]: player1 and player0 draws
     '''
-    highest_ranks = []
-    for hand in hands:
-        highest_rank = hand.STRING_TO_RANK[hand.best_five[-1][1]]  # cards are sorted in ascending order
-        highest_ranks.append(highest_rank)
-    max_highest_rank = max(highest_ranks)
-    for i_player in range(len(highest_ranks)):
-        if highest_ranks[i_player] == max_highest_rank:
-            all_players[potential_winner_index[i_player]] = 1
-    return all_players
+    return _mark_winners(hands, all_players, potential_winner_index)
 
 def determine_winner_four_of_a_kind(hands, all_players, potential_winner_index):
     '''
     Find out who wins in the situation of having players which all have a four of a kind
     Args:
-        key_index(int): the position of a card in a sorted handcard
-        hands(list): cards of those players with a four of a kind
-        e.g. hands = [['CT', 'ST', 'H9', 'B9', 'C2', 'C8', 'C7'], ['CJ', 'SJ', 'H9', 'B9', 'C2', 'C8', 'C7'], ['CT', 'ST', 'H9', 'B9', 'C2', 'C8', 'C7']]
+        hands(list): the evaluated Hand of those players with a four of a kind
         all_players(list): all the players in this round, 0 for losing and 1 for winning or draw
         potential_winner_index(list): the positions of those players with same highest hand_catagory in all_players
     Returns:
@@ -512,67 +489,30 @@ def determine_winner_four_of_a_kind(hands, all_players, potential_winner_index):
         [1, 1, 1]: draw
         [1, 1, 0]: player1 and player0 draws
     '''
-    ranks = []
-    for hand in hands:
-        rank_1 = hand.STRING_TO_RANK[hand.best_five[-1][1]]  # rank of the four of a kind
-        rank_2 = hand.STRING_TO_RANK[hand.best_five[0][1]]  # rank of the kicker
-        ranks.append((rank_1, rank_2))
-    max_rank = max(ranks)
-    for i, rank in enumerate(ranks):
-        if rank == max_rank:
-            all_players[potential_winner_index[i]] = 1
-    return all_players
+    return _mark_winners(hands, all_players, potential_winner_index)
 
 def compare_hands(hands):
     '''
-    Compare all palyer's all seven cards
+    Compare all palyer's all seven cards with the table-driven evaluator, see evaluator.py
     Args:
-        hands(list): cards of those players with same highest hand_catagory.
+        hands(list): the seven cards of each player, None for the players who folded
         e.g. hands = [['CT', 'ST', 'H9', 'B9', 'C2', 'C8', 'C7'], ['CJ', 'SJ', 'H9', 'B9', 'C2', 'C8', 'C7'], ['CT', 'ST', 'H9', 'B9', 'C2', 'C8', 'C7']]
     Returns:
         [0, 1, 0]: player1 wins
         [1, 0, 0]: player0 wins
         [1, 1, 1]: draw
         [1, 1, 0]: player1 and player0 draws
-
-    if hands[0] == None:
-        return [0, 1]
-    elif hands[1] == None:
-        return [1, 0]
     '''
-    hand_category = [] #such as high_card, straight_flush, etc
-    all_players = [0]*len(hands) #all the players in this round, 0 for losing and 1 for winning or draw
-    if None in hands:
-        fold_players = [i for i, j in enumerate(hands) if j is None]
-        if len(fold_players) == len(all_players) - 1:
-            for _ in enumerate(hands):
-                if _[0] in fold_players:
-                    all_players[_[0]] = 0
-                else:
-                    all_players[_[0]] = 1
-            return all_players
-        else:
-            for _ in enumerate(hands):
-                if hands[_[0]] is not None:
-                    hand = Hand(hands[_[0]])
-                    hand.evaluateHand()
-                    hand_category.append(hand.category)
-                elif hands[_[0]] is None:
-                    hand_category.append(0)
-    else:
-            for i in enumerate(hands):
-                hand = Hand(hands[i[0]])
-                hand.evaluateHand()
-                hand_category.append(hand.category)
-    potential_winner_index = [i for i, j in enumerate(hand_category) if j == max(hand_category)]# potential winner are those with same max card_catagory
-
-    return final_compare(hands, potential_winner_index, all_players)
+    if sum(hand is not None for hand in hands) == 1:
+        # Everyone else folded, the board may not be complete
+        return [int(hand is not None) for hand in hands]
+    return winners([evaluate_cards(hand) if hand is not None else None for hand in hands])
 
 def final_compare(hands, potential_winner_index, all_players):
     '''
     Find out the winners from those who didn't fold
     Args:
-        hands(list): cards of those players with same highest hand_catagory.
+        hands(list): the seven cards of each player
         e.g. hands = [['CT', 'ST', 'H9', 'B9', 'C2', 'C8', 'C7'], ['CJ', 'SJ', 'H9', 'B9', 'C2', 'C8', 'C7'], ['CT', 'ST', 'H9', 'B9', 'C2', 'C8', 'C7']]
         potential_winner_index(list): index of those with same max card_catagory in all_players
         all_players(list): a list of all the player's win/lose situation, 0 for lose and 1 for win
@@ -581,34 +521,9 @@ def final_compare(hands, potential_winner_index, all_players):
         [1, 0, 0]: player0 wins
         [1, 1, 1]: draw
         [1, 1, 0]: player1 and player0 draws
-
-    if hands[0] == None:
-        return [0, 1]
-    elif hands[1] == None:
-        return [1, 0]
     '''
-    if len(potential_winner_index) == 1:
-        all_players[potential_winner_index[0]] = 1
-        return all_players
-    elif len(potential_winner_index) > 1:
-        # compare when having equal max categories
-        equal_hands = []
-        for _ in potential_winner_index:
-            hand = Hand(hands[_])
-            hand.evaluateHand()
-            equal_hands.append(hand)
-        hand = equal_hands[0]
-        if hand.category == 8:
-            return determine_winner_four_of_a_kind(equal_hands, all_players, potential_winner_index)
-        if hand.category == 7:
-            return determine_winner([2, 0], equal_hands, all_players, potential_winner_index)
-        if hand.category == 4:
-            return determine_winner([2, 1, 0], equal_hands, all_players, potential_winner_index)
-        if hand.category == 3:
-            return determine_winner([4, 2, 0], equal_hands, all_players, potential_winner_index)
-        if hand.category == 2:
-            return determine_winner([4, 2, 1, 0], equal_hands, all_players, potential_winner_index)
-        if hand.category == 1 or hand.category == 6:
-            return determine_winner([4, 3, 2, 1, 0], equal_hands, all_players, potential_winner_index)
-        if hand.category in [5, 9]:
-            return determine_winner_straight(equal_hands, all_players, potential_winner_index)
+    strengths = [evaluate_cards(hands[i]) for i in potential_winner_index]
+    for i, winner in enumerate(winners(strengths)):
+        if winner:
+            all_players[potential_winner_index[i]] = 1
+    return all_players
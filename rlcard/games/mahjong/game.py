@@ -1,5 +1,4 @@
 import numpy as np
-from copy import deepcopy
 
 from rlcard.games.mahjong import Dealer
 from rlcard.games.mahjong import Player
@@ -61,10 +60,7 @@ class MahjongGame:
         '''
         # First snapshot the current state
         if self.allow_step_back:
-            hist_dealer = deepcopy(self.dealer)
-            hist_round = deepcopy(self.round)
-            hist_players = deepcopy(self.players)
-            self.history.append((hist_dealer, hist_players, hist_round))
+            self.history.append(self.snapshot())
         self.round.proceed_round(self.players, action)
         state = self.get_state(self.round.current_player)
         self.cur_state = state
@@ -78,9 +74,41 @@ class MahjongGame:
         '''
         if not self.history:
             return False
-        self.dealer, self.players, self.round = self.history.pop()
+        self.restore(self.history.pop())
         return True
 
+    def snapshot(self):
+        ''' Take a compact snapshot of the game. The cards and the melds in the
+        piles are never mutated, so only the containers are copied.
+
+        Returns:
+            (tuple): The snapshot that can be passed to `restore`
+        '''
+        r = self.round
+        return (tuple(self.dealer.deck),
+                tuple(self.dealer.table),
+                tuple((tuple(p.hand), tuple(p.pile)) for p in self.players),
+                (r.target, r.current_player, r.last_player, r.direction, tuple(r.played_cards),
+                 r.is_over, r.player_before_act, r.prev_status, r.valid_act, r.last_cards))
+
+    def restore(self, snapshot):
+        ''' Restore the game to a snapshot taken by `snapshot`
+
+        Args:
+            snapshot (tuple): The snapshot
+        '''
+        deck, table, players, round_snapshot = snapshot
+        self.dealer.deck = list(deck)
+        self.dealer.table = list(table)
+        for player, (hand, pile) in zip(self.players, players):
+            player.hand = list(hand)
+            player.pile = list(pile)
+        r = self.round
+        (r.target, r.current_player, r.last_player, r.direction, played_cards,
+         r.is_over, r.player_before_act, r.prev_status, r.valid_act, r.last_cards) = round_snapshot
+        r.played_cards = list(played_cards)
+        self.cur_state = self.get_state(r.current_player)
+
     def get_state(self, player_id):
         ''' Return player's state
 
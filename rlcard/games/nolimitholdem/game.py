@@ -1,7 +1,6 @@
 from enum import Enum
 
 import numpy as np
-from copy import deepcopy
 from rlcard.games.limitholdem import Game
 from rlcard.games.limitholdem import PlayerStatus
 
@@ -133,14 +132,8 @@ class NolimitholdemGame(Game):
             raise Exception('Action not allowed')
 
         if self.allow_step_back:
-            # First snapshot the current state
-            r = deepcopy(self.round)
-            b = self.game_pointer
-            r_c = self.round_counter
-            d = deepcopy(self.dealer)
-            p = deepcopy(self.public_cards)
-            ps = deepcopy(self.players)
-            self.history.append((r, b, r_c, d, p, ps))
+            # First record what this action will change
+            self.history.append(self._undo_record())
 
         # Then we proceed to the next round
         self.game_pointer = self.round.proceed_round(self.players, action)
@@ -216,11 +209,96 @@ class NolimitholdemGame(Game):
             (bool): True if the game steps back successfully
         """
         if len(self.history) > 0:
-            self.round, self.game_pointer, self.round_counter, self.dealer, self.public_cards, self.players = self.history.pop()
-            self.stage = Stage(self.round_counter)
+            self._undo(self.history.pop())
             return True
         return False
 
+    def _undo_record(self):
+        """
+        Record the fields that the next action can change: the chips and the status
+        of the acting player, the round counters, the stage and the number of public
+        cards, so that the dealt cards can be put back.
+
+        Returns:
+            (tuple): The undo record that can be passed to `_undo`
+        """
+        r = self.round
+        player = self.players[r.game_pointer]
+        return (self.game_pointer,
+                self.round_counter,
+                self.stage,
+                len(self.public_cards),
+                self.dealer.pot,
+                player.in_chips,
+                player.remained_chips,
+                player.status,
+                (r.game_pointer, r.not_raise_num, r.not_playing_num, r.raised, r.raised[r.game_pointer]))
+
+    def _undo(self, record):
+        """
+        Reverse one action with its undo record
+
+        Args:
+            record (tuple): The undo record taken by `_undo_record` before the action
+        """
+        (self.game_pointer, self.round_counter, self.stage, num_public_cards, self.dealer.pot,
+         in_chips, remained_chips, status, round_record) = record
+        while len(self.public_cards) > num_public_cards:
+            self.dealer.deck.append(self.public_cards.pop())
+        r = self.round
+        r.game_pointer, r.not_raise_num, r.not_playing_num, r.raised, raised = round_record
+        r.raised[r.game_pointer] = raised
+        player = self.players[r.game_pointer]
+        player.in_chips, player.remained_chips, player.status = in_chips, remained_chips, status
+
+    def snapshot(self):
+        """
+        Take a compact snapshot of the game
+
+        Returns:
+            (tuple): The snapshot that can be passed to `restore`
+        """
+        return (self.game_pointer,
+                self.round_counter,
+                self.stage,
+                tuple(self.dealer.deck),
+                self.dealer.pot,
+                tuple(self.public_cards),
+                tuple(self._snapshot_player(p) for p in self.players),
+                self._snapshot_round())
+
+    def restore(self, snapshot):
+        """
+        Restore the game to a snapshot taken by `snapshot`
+
+        Args:
+            snapshot (tuple): The snapshot
+        """
+        self.game_pointer, self.round_counter, self.stage, deck, self.dealer.pot, public_cards, players, round_snapshot = snapshot
+        self.dealer.deck = list(deck)
+        self.public_cards = list(public_cards)
+        for player, player_snapshot in zip(self.players, players):
+            self._restore_player(player, player_snapshot)
+        self._restore_round(round_snapshot)
+
+    @staticmethod
+    def _snapshot_player(player):
+        return player.in_chips, player.remained_chips, player.status, tuple(player.hand)
+
+    @staticmethod
+    def _restore_player(player, player_snapshot):
+        player.in_chips, player.remained_chips, player.status, hand = player_snapshot
+        player.hand = list(hand)
+
+    def _snapshot_round(self):
+        r = self.round
+        return r.game_pointer, r.not_raise_num, r.not_playing_num, tuple(r.raised)
+
+    def _restore_round(self, round_snapshot):
+        r = self.round
+        r.game_pointer, r.not_raise_num, r.not_playing_num, raised = round_snapshot
+        r.raised = list(raised)
+
     def get_num_players(self):
         """
         Return the number of players in no limit texas holdem
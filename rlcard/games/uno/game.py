@@ -1,4 +1,3 @@
-from copy import deepcopy
 import numpy as np
 
 from rlcard.games.uno import Dealer
@@ -34,6 +33,9 @@ class UnoGame:
         # Initialize a dealer that can deal cards
         self.dealer = Dealer(self.np_random)
 
+        # The wild cards change their color when played, keep them for the snapshots
+        self._wild_cards = [card for card in self.dealer.deck if card.type == 'wild']
+
         # Initialize four players to play the game
         self.players = [Player(i, self.np_random) for i in range(self.num_players)]
 
@@ -70,10 +72,7 @@ class UnoGame:
 
         if self.allow_step_back:
             # First snapshot the current state
-            his_dealer = deepcopy(self.dealer)
-            his_round = deepcopy(self.round)
-            his_players = deepcopy(self.players)
-            self.history.append((his_dealer, his_players, his_round))
+            self.history.append(self.snapshot())
 
         self.round.proceed_round(self.players, action)
         player_id = self.round.current_player
@@ -88,9 +87,40 @@ class UnoGame:
         '''
         if not self.history:
             return False
-        self.dealer, self.players, self.round = self.history.pop()
+        self.restore(self.history.pop())
         return True
 
+    def snapshot(self):
+        ''' Take a compact snapshot of the game. Only the colors of the wild
+        cards are copied, the other cards are never mutated.
+
+        Returns:
+            (tuple): The snapshot that can be passed to `restore`
+        '''
+        r = self.round
+        return (tuple(self.dealer.deck),
+                tuple(tuple(p.hand) for p in self.players),
+                (r.target, r.current_player, r.direction, tuple(r.played_cards), r.is_over, r.winner),
+                tuple(card.color for card in self._wild_cards),
+                tuple(self.payoffs))
+
+    def restore(self, snapshot):
+        ''' Restore the game to a snapshot taken by `snapshot`
+
+        Args:
+            snapshot (tuple): The snapshot
+        '''
+        deck, hands, round_snapshot, wild_colors, payoffs = snapshot
+        self.dealer.deck = list(deck)
+        for player, hand in zip(self.players, hands):
+            player.hand = list(hand)
+        r = self.round
+        r.target, r.current_player, r.direction, played_cards, r.is_over, r.winner = round_snapshot
+        r.played_cards = list(played_cards)
+        for card, color in zip(self._wild_cards, wild_colors):
+            card.color = color
+        self.payoffs = list(payoffs)
+
     def get_state(self, player_id):
         ''' Return player's state
 
@@ -1,4 +1,6 @@
 from rlcard.utils.logger import Logger
 from rlcard.utils import seeding
 from rlcard.utils.utils import *
+from rlcard.utils.trajectory_buffer import TrajectoryBuffer
+from rlcard.utils.profiler import Profiler
 from rlcard.utils.pettingzoo_utils import *
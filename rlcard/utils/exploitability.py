@@ -0,0 +1,289 @@
+''' Exact best response and exploitability on a public tree.
+
+The best response of a player walks the public tree once and computes the
+values of all its private cards together, from the reach probabilities of the
+private cards of the opponent. The policies can be tables of action weights,
+e.g., the average policy of a CFRAgent, agents, models, or functions from a
+state to its action probabilities.
+
+The evaluation only relies on the nodes of the tree, so a public tree of an
+abstracted game, with buckets as private states, can be evaluated as well,
+with a `key` that maps the states to the keys of the abstracted policy.
+'''
+from collections.abc import Mapping
+
+import numpy as np
+
+from rlcard.agents.infoset_table import InfosetTable
+
+def obs_key(state):
+    ''' The default infoset key, the bytes of the observation, as in CFRAgent
+    '''
+    return state['obs'].tobytes()
+
+class TabularPolicy(object):
+    ''' A policy from a table of action weights, e.g., the average_policy of a
+    CFRAgent. The weights are normalized over the legal actions as in
+    CFRAgent.eval_step, and the unknown states play uniformly
+    '''
+
+    def __init__(self, table, key=obs_key):
+        ''' Wrap a table
+
+        Args:
+            table (dict): A mapping from the infoset keys to arrays of action weights
+            key (function): A function from a state to its infoset key
+        '''
+        self.table = table
+        self.key = key
+
+    def __call__(self, state):
+        return self.matrix([state])[0]
+
+    def matrix(self, states):
+        ''' Evaluate the policy on several states at once
+
+        Args:
+            states (list): The states
+
+        Returns:
+            (numpy.array): The action probabilities, one row per state
+        '''
+        legal_masks = np.array([state['legal_mask'] for state in states])
+        weights = np.zeros(legal_masks.shape)
+        keys = [self.key(state) for state in states]
+        if isinstance(self.table, InfosetTable):
+            ids = np.array([self.table.indexer.get(key, -1) for key in keys], dtype=np.int64)
+            known = ids >= 0
+            known[known] = [self.table.has(info_id) for info_id in ids[known]]
+            weights[known] = self.table.values[ids[known]]
+        else:
+            for i, key in enumerate(keys):
+                row = self.table.get(key)
+                if row is not None:
+                    weights[i] = row
+        weights[~legal_masks] = 0
+        totals = weights.sum(axis=1, keepdims=True)
+        uniform = legal_masks / legal_masks.sum(axis=1, keepdims=True)
+        return np.where(totals > 0, weights / np.where(totals > 0, totals, 1.0), uniform)
+
+def tabular_policy(table, key=obs_key):
+    ''' Make a policy from a table of action weights, see TabularPolicy
+
+    Args:
+        table (dict): A mapping from the infoset keys to arrays of action weights
+        key (function): A function from a state to its infoset key
+
+    Returns:
+        (TabularPolicy): The policy
+    '''
+    return TabularPolicy(table, key)
+
+def agent_policy(agent):
+    ''' Make a policy from an agent. The CFR agents are evaluated with their
+    average policy, the agents that report 'probs' in eval_step with them, and
+    the other agents, e.g., DQNAgent or the rule agents, as the greedy policy
+    of the action of eval_step
+
+    Args:
+        agent (object): The agent
+
+    Returns:
+        (function): A function from a state to its action probabilities
+    '''
+    if hasattr(agent, 'average_policy'):
+        return TabularPolicy(agent.average_policy, getattr(agent, 'state_key', obs_key))
+
+    def action_probs(state):
+        action, info = agent.eval_step(state)
+        probs = np.zeros(len(state['legal_mask']))
+        if isinstance(info, dict) and 'probs' in info:
+            for action, raw_action in zip(state['legal_actions'], state['raw_legal_actions']):
+                probs[action] = info['probs'][raw_action]
+            return probs / probs.sum()
+        if getattr(agent, 'use_raw', False):
+            action = list(state['legal_actions'])[state['raw_legal_actions'].index(action)]
+        probs[action] = 1.0
+        return probs
+    return action_probs
+
+def as_policies(policy, num_players):
+    ''' Get the policy of each player
+
+    Args:
+        policy (object): A policy function, a table of action weights, an agent,
+            a Model, or a list with one of them per player
+        num_players (int): The number of players
+
+    Returns:
+        (list): One policy function per player
+    '''
+    if hasattr(policy, 'agents'):
+        policy = policy.agents
+    if isinstance(policy, (list, tuple)):
+        return [as_policies(p, 1)[0] for p in policy]
+    if isinstance(policy, Mapping):
+        policy = TabularPolicy(policy)
+    elif hasattr(policy, 'eval_step'):
+        policy = agent_policy(policy)
+    return [policy for _ in range(num_players)]
+
+def policy_matrices(tree, policy):
+    ''' Evaluate the policies at every decision node of a public tree
+
+    Args:
+        tree (PublicTree): The public tree
+        policy (object): The policies, see `as_policies`
+
+    Returns:
+        (list): For each decision node, an array of shape (num_cards,
+            num_actions of the node) with the probabilities of the actions for
+            each private card of the acting player
+    '''
+    policies = as_policies(policy, tree.num_players)
+    matrices = [None for _ in tree.decision_nodes]
+    for player_id, player_policy in enumerate(policies):
+        nodes = [node for node in tree.decision_nodes if node.player == player_id]
+        states = [state for node in nodes for state in node.states]
+        if isinstance(player_policy, TabularPolicy):
+            probs = player_policy.matrix(states)
+        else:
+            probs = np.array([player_policy(state) for state in states])
+        num_cards = len(tree.cards)
+        for i, node in enumerate(nodes):
+            matrices[node.index] = probs[i * num_cards:(i + 1) * num_cards, node.actions]
+    return matrices
+
+def best_response(tree, policy, player_id):
+    ''' Compute a best response against the policy of the other player
+
+    Args:
+        tree (PublicTree): The public tree
+        policy (object): The policies, see `as_policies`, or the precomputed `policy_matrices`
+        player_id (int): The player who best responds
+
+    Returns:
+        (tuple) that contains:
+            value (float): The expected payoff of the best response
+            actions (dict): For each decision node of the player, keyed by its
+                index, the best action id of each private card
+    '''
+    matrices = _as_matrices(tree, policy)
+    actions = {}
+    num_cards = len(tree.cards)
+    value = sum(float(np.sum(_best_response(root, matrices, player_id, np.ones(num_cards), actions)))
+                for root in tree.roots)
+    return value, actions
+
+def best_response_value(tree, policy, player_id):
+    ''' Compute the value of a best response against the policy of the other player
+
+    Args:
+        tree (PublicTree): The public tree
+        policy (object): The policies, see `as_policies`, or the precomputed `policy_matrices`
+        player_id (int): The player who best responds
+
+    Returns:
+        (float): The expected payoff of the best response
+    '''
+    return best_response(tree, policy, player_id)[0]
+
+def policy_values(tree, policy):
+    ''' Compute the expected payoffs of the players when everyone plays the policies
+
+    Args:
+        tree (PublicTree): The public tree
+        policy (object): The policies, see `as_policies`, or the precomputed `policy_matrices`
+
+    Returns:
+        (numpy.array): The expected payoff of each player
+    '''
+    matrices = _as_matrices(tree, policy)
+    num_cards = len(tree.cards)
+    reaches = [np.ones(num_cards) for _ in range(tree.num_players)]
+    return sum(_policy_values(root, matrices, reaches) for root in tree.roots)
+
+def nash_conv(tree, policy):
+    ''' Compute the sum over the players of the gains of their best responses
+
+    Args:
+        tree (PublicTree): The public tree
+        policy (object): The policies, see `as_policies`
+
+    Returns:
+        (float): The NashConv in the units of env.get_payoffs
+    '''
+    matrices = policy_matrices(tree, policy)
+    best_response_values = [best_response_value(tree, matrices, player_id) for player_id in range(tree.num_players)]
+    return sum(best_response_values) - float(np.sum(policy_values(tree, matrices)))
+
+def exploitability(tree, policy):
+    ''' Compute the exploitability of the policies, i.e., the average gain of
+    the best responses. It is zero at a Nash equilibrium
+
+    Args:
+        tree (PublicTree): The public tree
+        policy (object): The policies, see `as_policies`
+
+    Returns:
+        (float): The exploitability in the units of env.get_payoffs
+    '''
+    return nash_conv(tree, policy) / tree.num_players
+
+def _as_matrices(tree, policy):
+    if isinstance(policy, list) and len(policy) == len(tree.decision_nodes) and \
+            all(isinstance(matrix, np.ndarray) for matrix in policy):
+        return policy
+    return policy_matrices(tree, policy)
+
+def _best_response(node, matrices, player_id, opponent_reach, actions):
+    ''' The values of the private cards of the best responder in a subtree
+
+    Args:
+        node (PublicNode): The root of the subtree
+        matrices (list): The policy matrices
+        player_id (int): The best responder
+        opponent_reach (numpy.array): The reach probabilities of the private cards of the opponent
+        actions (dict): The best actions, filled in the traversal
+
+    Returns:
+        (numpy.array): The values, weighted by the reach of the opponent and the chance events
+    '''
+    if node.is_terminal:
+        utilities = node.utilities[player_id]
+        if player_id == 0:
+            return utilities.dot(opponent_reach)
+        return opponent_reach.dot(utilities)
+    if node.is_chance:
+        return sum(_best_response(child, matrices, player_id, opponent_reach, actions) for child in node.children)
+    if node.player == player_id:
+        values = np.array([_best_response(child, matrices, player_id, opponent_reach, actions) for child in node.children])
+        best = np.argmax(values, axis=0)
+        actions[node.index] = np.array(node.actions)[best]
+        return values[best, np.arange(values.shape[1])]
+    probs = matrices[node.index]
+    return sum(_best_response(child, matrices, player_id, opponent_reach * probs[:, i], actions)
+               for i, child in enumerate(node.children))
+
+def _policy_values(node, matrices, reaches):
+    ''' The expected payoffs of the players in a subtree when everyone plays the policies
+
+    Args:
+        node (PublicNode): The root of the subtree
+        matrices (list): The policy matrices
+        reaches (list): The reach probabilities of the private cards of each player
+
+    Returns:
+        (numpy.array): The payoffs, weighted by the reach probabilities and the chance events
+    '''
+    if node.is_terminal:
+        return node.utilities.dot(reaches[1]).dot(reaches[0])
+    if node.is_chance:
+        return sum(_policy_values(child, matrices, reaches) for child in node.children)
+    probs = matrices[node.index]
+    values = 0
+    for i, child in enumerate(node.children):
+        child_reaches = list(reaches)
+        child_reaches[node.player] = reaches[node.player] * probs[:, i]
+        values = values + _policy_values(child, matrices, child_reaches)
+    return values
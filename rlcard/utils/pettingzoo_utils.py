@@ -14,6 +14,7 @@ def wrap_state(state):
     wrapped_state["legal_actions"] = {l: None for l in legal_actions}
     # raw_legal_actions isn't available so setting it to legal actions
     wrapped_state["raw_legal_actions"] = list(wrapped_state["legal_actions"].keys())
+    wrapped_state["legal_mask"] = np.asarray(state["action_mask"], dtype=np.bool_)
     return wrapped_state
 
 
@@ -0,0 +1,97 @@
+''' Timing of the phases of an environment step
+'''
+import json
+import time
+from functools import wraps
+
+class Profiler(object):
+    ''' Accumulate the time spent in named phases.
+
+    For each phase, the profiler keeps the number of calls, the total seconds
+    and a histogram of the call durations with power-of-two buckets in
+    microseconds, i.e., bucket k counts the calls that took less than 2^k
+    microseconds and at least 2^(k-1) microseconds.
+    '''
+
+    def __init__(self):
+        self.counts = {}
+        self.totals = {}
+        self.histograms = {}
+
+    def record(self, name, seconds):
+        ''' Record one call of a phase
+
+        Args:
+            name (string): The name of the phase
+            seconds (float): The duration of the call
+        '''
+        if name not in self.counts:
+            self.counts[name] = 0
+            self.totals[name] = 0.0
+            self.histograms[name] = []
+        self.counts[name] += 1
+        self.totals[name] += seconds
+        bucket = int(seconds * 1e6).bit_length()
+        histogram = self.histograms[name]
+        if bucket >= len(histogram):
+            histogram.extend([0] * (bucket + 1 - len(histogram)))
+        histogram[bucket] += 1
+
+    def wrap(self, name, func):
+        ''' Wrap a function so that its calls are recorded
+
+        Args:
+            name (string): The name of the phase
+            func (function): The function to time
+
+        Returns:
+            (function): The timed function
+        '''
+        perf_counter = time.perf_counter
+        record = self.record
+
+        @wraps(func)
+        def timed(*args, **kwargs):
+            start = perf_counter()
+            try:
+                return func(*args, **kwargs)
+            finally:
+                record(name, perf_counter() - start)
+        return timed
+
+    def summary(self):
+        ''' Summarize the phases
+
+        Returns:
+            (dict): For each phase, a dictionary with the 'count', the 'total' and
+                the 'mean' seconds, and the 'histogram' that maps the upper bound of
+                each non-empty bucket in microseconds to its number of calls
+        '''
+        return {name: {
+                    'count': self.counts[name],
+                    'total': self.totals[name],
+                    'mean': self.totals[name] / self.counts[name],
+                    'histogram': {str(2 ** k): n for k, n in enumerate(self.histograms[name]) if n > 0},
+                } for name in self.counts}
+
+    def dump(self, path):
+        ''' Write the summary to a JSON file
+
+        Args:
+            path (string): The path of the JSON file
+        '''
+        with open(path, 'w') as f:
+            json.dump(self.summary(), f, indent=2)
+
+    def reset(self):
+        ''' Drop all the records
+        '''
+        self.counts = {}
+        self.totals = {}
+        self.histograms = {}
+
+    def __str__(self):
+        lines = ['{:<24}{:>10}{:>14}{:>14}'.format('phase', 'count', 'total (s)', 'mean (us)')]
+        for name, stats in sorted(self.summary().items(), key=lambda item: -item[1]['total']):
+            lines.append('{:<24}{:>10}{:>14.4f}{:>14.2f}'.format(name, stats['count'], stats['total'], stats['mean'] * 1e6))
+        return '\n'.join(lines)
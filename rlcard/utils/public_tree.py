@@ -0,0 +1,150 @@
+''' The public game tree of a two-player poker game with one private card
+per player and one public card, such as Leduc Hold'em
+'''
+import numpy as np
+
+class PublicNode(object):
+    ''' A node of the public tree. The private cards are not part of the node,
+    the values that depend on them are arrays over the private cards.
+
+    A decision node has the acting `player`, its legal `actions` (action ids),
+    one child per action, the `states` of the acting player, one per private
+    card, and its `index` in tree.decision_nodes. A chance node deals the
+    public card and has one child per card. A terminal node has the `utilities`, an array of shape
+    (num_players, num_cards, num_cards) where utilities[p, i, j] is the
+    payoff of player p when player 0 holds card i and player 1 holds card j,
+    multiplied by the probability of the chance events that lead to the node.
+    '''
+
+    def __init__(self, kind, player=None):
+        self.kind = kind
+        self.player = player
+        self.actions = []
+        self.children = []
+        self.states = None
+        self.utilities = None
+        self.index = None
+
+    @property
+    def is_terminal(self):
+        return self.kind == 'terminal'
+
+    @property
+    def is_chance(self):
+        return self.kind == 'chance'
+
+class PublicTree(object):
+    ''' The public tree of an environment, built with the rules of its game.
+
+    The roots are the possible first players, which the game chooses at
+    random. The tree is built once by playing every action sequence with
+    `step` and `step_back` and by dealing every card to the players and to the
+    board, so the environment must allow stepping back. The environment is
+    reset afterwards.
+    '''
+
+    def __init__(self, env):
+        ''' Build the public tree
+
+        Args:
+            env (Env): A two-player environment with step_back allowed, e.g., leduc-holdem
+        '''
+        if env.num_players != 2:
+            raise ValueError('The public tree only supports two players.')
+        if not env.allow_step_back:
+            raise ValueError('The public tree needs an environment with allow_step_back.')
+        self.env = env
+        self.num_players = env.num_players
+        self.num_actions = env.num_actions
+
+        env.reset()
+        game = env.game
+        self.cards = sorted(game.dealer.deck + [player.hand for player in game.players], key=lambda card: card.get_index())
+        num_cards = len(self.cards)
+        # The probability of each deal of the private cards
+        deals = 1.0 - np.eye(num_cards)
+        self._deal_weights = deals / deals.sum()
+
+        # The decision nodes in depth-first order
+        self.num_nodes = 0
+        self.decision_nodes = []
+        first_players = []
+        self.roots = []
+        while len(first_players) < self.num_players:
+            _, player_id = env.reset()
+            if player_id not in first_players:
+                first_players.append(player_id)
+                self.roots.append(self._build(1.0 / self.num_players, None))
+        env.reset()
+
+    def _build(self, weight, public_card):
+        ''' Build the subtree of the current state of the environment
+
+        Args:
+            weight (float): The probability of the first player and of the public card
+            public_card (int): The index of the public card, None before it is dealt
+
+        Returns:
+            (PublicNode): The root of the subtree
+        '''
+        env, game = self.env, self.env.game
+        self.num_nodes += 1
+        if env.is_over():
+            return self._terminal(weight, public_card)
+
+        player_id = env.get_player_id()
+        node = PublicNode('decision', player_id)
+        node.index = len(self.decision_nodes)
+        self.decision_nodes.append(node)
+        player = game.players[player_id]
+        hand = player.hand
+        node.states = []
+        for card in self.cards:
+            player.hand = card
+            state = env.get_state(player_id)
+            # The action record of the environment keeps changing
+            state['action_record'] = list(state['action_record'])
+            node.states.append(state)
+        player.hand = hand
+        node.actions = list(node.states[0]['legal_actions'])
+
+        for action in node.actions:
+            env.step(action)
+            if public_card is None and game.public_card is not None and not env.is_over():
+                child = PublicNode('chance')
+                self.num_nodes += 1
+                dealt = game.public_card
+                for card_index, card in enumerate(self.cards):
+                    game.public_card = card
+                    child.children.append(self._build(weight / (len(self.cards) - 2), card_index))
+                game.public_card = dealt
+            else:
+                child = self._build(weight, public_card)
+            env.step_back()
+            node.children.append(child)
+        return node
+
+    def _terminal(self, weight, public_card):
+        ''' Compute the utilities of a terminal state for every deal of the private cards
+        '''
+        game = self.env.game
+        num_cards = len(self.cards)
+        node = PublicNode('terminal')
+        node.utilities = np.zeros((self.num_players, num_cards, num_cards))
+        hands = [player.hand for player in game.players]
+        for i in range(num_cards):
+            for j in range(num_cards):
+                if i == j or public_card in (i, j):
+                    continue
+                game.players[0].hand, game.players[1].hand = self.cards[i], self.cards[j]
+                node.utilities[:, i, j] = game.get_payoffs()
+        for player, hand in zip(game.players, hands):
+            player.hand = hand
+
+        weights = weight * self._deal_weights
+        if public_card is not None:
+            weights = weights.copy()
+            weights[public_card, :] = 0
+            weights[:, public_card] = 0
+        node.utilities *= weights
+        return node
@@ -0,0 +1,115 @@
+''' Preallocated numpy buffers for the transitions generated by Env.run
+'''
+import numpy as np
+
+from rlcard.utils.utils import get_legal_mask
+
+class TrajectoryBuffer(object):
+    ''' Store the transitions of every player in preallocated numpy arrays.
+
+    For each player, the transitions are the rows [0, size) of the arrays
+    obs, action, reward, next_obs, legal_mask, next_legal_mask and done, where
+    legal_mask is the boolean legal action mask of obs and next_legal_mask is
+    the one of next_obs. This is the same data as the output of `reorganize`.
+    The arrays grow by doubling when they are full.
+    '''
+
+    def __init__(self, num_players, state_shape, num_actions, capacity=1024):
+        ''' Allocate the buffers
+
+        Args:
+            num_players (int): The number of players
+            state_shape (list): The shape of the observation of each player, e.g., env.state_shape
+            num_actions (int): The number of actions
+            capacity (int): The initial number of transitions of each player
+        '''
+        self.num_players = num_players
+        self.state_shape = [list(shape) for shape in state_shape]
+        self.num_actions = num_actions
+        self.capacity = [capacity for _ in range(num_players)]
+        self.size = [0 for _ in range(num_players)]
+
+        self.obs = [np.zeros((capacity, *self.state_shape[p]), dtype=np.float32) for p in range(num_players)]
+        self.next_obs = [np.zeros((capacity, *self.state_shape[p]), dtype=np.float32) for p in range(num_players)]
+        self.action = [np.zeros(capacity, dtype=np.int64) for _ in range(num_players)]
+        self.reward = [np.zeros(capacity, dtype=np.float32) for _ in range(num_players)]
+        self.legal_mask = [np.zeros((capacity, num_actions), dtype=np.bool_) for _ in range(num_players)]
+        self.next_legal_mask = [np.zeros((capacity, num_actions), dtype=np.bool_) for _ in range(num_players)]
+        self.done = [np.zeros(capacity, dtype=np.bool_) for _ in range(num_players)]
+
+    @classmethod
+    def from_env(cls, env, capacity=1024):
+        ''' Allocate the buffers for an environment
+
+        Args:
+            env (Env): The environment
+            capacity (int): The initial number of transitions of each player
+
+        Returns:
+            (TrajectoryBuffer): The buffer
+        '''
+        return cls(env.num_players, env.state_shape, env.num_actions, capacity)
+
+    def add(self, player_id, state, action, reward, next_state, done):
+        ''' Write one transition of a player
+
+        Args:
+            player_id (int): The id of the player
+            state (dict): The state of the player when acting
+            action (int): The action id
+            reward (float): The reward
+            next_state (dict): The next state of the player
+            done (boolean): True if the game is over
+        '''
+        i = self.size[player_id]
+        if i == self.capacity[player_id]:
+            self._grow(player_id)
+        self.obs[player_id][i] = state['obs']
+        self.legal_mask[player_id][i] = get_legal_mask(state, self.num_actions)
+        self.action[player_id][i] = action
+        self.reward[player_id][i] = reward
+        self.next_obs[player_id][i] = next_state['obs']
+        self.next_legal_mask[player_id][i] = get_legal_mask(next_state, self.num_actions)
+        self.done[player_id][i] = done
+        self.size[player_id] = i + 1
+
+    def get(self, player_id):
+        ''' Get the transitions of a player. The arrays are views of the buffers,
+        so they are overwritten after `clear`
+
+        Args:
+            player_id (int): The id of the player
+
+        Returns:
+            (dict): The arrays keyed by 'obs', 'action', 'reward', 'next_obs',
+                'legal_mask', 'next_legal_mask' and 'done'
+        '''
+        size = self.size[player_id]
+        return {
+            'obs': self.obs[player_id][:size],
+            'action': self.action[player_id][:size],
+            'reward': self.reward[player_id][:size],
+            'next_obs': self.next_obs[player_id][:size],
+            'legal_mask': self.legal_mask[player_id][:size],
+            'next_legal_mask': self.next_legal_mask[player_id][:size],
+            'done': self.done[player_id][:size],
+        }
+
+    def clear(self):
+        ''' Drop all the transitions and keep the allocated arrays
+        '''
+        self.size = [0 for _ in range(self.num_players)]
+
+    def __len__(self):
+        return sum(self.size)
+
+    def _grow(self, player_id):
+        ''' Double the capacity of a player
+        '''
+        capacity = 2 * self.capacity[player_id]
+        for name in ('obs', 'next_obs', 'action', 'reward', 'legal_mask', 'next_legal_mask', 'done'):
+            arrays = getattr(self, name)
+            old = arrays[player_id]
+            arrays[player_id] = np.zeros((capacity, *old.shape[1:]), dtype=old.dtype)
+            arrays[player_id][:len(old)] = old
+        self.capacity[player_id] = capacity
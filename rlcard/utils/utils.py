@@ -4,12 +4,9 @@ from rlcard.games.base import Card
 
 def set_seed(seed):
     if seed is not None:
-        import subprocess
-        import sys
+        import importlib.util
 
-        reqs = subprocess.check_output([sys.executable, '-m', 'pip', 'freeze'])
-        installed_packages = [r.decode().split('==')[0] for r in reqs.split()]
-        if 'torch' in installed_packages:
+        if importlib.util.find_spec('torch') is not None:
             import torch
             torch.backends.cudnn.deterministic = True
             torch.manual_seed(seed)
@@ -181,7 +178,8 @@ def remove_illegal(action_probs, legal_actions):
 
     Args:
         action_probs (numpy.array): A 1 dimention numpy array.
-        legal_actions (list): A list of indices of legal actions.
+        legal_actions (list or numpy.array): A list of indices of legal actions,
+            or a boolean legal action mask.
 
     Returns:
         probd (numpy.array): A normalized vector without legal actions.
@@ -189,11 +187,32 @@ def remove_illegal(action_probs, legal_actions):
     probs = np.zeros(action_probs.shape[0])
     probs[legal_actions] = action_probs[legal_actions]
     if np.sum(probs) == 0:
-        probs[legal_actions] = 1 / len(legal_actions)
+        if isinstance(legal_actions, np.ndarray) and legal_actions.dtype == np.bool_:
+            probs[legal_actions] = 1 / np.count_nonzero(legal_actions)
+        else:
+            probs[legal_actions] = 1 / len(legal_actions)
     else:
         probs /= sum(probs)
     return probs
 
+def get_legal_mask(state, num_actions):
+    ''' Get the boolean legal action mask of a state. The states of the
+    environments carry it as 'legal_mask', otherwise it is built from the
+    keys of 'legal_actions'
+
+    Args:
+        state (dict): The state
+        num_actions (int): The number of actions
+
+    Returns:
+        (numpy.array): The mask, True for the legal actions
+    '''
+    if 'legal_mask' in state:
+        return state['legal_mask']
+    legal_mask = np.zeros(num_actions, dtype=np.bool_)
+    legal_mask[list(state['legal_actions'])] = True
+    return legal_mask
+
 def tournament(env, num):
     ''' Evaluate he performance of the agents in the environment
 
@@ -33,6 +33,8 @@ setuptools.setup(
         'rlcard': ['models/pretrained/leduc_holdem_cfr/*',
                    'games/uno/jsondata/action_space.json',
                    'games/limitholdem/card2index.json',
+                   'games/limitholdem/preflop_equity.npy',
+                   'games/limitholdem/abstraction_ehs2.npz',
                    'games/leducholdem/card2index.json',
                    'games/doudizhu/jsondata.zip',
                    'games/uno/jsondata/*',
@@ -1,8 +1,11 @@
+import os
+import pickle
+import tempfile
 import unittest
 import numpy as np
 
 import rlcard
-from rlcard.agents.cfr_agent import CFRAgent
+from rlcard.agents.cfr_agent import CFRAgent, VARIANTS
 
 class TestNFSP(unittest.TestCase):
 
@@ -21,17 +24,153 @@ class TestNFSP(unittest.TestCase):
 
     def test_save_and_load(self):
         env = rlcard.make('leduc-holdem', config={'allow_step_back':True})
-        agent = CFRAgent(env, model_path='experiments/cfr_model')
+        with tempfile.TemporaryDirectory() as model_dir:
+            model_path = os.path.join(model_dir, 'cfr_model')
+            agent = CFRAgent(env, model_path=model_path)
 
-        for _ in range(100):
-            agent.train()
+            for _ in range(100):
+                agent.train()
 
-        agent.save()
+            agent.save()
 
-        new_agent = CFRAgent(env, model_path='experiments/cfr_model')
-        new_agent.load()
+            new_agent = CFRAgent(env, model_path=model_path)
+            new_agent.load()
         self.assertEqual(len(agent.policy), len(new_agent.policy))
         self.assertEqual(len(agent.average_policy), len(new_agent.average_policy))
         self.assertEqual(len(agent.regrets), len(new_agent.regrets))
         self.assertEqual(agent.iteration, new_agent.iteration)
 
+
+    def test_variants(self):
+        for variant in VARIANTS:
+            env = rlcard.make('leduc-holdem', config={'allow_step_back':True})
+            agent = CFRAgent(env, variant=variant)
+            for _ in range(10):
+                agent.train()
+            for obs in agent.policy:
+                self.assertAlmostEqual(np.sum(agent.policy[obs]), 1)
+            if variant == 'cfr+':
+                self.assertGreaterEqual(np.min(agent.regrets.values), 0)
+        with self.assertRaises(ValueError):
+            CFRAgent(env, variant='cfr-')
+
+    def test_discount(self):
+        env = rlcard.make('leduc-holdem', config={'allow_step_back':True})
+        agent = CFRAgent(env, variant='dcfr', alpha=1, beta=0, gamma=1)
+        agent.regrets[b'a'] = np.array([2., -2., 0., 0.])
+        agent.average_policy[b'a'] = np.array([1., 1., 0., 0.])
+        agent.iteration = 1
+        agent.discount()
+        self.assertTrue(np.allclose(agent.regrets[b'a'], [1., -1., 0., 0.]))
+        self.assertTrue(np.allclose(agent.average_policy[b'a'], [0.5, 0.5, 0., 0.]))
+
+    def test_regret_matching(self):
+        env = rlcard.make('leduc-holdem', config={'allow_step_back':True})
+        agent = CFRAgent(env)
+        agent.regrets[b'a'] = np.array([1., -1., 3., 0.])
+        agent.regrets[b'b'] = np.array([-1., -2., 0., 0.])
+        agent.update_policy()
+        self.assertTrue(np.allclose(agent.policy[b'a'], [0.25, 0., 0.75, 0.]))
+        self.assertTrue(np.allclose(agent.policy[b'b'], [0.25, 0.25, 0.25, 0.25]))
+        self.assertTrue(np.allclose(agent.regret_matching(b'a'), agent.policy[b'a']))
+
+    def test_pruning(self):
+        env = rlcard.make('leduc-holdem', config={'seed': 0, 'allow_step_back':True})
+        agent = CFRAgent(env, prune_threshold=-1.0, prune_after=5, revisit_every=4)
+        for _ in range(5):
+            agent.train()
+        self.assertIsNone(agent.pruning_mask())
+        agent.train()
+        pruned = agent.regrets.values < -1.0
+        self.assertTrue(np.any(pruned))
+
+        # The regrets of the pruned actions are left unchanged
+        agent.iteration += 1
+        regrets = agent.regrets.values.copy()
+        for player_id in range(env.num_players):
+            agent.pruned_actions = agent.pruning_mask()
+            for _ in range(20):
+                env.reset()
+                agent.traverse_tree(np.ones(env.num_players), player_id)
+        pruned &= agent.policy.values[:len(pruned)] == 0
+        self.assertTrue(np.any(pruned))
+        self.assertTrue(np.array_equal(agent.regrets.values[:len(pruned)][pruned], regrets[pruned]))
+        agent.iteration = 8
+        self.assertIsNone(agent.pruning_mask())
+
+    def test_parallel_train(self):
+        # One worker plays the deals of a serial agent seeded like it
+        env = rlcard.make('leduc-holdem', config={'seed': 0, 'allow_step_back':True})
+        agent = CFRAgent(env, num_workers=1)
+        for _ in range(10):
+            agent.train()
+        agent.close()
+
+        env = rlcard.make('leduc-holdem', config={'seed': 0, 'allow_step_back':True})
+        env.seed(int(env.np_random.randint(2 ** 31 - 1)))
+        serial_agent = CFRAgent(env)
+        for _ in range(10):
+            serial_agent.train()
+        self.assertEqual(set(agent.policy), set(serial_agent.policy))
+        for obs in serial_agent.regrets:
+            self.assertTrue(np.allclose(agent.regrets[obs], serial_agent.regrets[obs]))
+            self.assertTrue(np.allclose(agent.average_policy[obs], serial_agent.average_policy[obs]))
+
+        agent = CFRAgent(env, variant='cfr+', num_workers=2)
+        for _ in range(5):
+            agent.train()
+        agent.close()
+        self.assertIsNone(agent.workers)
+        for obs in agent.policy:
+            self.assertAlmostEqual(np.sum(agent.policy[obs]), 1)
+
+    def test_parallel_pruning(self):
+        # The workers only receive the rows of the policy and of the pruned actions that changed
+        kwargs = {'prune_threshold': -0.5, 'prune_after': 3, 'revisit_every': 4}
+        env = rlcard.make('leduc-holdem', config={'seed': 1, 'allow_step_back':True})
+        agent = CFRAgent(env, num_workers=1, **kwargs)
+        for _ in range(12):
+            agent.train()
+        agent.close()
+
+        env = rlcard.make('leduc-holdem', config={'seed': 1, 'allow_step_back':True})
+        env.seed(int(env.np_random.randint(2 ** 31 - 1)))
+        serial_agent = CFRAgent(env, **kwargs)
+        for _ in range(12):
+            serial_agent.train()
+        self.assertEqual(set(agent.policy), set(serial_agent.policy))
+        for obs in serial_agent.regrets:
+            self.assertTrue(np.allclose(agent.regrets[obs], serial_agent.regrets[obs]))
+
+    def test_load_pretrained(self):
+        from rlcard.models.pretrained_models import ROOT_PATH
+        env = rlcard.make('leduc-holdem')
+        agent = CFRAgent(env, model_path=os.path.join(ROOT_PATH, 'leduc_holdem_cfr'))
+        agent.load()
+        self.assertGreater(len(agent.average_policy), 0)
+        state, _ = env.reset()
+        action, _ = agent.eval_step(state)
+        self.assertIn(action, state['legal_actions'])
+
+        mapped_agent = CFRAgent(env, model_path=agent.model_path)
+        mapped_agent.load_average_policy()
+        self.assertEqual(set(mapped_agent.average_policy), set(agent.average_policy))
+        action, _ = mapped_agent.eval_step(state)
+        self.assertIn(action, state['legal_actions'])
+
+    def test_load_pickle(self):
+        tables = {'policy': {b'a': np.array([0.5, 0.5, 0., 0.])},
+                  'average_policy': {b'a': np.array([1., 0., 0., 0.])},
+                  'regrets': {b'a': np.array([1., -1., 0., 0.])},
+                  'iteration': 3}
+        env = rlcard.make('leduc-holdem', config={'allow_step_back':True})
+        with tempfile.TemporaryDirectory() as path:
+            for name, table in tables.items():
+                with open(os.path.join(path, name + '.pkl'), 'wb') as f:
+                    pickle.dump(table, f)
+            agent = CFRAgent(env, model_path=path)
+            agent.load()
+            self.assertEqual(agent.iteration, 3)
+            self.assertTrue(np.array_equal(agent.regrets[b'a'], [1., -1., 0., 0.]))
+            agent.load_average_policy()
+            self.assertTrue(np.array_equal(agent.average_policy[b'a'], [1., 0., 0., 0.]))
@@ -0,0 +1,76 @@
+import os
+import tempfile
+import unittest
+import numpy as np
+
+import rlcard
+from rlcard.agents.deep_cfr_agent import DeepCFRAgent, ReservoirMemory
+
+class TestDeepCFR(unittest.TestCase):
+
+    def test_train(self):
+        env = rlcard.make('leduc-holdem', config={'seed': 0, 'allow_step_back':True})
+        model_dir = tempfile.TemporaryDirectory()
+        self.addCleanup(model_dir.cleanup)
+        model_path = os.path.join(model_dir.name, 'deep_cfr_model')
+        agent = DeepCFRAgent(env, model_path=model_path, mlp_layers=[16], num_traversals=10,
+                             batch_traversals=4, advantage_train_steps=5, policy_train_steps=5, batch_size=16)
+        for _ in range(3):
+            agent.train()
+        self.assertEqual(agent.iteration, 3)
+        self.assertGreater(len(agent.advantage_memories[0]), 0)
+        self.assertGreater(len(agent.strategy_memories[0]), 0)
+
+        state, player_id = env.reset()
+        self.assertEqual(agent.player_of(state), player_id)
+        probs = agent.current_strategies(player_id, state['obs'][np.newaxis].astype(np.float32), state['legal_mask'][np.newaxis])
+        self.assertAlmostEqual(np.sum(probs), 1)
+        self.assertTrue(np.all(probs[0][~state['legal_mask']] == 0))
+        # The policy networks are only trained on request
+        self.assertEqual(agent.policy_iteration, 0)
+        agent.train_policy()
+        action, info = agent.eval_step(state)
+        self.assertIn(action, state['legal_actions'])
+        self.assertAlmostEqual(sum(info['probs'].values()), 1, places=5)
+        self.assertEqual(agent.policy_iteration, 3)
+
+        agent.save()
+        new_agent = DeepCFRAgent(env, model_path=model_path, mlp_layers=[16], batch_traversals=1)
+        new_agent.load()
+        self.assertEqual(new_agent.iteration, 3)
+        self.assertTrue(np.allclose(new_agent.action_probs(state), agent.action_probs(state)))
+
+    def test_reservoir_memory(self):
+        memory = ReservoirMemory(10, [3], 2)
+        for i in range(100):
+            memory.add(np.full(3, i), np.array([i, -i]), np.array([True, False]), i)
+        self.assertEqual(len(memory), 10)
+        self.assertEqual(memory.add_calls, 100)
+        obs, values, legal_mask, iterations = memory.sample(5)
+        self.assertEqual(obs.shape, (5, 3))
+        self.assertTrue(np.array_equal(obs[:, 0], iterations))
+        # The values of the illegal actions are not stored
+        self.assertTrue(np.array_equal(values[:, 0], iterations))
+        self.assertTrue(np.all(values[:, 1] == 0))
+        self.assertTrue(np.all(legal_mask[:, 0]))
+        self.assertFalse(np.any(legal_mask[:, 1]))
+
+        # The rows are padded to the largest number of legal actions
+        memory = ReservoirMemory(4, [1], 1000)
+        memory.add(np.zeros(1), np.arange(1000.0), np.arange(1000) % 500 == 1, 1)
+        memory.add(np.ones(1), np.arange(1000.0), np.arange(1000) == 7, 2)
+        self.assertEqual(memory.values.shape, (4, 2))
+        obs, values, legal_mask, iterations = memory.sample(20)
+        for i in range(20):
+            expected = [1, 501] if iterations[i] == 1 else [7]
+            self.assertEqual(list(np.flatnonzero(legal_mask[i])), expected)
+            self.assertEqual(list(values[i][legal_mask[i]]), expected)
+            self.assertEqual(values[i].sum(), sum(expected))
+
+    def test_step_back_required(self):
+        env = rlcard.make('leduc-holdem')
+        with self.assertRaises(ValueError):
+            DeepCFRAgent(env)
+
+if __name__ == '__main__':
+    unittest.main()
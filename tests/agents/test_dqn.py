@@ -51,3 +51,22 @@ class TestDQN(unittest.TestCase):
         predicted_action = agent.step({'obs': np.random.random_sample((2,)), 'legal_actions': {0: None, 1: None}})
         self.assertGreaterEqual(predicted_action, 0)
         self.assertLessEqual(predicted_action, 1)
+
+    def test_batch(self):
+        import rlcard
+        env = rlcard.make_vec('doudizhu', num_envs=4, config={'seed': 0})
+        agents = [DQNAgent(num_actions=env.num_actions, state_shape=shape, mlp_layers=[16], epsilon_start=0.5,
+                           device=torch.device('cpu')) for shape in env.state_shapes]
+        obs, legal_mask, player_ids = env.reset()
+        for _ in range(5):
+            actions = np.zeros(env.num_envs, dtype=np.int64)
+            for player_id, agent in enumerate(agents):
+                indices, player_obs, player_mask = env.player_batch(player_id)
+                if len(indices) == 0:
+                    continue
+                greedy = agent.eval_step_batch(player_obs, player_mask)
+                for index, action in zip(indices, greedy):
+                    self.assertEqual(action, agent.eval_step(env.states[index])[0])
+                actions[indices] = agent.step_batch(player_obs, player_mask)
+            self.assertTrue(np.all(legal_mask[np.arange(env.num_envs), actions]))
+            obs, legal_mask, player_ids, _, _ = env.step(actions)
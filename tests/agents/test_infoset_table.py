@@ -0,0 +1,95 @@
+import os
+import tempfile
+import unittest
+import numpy as np
+
+from rlcard.agents.infoset_table import (
+    InfosetIndexer,
+    InfosetTable,
+    is_checkpoint,
+    load_table,
+    load_tables,
+    save_tables,
+)
+
+class TestInfosetTable(unittest.TestCase):
+
+    def test_indexer(self):
+        indexer = InfosetIndexer()
+        self.assertEqual(indexer.index(b'a'), 0)
+        self.assertEqual(indexer.index(b'b'), 1)
+        self.assertEqual(indexer.index(b'a'), 0)
+        self.assertEqual(indexer.get(b'c'), None)
+        self.assertEqual(len(indexer), 2)
+
+    def test_table(self):
+        indexer = InfosetIndexer()
+        regrets = InfosetTable(indexer, 3, chunk_size=2)
+        policy = InfosetTable(indexer, 3, chunk_size=2)
+        for i in range(5):
+            regrets.row(indexer.index(i))[i % 3] += 1
+        self.assertEqual(len(regrets), 5)
+        self.assertEqual(len(policy), 0)
+        self.assertEqual(regrets.values.shape, (6, 3))
+        self.assertEqual(list(regrets), [0, 1, 2, 3, 4])
+        self.assertTrue(np.array_equal(regrets[4], [0, 1, 0]))
+
+        policy.set_rows(regrets.ids()[1:], np.ones((4, 3)))
+        self.assertNotIn(0, policy)
+        self.assertIn(1, policy)
+        self.assertTrue(np.array_equal(policy.row(indexer.index(0), 0.5), [0.5, 0.5, 0.5]))
+
+        del regrets[2]
+        self.assertEqual(sorted(regrets.to_dict()), [0, 1, 3, 4])
+        with self.assertRaises(KeyError):
+            regrets[2]
+
+    def test_merge(self):
+        indexer = InfosetIndexer()
+        table = InfosetTable(indexer, 2, chunk_size=2)
+        for key in 'abc':
+            indexer.index(key)
+        table['a'] = [1., 1.]
+        table.add_rows(np.array([0, 2]), np.array([[1., 0.], [0., 2.]]))
+        self.assertTrue(np.array_equal(table['a'], [2., 1.]))
+        self.assertTrue(np.array_equal(table['c'], [0., 2.]))
+        self.assertNotIn('b', table)
+
+        indexer.truncate(1)
+        self.assertEqual(indexer.keys, ['a'])
+        self.assertEqual(indexer.index('c'), 1)
+        table.clear()
+        self.assertEqual(len(table), 0)
+
+    def test_checkpoint(self):
+        with tempfile.TemporaryDirectory() as model_dir:
+            path = os.path.join(model_dir, 'infoset_table_checkpoint')
+            indexer = InfosetIndexer()
+            policy = InfosetTable(indexer, 2)
+            regrets = InfosetTable(indexer, 2)
+            policy[b'b\x00'] = [0.25, 0.75]
+            policy[b'a'] = [1., 0.]
+            policy[b'b'] = [0.5, 0.5]
+            regrets[b'a'] = [1., -1.]
+            save_tables(path, {'policy': policy, 'regrets': regrets})
+            self.assertTrue(is_checkpoint(path))
+
+            mapped = load_table(path, 'policy')
+            self.assertEqual(mapped.values.dtype, np.float32)
+            self.assertEqual(list(mapped), [b'a', b'b', b'b\x00'])
+            self.assertTrue(np.array_equal(mapped[b'b\x00'], [0.25, 0.75]))
+            self.assertNotIn(b'c', mapped)
+            mapped = load_table(path, 'regrets')
+            self.assertEqual(len(mapped), 1)
+            self.assertNotIn(b'b', mapped)
+
+            indexer = InfosetIndexer()
+            policy, regrets = load_tables(path, ['policy', 'regrets'], indexer, 2)
+            self.assertEqual(len(indexer), 3)
+            self.assertEqual(len(policy), 3)
+            self.assertEqual(regrets.to_dict().keys(), {b'a'})
+            self.assertTrue(np.array_equal(regrets[b'a'], [1., -1.]))
+            self.assertFalse(is_checkpoint(os.path.join(path, 'missing')))
+
+if __name__ == '__main__':
+    unittest.main()
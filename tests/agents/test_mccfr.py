@@ -0,0 +1,52 @@
+import os
+import tempfile
+import unittest
+import numpy as np
+
+import rlcard
+from rlcard.agents.mccfr_agent import MCCFRAgent
+
+class TestMCCFR(unittest.TestCase):
+
+    def _test_train(self, sampling):
+        env = rlcard.make('leduc-holdem', config={'allow_step_back':True})
+        agent = MCCFRAgent(env, model_path='experiments/mccfr_model', sampling=sampling)
+
+        for _ in range(100):
+            agent.train()
+        self.assertEqual(agent.iteration, 100)
+        self.assertGreater(len(agent.average_policy), 0)
+        for obs in agent.policy:
+            self.assertAlmostEqual(np.sum(agent.policy[obs]), 1)
+
+        state = {'obs': np.array([1., 1., 0., 0., 0., 0.]), 'legal_actions': {0: None,2: None}, 'raw_legal_actions': ['call', 'fold']}
+        action, _ = agent.eval_step(state)
+        self.assertIn(action, [0, 2])
+
+    def test_external_sampling(self):
+        self._test_train('external')
+
+    def test_outcome_sampling(self):
+        self._test_train('outcome')
+
+    def test_save_and_load(self):
+        env = rlcard.make('leduc-holdem', config={'allow_step_back':True})
+        with tempfile.TemporaryDirectory() as model_dir:
+            model_path = os.path.join(model_dir, 'mccfr_model')
+            agent = MCCFRAgent(env, model_path=model_path)
+            for _ in range(10):
+                agent.train()
+            agent.save()
+
+            new_agent = MCCFRAgent(env, model_path=model_path)
+            new_agent.load()
+        self.assertEqual(len(agent.average_policy), len(new_agent.average_policy))
+        self.assertEqual(agent.iteration, new_agent.iteration)
+
+    def test_sampling(self):
+        env = rlcard.make('leduc-holdem', config={'allow_step_back':True})
+        with self.assertRaises(ValueError):
+            MCCFRAgent(env, sampling='chance')
+
+if __name__ == '__main__':
+    unittest.main()
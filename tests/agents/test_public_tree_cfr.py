@@ -0,0 +1,64 @@
+import os
+import tempfile
+import unittest
+import numpy as np
+
+import rlcard
+from rlcard.agents.public_tree_cfr_agent import PublicTreeCFRAgent
+from rlcard.utils.exploitability import exploitability
+
+class TestPublicTreeCFR(unittest.TestCase):
+
+    def test_train(self):
+        env = rlcard.make('leduc-holdem', config={'allow_step_back':True})
+        agent = PublicTreeCFRAgent(env, variant='cfr+')
+        initial = exploitability(agent.tree, agent)
+        for _ in range(50):
+            agent.train()
+        self.assertLess(exploitability(agent.tree, agent), 0.05)
+        self.assertLess(exploitability(agent.tree, agent), initial)
+
+        state, _ = env.reset()
+        action, info = agent.eval_step(state)
+        self.assertIn(action, state['legal_actions'])
+        self.assertAlmostEqual(sum(info['probs'].values()), 1)
+
+    def test_imperfect_recall(self):
+        env = rlcard.make('leduc-holdem', config={'allow_step_back':True})
+        agent = PublicTreeCFRAgent(env, perfect_recall=False)
+        agent.train()
+        # The infosets of CFRAgent
+        self.assertEqual(len(agent.average_policy), 84)
+
+    def test_save_and_load(self):
+        env = rlcard.make('leduc-holdem', config={'allow_step_back':True})
+        with tempfile.TemporaryDirectory() as model_dir:
+            model_path = os.path.join(model_dir, 'public_tree_cfr_model')
+            agent = PublicTreeCFRAgent(env, model_path=model_path)
+            for _ in range(5):
+                agent.train()
+            agent.save()
+
+            new_agent = PublicTreeCFRAgent(env, model_path=model_path)
+            new_agent.load()
+        self.assertEqual(new_agent.iteration, 5)
+        self.assertAlmostEqual(exploitability(agent.tree, agent), exploitability(agent.tree, new_agent))
+
+    def test_train_after_load(self):
+        env = rlcard.make('leduc-holdem', config={'allow_step_back':True})
+        with tempfile.TemporaryDirectory() as model_dir:
+            model_path = os.path.join(model_dir, 'public_tree_cfr_model')
+            agent = PublicTreeCFRAgent(env, model_path=model_path, variant='cfr+')
+            for _ in range(20):
+                agent.train()
+            agent.save()
+
+            new_agent = PublicTreeCFRAgent(env, model_path=model_path, variant='cfr+')
+            new_agent.load()
+        for _ in range(10):
+            agent.train()
+            new_agent.train()
+        self.assertAlmostEqual(exploitability(agent.tree, agent), exploitability(agent.tree, new_agent), places=5)
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,34 @@
+import unittest
+
+from rlcard.benchmarks import env_throughput, cfr_traversal, cfr_convergence, tournament
+from rlcard.benchmarks.__main__ import run_suites
+
+
+class TestBenchmarks(unittest.TestCase):
+
+    def test_env_throughput(self):
+        results = env_throughput.run(num_games=2)
+        self.assertIn('doudizhu', results)
+        for result in results.values():
+            self.assertEqual(result['games'], 2)
+            self.assertGreater(result['steps_per_sec'], 0)
+
+    def test_cfr_traversal(self):
+        results = cfr_traversal.run(env_ids=['leduc-holdem'], iterations=1)
+        self.assertEqual(set(results['leduc-holdem']), set(cfr_traversal.MODES))
+
+    def test_cfr_convergence(self):
+        results = cfr_convergence.run(variants=['vanilla', 'dcfr'], iterations=4, evaluate_every=2)
+        self.assertEqual(set(results), {'vanilla', 'dcfr'})
+        for evaluations in results.values():
+            self.assertEqual([result['iteration'] for result in evaluations], [2, 4])
+            for result in evaluations:
+                self.assertGreater(result['exploitability'], 0)
+
+    def test_run_suites(self):
+        results = run_suites(['tournament'], tournament_games=10)
+        self.assertIn('meta', results)
+        self.assertEqual(results['tournament']['leduc-holdem']['games'], 10)
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,93 @@
+import pickle
+import unittest
+from collections import OrderedDict
+
+import numpy as np
+
+import rlcard
+from rlcard.envs.lazy_state import LazyLegalActions, LazyState
+
+
+def play(env, seed):
+    ''' Play a random game and keep all the states without reading them until the end
+    '''
+    np_random = np.random.RandomState(seed)
+    state, player_id = env.reset()
+    states = [state]
+    while not env.is_over():
+        action = np_random.choice(list(state['legal_actions']))
+        state, player_id = env.step(action)
+        states.append(state)
+    states.extend(env.get_state(i) for i in range(env.num_players))
+    return states
+
+
+class TestLazyState(unittest.TestCase):
+
+    def _test_same_states(self, env_id):
+        for seed in range(3):
+            env = rlcard.make(env_id, config={'seed': seed})
+            lazy_env = rlcard.make(env_id, config={'seed': seed, 'lazy_state': True})
+            states = play(env, seed)
+            lazy_states = play(lazy_env, seed)
+            self.assertEqual(len(states), len(lazy_states))
+            for state, lazy_state in zip(states, lazy_states):
+                self.assertIsInstance(lazy_state, LazyState)
+                self.assertTrue(np.array_equal(state['obs'], lazy_state['obs']))
+                self.assertEqual(list(state['legal_actions']), list(lazy_state['legal_actions']))
+                self.assertEqual(state['raw_legal_actions'], lazy_state['raw_legal_actions'])
+
+    def test_same_states(self):
+        for env_id in ['leduc-holdem', 'limit-holdem', 'no-limit-holdem', 'uno', 'doudizhu']:
+            self._test_same_states(env_id)
+
+    def test_not_extracted(self):
+        env = rlcard.make('limit-holdem', config={'seed': 0, 'lazy_state': True})
+        state, _ = env.reset()
+        next_state, _ = env.step(list(state['legal_actions'])[0])
+        self.assertTrue(state.is_materialized)
+        self.assertFalse(next_state.is_materialized)
+        env.step(list(env.get_state(env.get_player_id())['legal_actions'])[0])
+        # The extraction of limit hold'em only reads the raw state, so it can wait
+        self.assertFalse(next_state.is_materialized)
+
+        env = rlcard.make('uno', config={'seed': 0, 'lazy_state': True})
+        state, _ = env.reset()
+        self.assertFalse(state.is_materialized)
+        env.step(list(state['legal_actions'])[0])
+        next_state = env.get_state(env.get_player_id())
+        self.assertFalse(next_state.is_materialized)
+        # The uno extraction reads the game, so the state is extracted before the game moves on
+        env.step(list(env.get_state(env.get_player_id())['legal_actions'])[0])
+        self.assertTrue(next_state.is_materialized)
+
+    def test_dict_behavior(self):
+        env = rlcard.make('leduc-holdem', config={'lazy_state': True})
+        state, _ = env.reset()
+        self.assertEqual(set(state.keys()), {'obs', 'legal_actions', 'raw_obs', 'raw_legal_actions', 'action_record', 'legal_mask'})
+        self.assertIn('obs', state)
+        self.assertEqual(dict(state), state.copy())
+
+    def test_lazy_legal_actions(self):
+        encoded = []
+        def encode(action):
+            encoded.append(action)
+            return len(action)
+        legal_actions = LazyLegalActions([3, 1], ['abc', 'a'], encode)
+        self.assertEqual(list(legal_actions), [3, 1])
+        self.assertIn(1, legal_actions)
+        self.assertEqual(encoded, [])
+        self.assertEqual(legal_actions[1], 1)
+        self.assertEqual(legal_actions[1], 1)
+        self.assertEqual(encoded, ['a'])
+        self.assertEqual(pickle.loads(pickle.dumps(legal_actions)), OrderedDict([(3, 3), (1, 1)]))
+
+        env = rlcard.make('doudizhu', config={'seed': 0})
+        state, _ = env.reset()
+        self.assertIsInstance(state['legal_actions'], LazyLegalActions)
+        for action_id, raw_action in zip(state['legal_actions'], state['raw_legal_actions']):
+            self.assertTrue(np.array_equal(state['legal_actions'][action_id], env.get_action_feature(action_id)))
+            self.assertEqual(env._decode_action(action_id), raw_action)
+
+if __name__ == '__main__':
+    unittest.main()
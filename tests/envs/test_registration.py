@@ -1,4 +1,7 @@
+import subprocess
+import sys
 import unittest
+import numpy as np
 
 import rlcard
 from rlcard.envs.registration import register, make
@@ -20,6 +23,41 @@ class TestRegistration(unittest.TestCase):
         with self.assertRaises(ValueError):
             make('test_random_make')
 
+    def test_lazy_import(self):
+        # The game modules and PyTorch are imported by make and on first access
+        modules = subprocess.check_output([sys.executable, '-c',
+            'import sys, rlcard, rlcard.agents, rlcard.models; print(" ".join(sys.modules))']).decode().split()
+        for module in ['rlcard.envs.doudizhu', 'rlcard.games.doudizhu', 'rlcard.agents.cfr_agent', 'torch']:
+            self.assertNotIn(module, modules)
+
+        with self.assertRaises(ModuleNotFoundError):
+            register(env_id='test_lazy', entry_point='rlcard.envs.not_a_module:Env')
+            rlcard.make('test_lazy')
+
+    def test_legal_mask(self):
+        for env_id in ['blackjack', 'leduc-holdem', 'limit-holdem', 'no-limit-holdem', 'uno', 'mahjong', 'doudizhu', 'gin-rummy']:
+            for lazy_state in [False, True]:
+                env = rlcard.make(env_id, config={'seed': 0, 'lazy_state': lazy_state})
+                state, _ = env.reset()
+                for _ in range(5):
+                    self.assertEqual(state['legal_mask'].dtype, np.bool_)
+                    self.assertEqual(state['legal_mask'].shape, (env.num_actions,))
+                    self.assertEqual(list(np.flatnonzero(state['legal_mask'])), sorted(state['legal_actions']))
+                    if env.is_over():
+                        break
+                    state, _ = env.step(list(state['legal_actions'])[0])
+
+    def test_infoset_key(self):
+        for env_id in ['blackjack', 'leduc-holdem', 'limit-holdem', 'no-limit-holdem', 'uno']:
+            env = rlcard.make(env_id, config={'seed': 0})
+            for _ in range(3):
+                state, player_id = env.reset()
+                while not env.is_over():
+                    self.assertEqual(env.infoset_key(player_id), state['obs'].tobytes())
+                    self.assertEqual(env.legal_action_ids(), list(state['legal_actions']))
+                    action = np.random.choice(list(state['legal_actions']))
+                    state, player_id = env.step(action)
+
     def test_make_modes(self):
         register(env_id='test_env', entry_point='rlcard.envs.blackjack:BlackjackEnv')
 
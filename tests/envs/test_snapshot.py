@@ -0,0 +1,79 @@
+import unittest
+import numpy as np
+
+import rlcard
+
+
+def fingerprint(env):
+    ''' Everything the players can observe, for comparing two game states
+    '''
+    states = [env.get_state(player_id) for player_id in range(env.num_players)]
+    return (env.get_player_id(),
+            env.is_over(),
+            tuple(tuple(env.action_recorder)),
+            tuple(state['obs'].tobytes() for state in states),
+            tuple(tuple(state['legal_actions']) for state in states))
+
+def play(env, seed, max_steps=200):
+    ''' Play a random game and return the fingerprints and the snapshots before each step
+    '''
+    np_random = np.random.RandomState(seed)
+    state, _ = env.reset()
+    fingerprints, snapshots = [], []
+    while not env.is_over() and len(snapshots) < max_steps:
+        fingerprints.append(fingerprint(env))
+        snapshots.append(env.snapshot())
+        action = np_random.choice(list(state['legal_actions']))
+        state, _ = env.step(action)
+    return fingerprints, snapshots
+
+
+class TestSnapshot(unittest.TestCase):
+
+    def _test_restore(self, env_id):
+        env = rlcard.make(env_id, config={'seed': 0})
+        for seed in range(5):
+            fingerprints, snapshots = play(env, seed)
+            for expected, snapshot in reversed(list(zip(fingerprints, snapshots))):
+                env.restore(snapshot)
+                self.assertEqual(fingerprint(env), expected)
+            # The same snapshot can be restored again after the game moved on
+            env.step(list(env.get_state(env.get_player_id())['legal_actions'])[0])
+            env.restore(snapshots[0])
+            self.assertEqual(fingerprint(env), fingerprints[0])
+
+    def _test_step_back(self, env_id):
+        env = rlcard.make(env_id, config={'seed': 0, 'allow_step_back': True})
+        for seed in range(5):
+            fingerprints, _ = play(env, seed)
+            for expected in reversed(fingerprints):
+                env.step_back()
+                self.assertEqual(fingerprint(env), expected)
+            self.assertFalse(env.step_back())
+
+    def test_leduc_holdem(self):
+        self._test_restore('leduc-holdem')
+        self._test_step_back('leduc-holdem')
+
+    def test_limit_holdem(self):
+        self._test_restore('limit-holdem')
+        self._test_step_back('limit-holdem')
+
+    def test_no_limit_holdem(self):
+        self._test_restore('no-limit-holdem')
+        self._test_step_back('no-limit-holdem')
+
+    def test_uno(self):
+        self._test_restore('uno')
+        self._test_step_back('uno')
+
+    def test_mahjong(self):
+        self._test_restore('mahjong')
+        self._test_step_back('mahjong')
+
+    def test_fallback(self):
+        self._test_restore('blackjack')
+        self._test_restore('gin-rummy')
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,87 @@
+import unittest
+import numpy as np
+
+import rlcard
+from rlcard.envs.vec_env import VecEnv, SubprocVecEnv
+
+
+class TestVecEnv(unittest.TestCase):
+
+    def test_reset(self):
+        env = rlcard.make_vec('leduc-holdem', num_envs=4, config={'seed': 0})
+        obs, legal_mask, player_ids = env.reset()
+        self.assertEqual(obs.shape, (4, 36))
+        self.assertEqual(legal_mask.shape, (4, env.num_actions))
+        self.assertEqual(legal_mask.dtype, np.bool_)
+        for i in range(4):
+            self.assertEqual(player_ids[i], env.envs[i].get_player_id())
+            self.assertEqual(sorted(np.flatnonzero(legal_mask[i])), sorted(env.states[i]['legal_actions']))
+
+    def test_step(self):
+        env = rlcard.make_vec('limit-holdem', num_envs=3, config={'seed': 0})
+        obs, legal_mask, _ = env.reset()
+        num_games = 0
+        for _ in range(200):
+            actions = [np.random.choice(np.flatnonzero(mask)) for mask in legal_mask]
+            obs, legal_mask, player_ids, dones, payoffs = env.step(actions)
+            self.assertEqual(obs.shape, (3, 72))
+            for i in range(3):
+                if dones[i]:
+                    num_games += 1
+                    self.assertAlmostEqual(float(np.sum(payoffs[i])), 0)
+                else:
+                    self.assertTrue(np.all(payoffs[i] == 0))
+        self.assertGreater(num_games, 0)
+        with self.assertRaises(ValueError):
+            env.step([0])
+
+    def test_seed(self):
+        env_1 = rlcard.make_vec('leduc-holdem', num_envs=2, config={'seed': 7})
+        env_2 = rlcard.make_vec('leduc-holdem', num_envs=2, config={'seed': 7})
+        obs_1, _, _ = env_1.reset()
+        obs_2, _, _ = env_2.reset()
+        self.assertTrue(np.array_equal(obs_1, obs_2))
+
+    def test_subproc_matches_in_process(self):
+        env = rlcard.make_vec('leduc-holdem', num_envs=5, config={'seed': 3})
+        subproc_env = rlcard.make_vec('leduc-holdem', num_envs=5, config={'seed': 3}, num_workers=2)
+        try:
+            self.assertIsInstance(subproc_env, SubprocVecEnv)
+            obs, legal_mask, player_ids = env.reset()
+            sub_obs, sub_legal_mask, sub_player_ids = subproc_env.reset()
+            self.assertTrue(np.array_equal(obs, sub_obs))
+            self.assertTrue(np.array_equal(legal_mask, sub_legal_mask))
+            for _ in range(30):
+                actions = [int(np.flatnonzero(mask)[0]) for mask in legal_mask]
+                outputs = env.step(actions)
+                sub_outputs = subproc_env.step(actions)
+                for output, sub_output in zip(outputs, sub_outputs):
+                    self.assertTrue(np.array_equal(output, sub_output))
+                legal_mask = outputs[1]
+        finally:
+            subproc_env.close()
+
+    def test_different_state_shapes(self):
+        # The observations of the landlord have 790 values, the ones of the peasants 901
+        env = rlcard.make_vec('doudizhu', num_envs=3, config={'seed': 0})
+        self.assertEqual(env.state_shape, [901])
+        obs, legal_mask, player_ids = env.reset()
+        for _ in range(10):
+            self.assertEqual(obs.shape, (3, 901))
+            for player_id in range(env.num_players):
+                indices, player_obs, player_mask = env.player_batch(player_id)
+                self.assertEqual(player_obs.shape, (len(indices), env.state_shapes[player_id][0]))
+                for index, row in zip(indices, player_obs):
+                    self.assertTrue(np.array_equal(row, env.states[index]['obs']))
+                    self.assertTrue(np.all(obs[index, len(row):] == 0))
+                self.assertTrue(np.array_equal(player_mask, legal_mask[indices]))
+            actions = [np.random.choice(np.flatnonzero(mask)) for mask in legal_mask]
+            obs, legal_mask, player_ids, _, _ = env.step(actions)
+
+        with self.assertRaises(ValueError):
+            env = rlcard.make('leduc-holdem')
+            env.state_shape = [[36], [6, 6]]
+            VecEnv([env])
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,61 @@
+import os
+import tempfile
+import unittest
+
+import numpy as np
+
+import rlcard
+from rlcard.games.limitholdem.abstraction import HandAbstraction, METRICS, make_abstraction
+
+
+class TestHoldemAbstraction(unittest.TestCase):
+
+    def test_fit(self):
+        for metric in METRICS:
+            abstraction = HandAbstraction(num_buckets=[3, 4, 4, 5], metric=metric, num_rollouts=8,
+                                          num_opponent_samples=8, num_bins=4)
+            abstraction.fit(num_hands=40, num_preflop_rollouts=8, np_random=np.random.RandomState(0))
+            self.assertEqual(abstraction.preflop_buckets.shape, (169,))
+            board = ['D2', 'C7', 'HK', 'S9', 'CQ']
+            buckets = abstraction.buckets(['SA', 'HA'], board)
+            self.assertEqual(len(buckets), 4)
+            for bucket, num_buckets in zip(buckets, abstraction.num_buckets):
+                self.assertTrue(0 <= bucket < num_buckets)
+            self.assertEqual(abstraction.encode(['SA', 'HA'], board).sum(), 4)
+            self.assertEqual(abstraction.encode(['SA', 'HA'], []).shape, (16,))
+
+            with tempfile.TemporaryDirectory() as directory:
+                path = os.path.join(directory, 'abstraction.npz')
+                abstraction.save(path)
+                loaded = HandAbstraction.load(path)
+            self.assertEqual(loaded.metric, metric)
+            self.assertEqual(loaded.num_buckets, [3, 4, 4, 5])
+            self.assertEqual(loaded.buckets(['SA', 'HA'], board), buckets)
+
+    def test_default(self):
+        abstraction = make_abstraction(True)
+        self.assertEqual(abstraction.num_buckets, [8, 8, 8, 8])
+        board = ['D2', 'C7', 'HK', 'S9', 'CQ']
+        self.assertEqual(abstraction.bucket(['SA', 'HA'], []), 7)
+        self.assertEqual(abstraction.bucket(['S7', 'H2'], []), 0)
+        # The same cards in another order, in another abstraction, have the same bucket
+        self.assertEqual(abstraction.bucket(['SK', 'HK'], board[:3]), HandAbstraction.load().bucket(['HK', 'SK'], board[2::-1]))
+        self.assertGreater(abstraction.bucket(['SK', 'HK'], board), abstraction.bucket(['S3', 'H4'], board))
+        self.assertIsNone(make_abstraction(None))
+        with self.assertRaises(ValueError):
+            make_abstraction(HandAbstraction())
+
+    def test_env(self):
+        for env_id, size in [('limit-holdem', 32 + 20), ('no-limit-holdem', 32 + 2)]:
+            env = rlcard.make(env_id, config={'seed': 0, 'card_abstraction': True})
+            self.assertEqual(env.state_shape[0], [size])
+            for _ in range(3):
+                state, player_id = env.reset()
+                while not env.is_over():
+                    self.assertEqual(state['obs'].shape, (size,))
+                    self.assertEqual(env.infoset_key(player_id), state['obs'].tobytes())
+                    action = np.random.choice(list(state['legal_actions']))
+                    state, player_id = env.step(action)
+
+if __name__ == '__main__':
+    unittest.main()
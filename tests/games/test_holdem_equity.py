@@ -0,0 +1,86 @@
+import itertools
+import unittest
+
+import numpy as np
+
+from rlcard.games.base import Card
+from rlcard.games.limitholdem.equity import equity, num_deals, to_card_ids
+from rlcard.games.limitholdem.preflop import MAX_OPPONENTS, NUM_HANDS, load_preflop_table, preflop_equity
+from rlcard.games.limitholdem.preflop import preflop_hand, preflop_index, preflop_name
+
+
+class TestHoldemEquity(unittest.TestCase):
+
+    def test_to_card_ids(self):
+        self.assertEqual(to_card_ids(['SA', 22, Card('C', 'K')]), [0, 22, 51])
+
+    def test_num_deals(self):
+        self.assertEqual(num_deals(45, 0, 1), 990)
+        self.assertEqual(num_deals(46, 1, 1), 46 * 990)
+
+    def test_exact(self):
+        # The river, the nuts
+        result = equity(['SA', 'SK'], ['SQ', 'SJ', 'ST', 'H2', 'D3'])
+        self.assertEqual(result.win, 1.0)
+        # A split pot on the board
+        result = equity(['H2', 'D3'], ['SA', 'SK', 'SQ', 'SJ', 'ST'], num_opponents=2)
+        self.assertEqual(result.tie, 1.0)
+        self.assertAlmostEqual(result.share, 1.0 / 3)
+        # The turn, one card out of 44 makes the flush
+        result = equity(['S2', 'S3'], ['S9', 'SK', 'D7', 'C8'], max_exact=10**5)
+        self.assertAlmostEqual(result.win + result.tie + result.loss, 1.0)
+        self.assertEqual(num_deals(44, 1, 1), 44 * 903)
+
+    def test_sampled(self):
+        result = equity(['SA', 'HA'], num_samples=4000, np_random=np.random.RandomState(0))
+        self.assertAlmostEqual(result.win + result.tie + result.loss, 1.0)
+        self.assertAlmostEqual(result.share, 0.85, delta=0.02)
+        same = equity(['SA', 'HA'], num_samples=4000, np_random=np.random.RandomState(0))
+        self.assertEqual(result, same)
+        result = equity(['S7', 'H2'], num_opponents=3, num_samples=4000, np_random=np.random.RandomState(0))
+        self.assertLess(result.share, 0.2)
+
+    def test_sampled_unbiased(self):
+        # The same flush draw in spades and in clubs, the sampled equities match the exact one
+        exact = equity(['SA', 'S5'], ['S9', 'SK', 'D7'], max_exact=10**7)
+        for hand, board in [(['SA', 'S5'], ['S9', 'SK', 'D7']), (['CA', 'C5'], ['C9', 'CK', 'D7'])]:
+            self.assertEqual(equity(hand, board, max_exact=10**7), exact)
+            result = equity(hand, board, num_samples=200000, max_exact=0, np_random=np.random.RandomState(0))
+            self.assertAlmostEqual(result.share, exact.share, delta=0.002)
+
+    def test_workers(self):
+        board = ['SQ', 'SJ', 'ST', 'H2']
+        self.assertEqual(equity(['HA', 'DA'], board, num_workers=2), equity(['HA', 'DA'], board))
+
+    def test_invalid(self):
+        with self.assertRaises(ValueError):
+            equity(['SA', 'SA'])
+        with self.assertRaises(ValueError):
+            equity(['SA'], ['HA'])
+        with self.assertRaises(ValueError):
+            equity(['SA', 'HA'], num_opponents=30)
+
+    def test_preflop_index(self):
+        indexes = set(preflop_index(hand) for hand in itertools.combinations(range(52), 2))
+        self.assertEqual(indexes, set(range(NUM_HANDS)))
+        for index in range(NUM_HANDS):
+            self.assertEqual(preflop_index(preflop_hand(index)), index)
+        self.assertEqual(preflop_name(preflop_index(['SA', 'SK'])), 'AKs')
+        self.assertEqual(preflop_name(preflop_index(['HK', 'SA'])), 'AKo')
+        self.assertEqual(preflop_name(preflop_index(['D7', 'H7'])), '77')
+
+    def test_preflop_equity(self):
+        table = load_preflop_table()
+        self.assertEqual(table.shape, (NUM_HANDS, MAX_OPPONENTS, 4))
+        self.assertTrue(np.allclose(table[:, :, :3].sum(axis=2), 1.0, atol=1e-5))
+        aces = preflop_equity(['SA', 'HA'])
+        self.assertAlmostEqual(aces.share, 0.852, delta=0.002)
+        self.assertAlmostEqual(preflop_equity(['S7', 'H2']).share, 0.346, delta=0.002)
+        self.assertAlmostEqual(preflop_equity(['S2', 'H2']).share, 0.503, delta=0.002)
+        self.assertGreater(aces.share, preflop_equity(['SA', 'HA'], num_opponents=3).share)
+        self.assertLess(preflop_equity(['S7', 'H2']).share, preflop_equity(['S7', 'S2']).share)
+        with self.assertRaises(ValueError):
+            preflop_equity(['SA', 'HA'], num_opponents=MAX_OPPONENTS + 1)
+
+if __name__ == '__main__':
+    unittest.main()
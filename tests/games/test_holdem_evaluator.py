@@ -0,0 +1,65 @@
+import unittest
+
+import numpy as np
+
+from rlcard.games.limitholdem.evaluator import card_id, category, category_name, evaluate, evaluate_batch, evaluate_cards, winners
+from rlcard.games.limitholdem.utils import Hand
+
+
+class TestHoldemEvaluator(unittest.TestCase):
+
+    def test_card_id(self):
+        self.assertEqual(card_id('SA'), 0)
+        self.assertEqual(card_id('HT'), 22)
+        self.assertEqual(card_id('CK'), 51)
+
+    def test_categories(self):
+        hands = {
+            'Straight_Flush': ['CJ', 'CT', 'CQ', 'CK', 'C9', 'C8', 'CA'],
+            'Four_of_a_Kind': ['CJ', 'SJ', 'HJ', 'DJ', 'C9', 'C8', 'C7'],
+            'Full_House': ['CJ', 'SJ', 'HJ', 'D9', 'C9', 'C8', 'C7'],
+            'Flush': ['CA', 'CQ', 'CT', 'C8', 'C6', 'C4', 'C2'],
+            'Straight': ['D5', 'ST', 'C2', 'D3', 'S4', 'S5', 'HA'],
+            'Three_of_a_Kind': ['CJ', 'SJ', 'HJ', 'D9', 'C2', 'C7', 'C4'],
+            'Two_Pairs': ['CJ', 'SJ', 'H9', 'D9', 'C2', 'C8', 'C7'],
+            'One_Pair': ['CJ', 'SJ', 'H9', 'D3', 'C2', 'C8', 'C7'],
+            'High_Card': ['CJ', 'S5', 'H9', 'D4', 'C2', 'C8', 'C7'],
+        }
+        for name, cards in hands.items():
+            self.assertEqual(category_name(evaluate_cards(cards)), name)
+        # Five and six cards
+        self.assertEqual(category_name(evaluate_cards(['CJ', 'SJ', 'HJ', 'D9', 'C9'])), 'Full_House')
+        self.assertEqual(category_name(evaluate_cards(['H2', 'H3', 'C4', 'D5', 'C6', 'S6'])), 'Straight')
+
+    def test_consistent_with_hand(self):
+        np_random = np.random.RandomState(seed=0)
+        for _ in range(2000):
+            card_ids = np_random.choice(52, 7, replace=False)
+            cards = [SUITS_RANKS[card] for card in card_ids]
+            hand = Hand(cards)
+            hand.evaluateHand()
+            self.assertEqual(category(evaluate(card_ids)), hand.category)
+            self.assertEqual(hand.strength, evaluate(card_ids))
+
+    def test_evaluate_batch(self):
+        np_random = np.random.RandomState(seed=0)
+        for num_cards in range(5, 8):
+            hands = np.array([np_random.choice(52, num_cards, replace=False) for _ in range(1000)])
+            strengths = evaluate_batch(hands, chunk_size=300)
+            self.assertEqual(strengths.shape, (1000,))
+            self.assertEqual(strengths.tolist(), [evaluate(hand) for hand in hands])
+        self.assertEqual(category(evaluate_batch([[0, 12, 11, 10, 9, 20, 30]]))[0], 9)
+        with self.assertRaises(ValueError):
+            evaluate_batch(np.arange(8).reshape(1, 8))
+
+    def test_winners(self):
+        strengths = [evaluate_cards(['H5', 'HQ', 'C2', 'D3', 'S4', 'S5', 'HT']),
+                     evaluate_cards(['H6', 'HQ', 'C2', 'D3', 'S4', 'S5', 'HT']),
+                     None,
+                     evaluate_cards(['D6', 'SQ', 'C2', 'D3', 'S4', 'S5', 'HT'])]
+        self.assertEqual(winners(strengths), [0, 1, 0, 1])
+
+SUITS_RANKS = [suit + rank for suit in 'SHDC' for rank in 'A23456789TJQK']
+
+if __name__ == '__main__':
+    unittest.main()
@@ -99,6 +99,21 @@ class TestLimitHoldemMethods(unittest.TestCase):
             action = np.random.choice(legal_actions)
             game.step(action)
 
+    def test_step_back_public_cards(self):
+        game = Game(allow_step_back=True)
+        game.init_game()
+        deck = list(game.dealer.deck)
+        game.step('raise')
+        game.step('call')
+        self.assertEqual(len(game.public_cards), 3)
+        self.assertEqual(game.history_raise_nums[0], 1)
+        game.step_back()
+        game.step_back()
+        self.assertEqual(game.public_cards, [])
+        self.assertEqual(game.dealer.deck, deck)
+        self.assertEqual(game.history_raise_nums[0], 0)
+        self.assertEqual(game.round_counter, 0)
+
     def test_payoffs(self):
         game = Game()
         np.random.seed(0)
@@ -0,0 +1,86 @@
+import unittest
+import numpy as np
+
+import rlcard
+from rlcard.agents.cfr_agent import CFRAgent
+from rlcard.utils.public_tree import PublicTree
+from rlcard.agents.random_agent import RandomAgent
+from rlcard.utils.exploitability import exploitability, best_response, best_response_value, tabular_policy, policy_matrices, policy_values
+
+class TestExploitability(unittest.TestCase):
+
+    @classmethod
+    def setUpClass(cls):
+        cls.tree = PublicTree(rlcard.make('leduc-holdem', config={'allow_step_back': True}))
+
+    def test_public_tree(self):
+        self.assertEqual(len(self.tree.roots), 2)
+        self.assertEqual(len(self.tree.cards), 6)
+        for node in self.tree.decision_nodes:
+            self.assertEqual(len(node.states), 6)
+            self.assertEqual(len(node.children), len(node.actions))
+
+    def test_zero_sum(self):
+        stack = list(self.tree.roots)
+        while stack:
+            node = stack.pop()
+            if node.is_terminal:
+                self.assertTrue(np.allclose(node.utilities.sum(axis=0), 0))
+            stack.extend(node.children)
+
+    def test_uniform(self):
+        uniform = tabular_policy({})
+        values = [best_response_value(self.tree, uniform, player_id) for player_id in range(2)]
+        self.assertGreater(values[0], 0)
+        # The first player is chosen at random, so the game is symmetric
+        self.assertAlmostEqual(values[0], values[1])
+        self.assertAlmostEqual(exploitability(self.tree, uniform), values[0])
+
+    def test_cfr(self):
+        env = rlcard.make('leduc-holdem', config={'seed': 0, 'allow_step_back': True})
+        agent = CFRAgent(env)
+        for _ in range(100):
+            agent.train()
+        self.assertLess(exploitability(self.tree, tabular_policy(agent.average_policy)),
+                        exploitability(self.tree, tabular_policy({})))
+
+    def test_best_response(self):
+        from rlcard import models
+        model = models.load('leduc-holdem-cfr')
+        matrices = policy_matrices(self.tree, model)
+        self.assertAlmostEqual(np.sum(policy_values(self.tree, matrices)), 0)
+        for player_id in range(2):
+            value, actions = best_response(self.tree, matrices, player_id)
+            # Playing the best response against the policy gives the value of the best response
+            profile = list(matrices)
+            for index, best_actions in actions.items():
+                node = self.tree.decision_nodes[index]
+                profile[index] = (np.array(node.actions) == best_actions[:, np.newaxis]).astype(float)
+            self.assertAlmostEqual(policy_values(self.tree, profile)[player_id], value)
+            self.assertGreater(value, policy_values(self.tree, matrices)[player_id])
+        self.assertAlmostEqual(exploitability(self.tree, model), exploitability(self.tree, model.agents[0].average_policy))
+
+    def test_agent(self):
+        random_agent = RandomAgent(num_actions=4)
+        self.assertAlmostEqual(exploitability(self.tree, random_agent), exploitability(self.tree, tabular_policy({})))
+
+    def test_greedy_agent(self):
+        from rlcard.models.leducholdem_rule_models import LeducHoldemRuleAgentV1
+        # The rule agent reports no probabilities, it is evaluated as greedy
+        matrices = policy_matrices(self.tree, LeducHoldemRuleAgentV1())
+        for matrix in matrices:
+            self.assertTrue(np.all(np.isin(matrix, [0.0, 1.0])))
+            self.assertTrue(np.allclose(matrix.sum(axis=1), 1.0))
+        self.assertGreater(exploitability(self.tree, LeducHoldemRuleAgentV1()), 0)
+
+    def test_dqn_agent(self):
+        try:
+            from rlcard.agents.dqn_agent import DQNAgent
+        except ImportError:
+            self.skipTest('torch is not installed')
+        agent = DQNAgent(num_actions=4, state_shape=[36], mlp_layers=[16])
+        greedy = lambda state: np.eye(4)[agent.eval_step(state)[0]]
+        self.assertAlmostEqual(exploitability(self.tree, agent), exploitability(self.tree, greedy))
+
+if __name__ == '__main__':
+    unittest.main()
@@ -31,6 +31,25 @@ class TestHoldemUtils(unittest.TestCase):
         hand.product = 20
         self.assertEqual(hand._has_high_card(), False)
 
+    def test_best_five(self):
+
+        hands = [
+            (['CJ', 'CT', 'CQ', 'CK', 'C9', 'C8', 'S3'], 9, ['C9', 'CT', 'CJ', 'CQ', 'CK']),
+            (['S2', 'D8', 'H8', 'S7', 'S8', 'C8', 'D3'], 8, ['S7', 'D8', 'H8', 'S8', 'C8']),
+            (['CJ', 'SJ', 'HJ', 'B9', 'C9', 'C8', 'C7'], 7, ['B9', 'C9', 'CJ', 'SJ', 'HJ']),
+            (['CA', 'CQ', 'CT', 'C8', 'C6', 'C4', 'S2'], 6, ['C6', 'C8', 'CT', 'CQ', 'CA']),
+            (['D5', 'ST', 'C2', 'D3', 'S4', 'S5', 'HA'], 5, ['HA', 'C2', 'D3', 'S4', 'D5']),
+            (['CJ', 'SJ', 'H9', 'B9', 'C2', 'C8', 'C7'], 3, ['C8', 'H9', 'B9', 'CJ', 'SJ']),
+            (['CJ', 'S5', 'H9', 'B4', 'C2', 'C8', 'C7'], 1, ['S5', 'C7', 'C8', 'H9', 'CJ']),
+        ]
+        for cards, category, best_five in hands:
+            hand = Hand(cards)
+            hand.evaluateHand()
+            self.assertEqual(hand.category, category)
+            # From the least to the most significant rank
+            self.assertEqual([card[1] for card in hand.get_hand_five_cards()], [card[1] for card in best_five])
+            self.assertEqual(sorted(hand.get_hand_five_cards()), sorted(best_five))
+
     def test_compare_hands(self):
 
         winner = compare_hands( [['CJ', 'SJ', 'H9', 'B3', 'C2', 'C8', 'C7'], ['CQ', 'SQ', 'H9', 'B3', 'C2', 'C8', 'C6']])
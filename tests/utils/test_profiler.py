@@ -0,0 +1,66 @@
+import json
+import os
+import tempfile
+import unittest
+
+import rlcard
+from rlcard.agents.random_agent import RandomAgent
+from rlcard.utils.profiler import Profiler
+
+# All the environments registered by rlcard.envs
+ENV_IDS = ['blackjack', 'doudizhu', 'limit-holdem', 'no-limit-holdem', 'leduc-holdem', 'uno', 'mahjong', 'gin-rummy', 'bridge']
+
+class TestProfiler(unittest.TestCase):
+
+    def test_record(self):
+        profiler = Profiler()
+        profiler.record('phase', 3e-6)
+        profiler.record('phase', 5e-6)
+        profiler.record('phase', 0.5e-6)
+        summary = profiler.summary()['phase']
+        self.assertEqual(summary['count'], 3)
+        self.assertAlmostEqual(summary['total'], 8.5e-6)
+        self.assertEqual(summary['histogram'], {'1': 1, '4': 1, '8': 1})
+        profiler.reset()
+        self.assertEqual(profiler.summary(), {})
+
+    def test_env_profiling(self):
+        env = rlcard.make('leduc-holdem', config={'profile': True})
+        env.set_agents([RandomAgent(env.num_actions) for _ in range(env.num_players)])
+        for _ in range(5):
+            env.run(is_training=False)
+        summary = env.profiler.summary()
+        for name in ['_decode_action', '_extract_state', 'game.step', 'game.get_state', 'game.get_legal_actions', 'agent.eval_step']:
+            self.assertIn(name, summary)
+        self.assertEqual(summary['_decode_action']['count'], summary['game.step']['count'])
+        self.assertEqual(summary['_decode_action']['count'], summary['agent.eval_step']['count'])
+
+        with tempfile.TemporaryDirectory() as path:
+            env.profiler.dump(os.path.join(path, 'profile.json'))
+            with open(os.path.join(path, 'profile.json')) as f:
+                self.assertEqual(json.load(f)['game.step']['count'], summary['game.step']['count'])
+
+    def test_profiling_all_envs(self):
+        for env_id in ENV_IDS:
+            env = rlcard.make(env_id, config={'profile': True})
+            env.set_agents([RandomAgent(env.num_actions) for _ in range(env.num_players)])
+            env.run(is_training=False)
+            summary = env.profiler.summary()
+            self.assertIn('game.step', summary)
+            self.assertEqual(summary['_decode_action']['count'], summary['agent.eval_step']['count'])
+            env.disable_profiling()
+            self.assertNotIn('step', env.game.__dict__)
+
+    def test_disable_profiling(self):
+        env = rlcard.make('uno')
+        profiler = env.enable_profiling()
+        env.reset()
+        count = profiler.counts['game.get_state']
+        env.disable_profiling()
+        self.assertIsNone(env.profiler)
+        self.assertNotIn('step', env.game.__dict__)
+        env.reset()
+        self.assertEqual(profiler.counts['game.get_state'], count)
+
+if __name__ == '__main__':
+    unittest.main()
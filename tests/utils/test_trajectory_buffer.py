@@ -0,0 +1,57 @@
+import unittest
+import numpy as np
+
+import rlcard
+from rlcard.agents.random_agent import RandomAgent
+from rlcard.utils import TrajectoryBuffer, reorganize
+
+
+class TestTrajectoryBuffer(unittest.TestCase):
+
+    def _test_same_as_reorganize(self, env_id):
+        env = rlcard.make(env_id, config={'seed': 0})
+        env.set_agents([RandomAgent(env.num_actions) for _ in range(env.num_players)])
+        np.random.seed(0)
+        trajectories, payoffs = env.run(is_training=True)
+        transitions = reorganize(trajectories, payoffs)
+
+        env = rlcard.make(env_id, config={'seed': 0})
+        env.set_agents([RandomAgent(env.num_actions) for _ in range(env.num_players)])
+        np.random.seed(0)
+        buffer = TrajectoryBuffer.from_env(env, capacity=2)
+        buffer, buffer_payoffs = env.run(is_training=True, buffer=buffer)
+
+        self.assertTrue(np.array_equal(payoffs, buffer_payoffs))
+        for player_id in range(env.num_players):
+            data = buffer.get(player_id)
+            self.assertEqual(len(data['obs']), len(transitions[player_id]))
+            for i, (state, action, reward, next_state, done) in enumerate(transitions[player_id]):
+                self.assertTrue(np.array_equal(data['obs'][i], state['obs']))
+                self.assertEqual(data['action'][i], action)
+                self.assertEqual(data['reward'][i], np.float32(reward))
+                self.assertTrue(np.array_equal(data['next_obs'][i], next_state['obs']))
+                self.assertEqual(list(np.flatnonzero(data['legal_mask'][i])), sorted(state['legal_actions']))
+                self.assertEqual(list(np.flatnonzero(data['next_legal_mask'][i])), sorted(next_state['legal_actions']))
+                self.assertEqual(data['done'][i], done)
+
+    def test_same_as_reorganize(self):
+        self._test_same_as_reorganize('leduc-holdem')
+        self._test_same_as_reorganize('uno')
+        self._test_same_as_reorganize('doudizhu')
+
+    def test_clear(self):
+        env = rlcard.make('limit-holdem')
+        env.set_agents([RandomAgent(env.num_actions) for _ in range(env.num_players)])
+        buffer = TrajectoryBuffer.from_env(env, capacity=4)
+        for _ in range(10):
+            env.run(is_training=True, buffer=buffer)
+        self.assertGreater(len(buffer), 10)
+        for player_id in range(env.num_players):
+            # A player that has acted ends each game with exactly one done transition
+            self.assertLessEqual(buffer.get(player_id)['done'].sum(), 10)
+            self.assertTrue(buffer.get(player_id)['done'][-1])
+        buffer.clear()
+        self.assertEqual(len(buffer), 0)
+
+if __name__ == '__main__':
+    unittest.main()
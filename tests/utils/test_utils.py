@@ -1,6 +1,6 @@
 import unittest
 import numpy as np
-from rlcard.utils.utils import init_54_deck, init_standard_deck, rank2int, print_card, elegent_form, reorganize, tournament
+from rlcard.utils.utils import init_54_deck, init_standard_deck, rank2int, print_card, elegent_form, reorganize, tournament, remove_illegal, get_legal_mask
 import rlcard
 from rlcard.agents.random_agent import RandomAgent
 
@@ -35,6 +35,19 @@ class TestUtils(unittest.TestCase):
         trajectories = reorganize([[[1,2],1,[4,5]]], [1])
         self.assertEqual(np.array(trajectories).shape, (1, 1, 5))
 
+    def test_remove_illegal(self):
+        action_probs = np.array([0.4, 0.2, 0.3, 0.1])
+        legal_mask = np.array([False, True, True, False])
+        self.assertTrue(np.allclose(remove_illegal(action_probs, [1, 2]), [0, 0.4, 0.6, 0]))
+        self.assertTrue(np.allclose(remove_illegal(action_probs, legal_mask), [0, 0.4, 0.6, 0]))
+        self.assertTrue(np.allclose(remove_illegal(np.zeros(4), legal_mask), [0, 0.5, 0.5, 0]))
+
+    def test_get_legal_mask(self):
+        env = rlcard.make('leduc-holdem')
+        state, _ = env.reset()
+        del state['legal_mask']
+        self.assertEqual(list(np.flatnonzero(get_legal_mask(state, env.num_actions))), sorted(state['legal_actions']))
+
     def test_tournament(self):
         env = rlcard.make('leduc-holdem')
         env.set_agents([RandomAgent(env.num_actions), RandomAgent(env.num_actions)])